@@ -1,21 +1,230 @@
 """
 Database configuration and session management
+
+There are two engines on the same database: a sync one (SessionLocal,
+get_db) used by background workers and simpler routes, and an async one
+(AsyncSessionLocal, get_async_db; aiosqlite or asyncpg) used by the
+meetings and tasks routes so database waits never hold a thread or block
+the event loop.
+
+Both engines are built from environment variables. SQLite gets WAL mode and
+a busy timeout so concurrent writers wait instead of failing with
+"database is locked"; Postgres gets a sized, pre-pinged connection pool
+and a statement timeout. Pool checkout counts and wait times are kept
+for /health.
 """
-from sqlalchemy import create_engine
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-import os
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.metrics import instrument_engine
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./meetings.db")
 
-# Create engine
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-)
+# Async drivers used for the same database when ASYNC_DATABASE_URL is not set
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+# Connection pool (file-based SQLite and Postgres)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))  # seconds to wait for a connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # seconds before a connection is replaced
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 30000))  # Postgres only, 0 disables
+
+# SQLite pragmas applied to every new connection
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 268435456))  # 256MB
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+
+
+class PoolMetrics:
+    """Counts pool checkouts and how long callers waited for a connection"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(self.wait_seconds_total / attempts * 1000, 3) if attempts else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+            }
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that reports checkout wait times to PoolMetrics"""
+
+    def __init__(self, *args, metrics: Optional[PoolMetrics] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = metrics or PoolMetrics()
+
+    def recreate(self):
+        # Keep counting into the same metrics when the pool is rebuilt
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+
+class MeteredAsyncQueuePool(MeteredQueuePool, AsyncAdaptedQueuePool):
+    """MeteredQueuePool for async engines"""
+
+
+def to_async_url(database_url: str) -> str:
+    """Same database, reached through its async driver"""
+    url = make_url(database_url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)).render_as_string(
+        hide_password=False
+    )
+
+
+def _is_sqlite_memory(url) -> bool:
+    database = url.database or ""
+    return database in ("", ":memory:") or "mode=memory" in str(url)
 
-# Create session
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA journal_mode = {SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE}")
+    cursor.close()
+
+
+def _engine_options(url, poolclass) -> Dict:
+    """Pool and connection arguments shared by the sync and async engines"""
+    kwargs = {}
+    connect_args = {}
+
+    if url.get_backend_name() == "sqlite":
+        connect_args["check_same_thread"] = False
+        if not _is_sqlite_memory(url):
+            kwargs.update(
+                poolclass=poolclass,
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+                pool_timeout=DB_POOL_TIMEOUT,
+            )
+    else:
+        kwargs.update(
+            poolclass=poolclass,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=DB_POOL_PRE_PING,
+        )
+        if url.get_backend_name() == "postgresql" and DB_STATEMENT_TIMEOUT_MS > 0:
+            if url.get_driver_name() == "asyncpg":
+                connect_args["server_settings"] = {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+            else:
+                connect_args["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+
+    kwargs["connect_args"] = connect_args
+    return kwargs
+
+
+def create_db_engine(database_url: str = DATABASE_URL) -> Engine:
+    """
+    Build the engine for a database URL
+
+    Args:
+        database_url: SQLAlchemy URL (sqlite or postgresql)
+
+    Returns:
+        Engine; file-based SQLite and Postgres use a MeteredQueuePool
+    """
+    url = make_url(database_url)
+    new_engine = create_engine(database_url, **_engine_options(url, MeteredQueuePool))
+
+    if url.get_backend_name() == "sqlite":
+        event.listen(new_engine, "connect", _apply_sqlite_pragmas)
+
+    return new_engine
+
+
+def create_async_db_engine(database_url: str) -> AsyncEngine:
+    """
+    Build the async engine for an async database URL
+
+    Args:
+        database_url: SQLAlchemy URL with an async driver (sqlite+aiosqlite, postgresql+asyncpg)
+
+    Returns:
+        AsyncEngine with the same pool settings and SQLite pragmas as the sync engine
+    """
+    url = make_url(database_url)
+    new_engine = create_async_engine(database_url, **_engine_options(url, MeteredAsyncQueuePool))
+
+    if url.get_backend_name() == "sqlite":
+        event.listen(new_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+
+    return new_engine
+
+
+def pool_stats(db_engine) -> Dict:
+    """Pool occupancy and checkout wait metrics of an engine (sync or async)"""
+    pool = db_engine.pool
+    stats = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+        )
+    if isinstance(pool, MeteredQueuePool):
+        stats.update(pool.metrics.stats())
+    return stats
+
+
+# Create engines
+engine = create_db_engine(DATABASE_URL)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+async_engine = create_async_db_engine(ASYNC_DATABASE_URL)
+# Statement latency per route on /metrics
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
+# Create sessions
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects stay readable after commit; lazy reloads are not possible in async code
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 # Base class for models
 Base = declarative_base()
@@ -28,3 +237,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    """Get async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,100 @@
+"""
+Structured logging
+Log records are written as one JSON object per line. Records emitted while
+a meeting is being handled carry its id (and the job id) as a correlation
+key, so one meeting's trail can be pulled out of interleaved worker logs.
+
+Info and debug records are sampled with LOG_SAMPLE_RATE. Sampling is
+decided per meeting, so a meeting is either logged completely or not at
+all; warnings and errors are always kept.
+"""
+
+import json
+import logging
+import os
+import random
+import sys
+import zlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # json or text
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", 1.0))
+
+meeting_id_var: ContextVar[Optional[int]] = ContextVar("meeting_id", default=None)
+job_id_var: ContextVar[Optional[int]] = ContextVar("job_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed in extra=
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+@contextmanager
+def log_context(meeting_id: Optional[int] = None, job_id: Optional[int] = None):
+    """Tag every record logged inside the block with the meeting (and job) id"""
+    tokens = [meeting_id_var.set(meeting_id)]
+    if job_id is not None:
+        tokens.append(job_id_var.set(job_id))
+    try:
+        yield
+    finally:
+        for token in reversed(tokens):
+            token.var.reset(token)
+
+
+def is_sampled(meeting_id: Optional[int], rate: float = LOG_SAMPLE_RATE) -> bool:
+    if rate >= 1:
+        return True
+    if meeting_id is None:
+        return random.random() < rate
+    # Stable per meeting (and across processes), unlike hash()
+    return zlib.crc32(str(meeting_id).encode()) % 10000 < rate * 10000
+
+
+class ContextFilter(logging.Filter):
+    """Adds the correlation ids to records and drops unsampled info/debug records"""
+
+    def __init__(self, sample_rate: float = LOG_SAMPLE_RATE):
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.meeting_id = getattr(record, "meeting_id", None) or meeting_id_var.get()
+        record.job_id = getattr(record, "job_id", None) or job_id_var.get()
+        return record.levelno >= logging.WARNING or is_sampled(record.meeting_id, self.sample_rate)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, including fields passed in extra="""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(
+            (key, value) for key, value in vars(record).items()
+            if key not in _RECORD_FIELDS and value is not None
+        )
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT, sample_rate: float = LOG_SAMPLE_RATE) -> None:
+    """Send the app's logs to stdout; call once at startup"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.addFilter(ContextFilter(sample_rate))
+    if fmt == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s [meeting=%(meeting_id)s] %(message)s"))
+
+    logger = logging.getLogger("app")
+    logger.handlers[:] = [handler]
+    logger.setLevel(level)
+    logger.propagate = False
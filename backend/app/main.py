@@ -3,20 +3,40 @@ FastAPI Meeting Assistant - Main Application
 Simple, clean, and easy to understand.
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from contextlib import asynccontextmanager
+import asyncio
 import os
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Structured (JSON) logs on stdout
+from app.logs import configure_logging
+configure_logging()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the background job workers and file sweeper with the app, stop them on shutdown"""
+    from app.services.job_queue import get_job_queue
+    from app.services.file_registry import get_file_registry
+    queue = get_job_queue()
+    registry = get_file_registry()
+    await queue.start()
+    await registry.start()
+    yield
+    await registry.stop()
+    await queue.stop()
+
 # Create FastAPI app
 app = FastAPI(
     title="AI Meeting Assistant",
     description="Simple meeting transcription and action tracking",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS - Allow frontend to talk to backend
@@ -36,13 +56,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Refuse oversized uploads before their body is read
+from app.middleware import UploadSizeLimitMiddleware
+MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", 104857600))  # 100MB
+app.add_middleware(UploadSizeLimitMiddleware, max_bytes=MAX_FILE_SIZE)
+
+# Compress responses (brotli or gzip) for clients that accept it
+from app.middleware import CompressionMiddleware
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))  # bytes
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
+
+# Request latency per route for /metrics (outermost, so it times everything above)
+from app.middleware import MetricsMiddleware
+app.add_middleware(MetricsMiddleware)
+
 # Create uploads directory if it doesn't exist
 UPLOAD_DIR = os.getenv("UPLOAD_DIR", "./uploads")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 # Initialize database
 from app.database import Base, engine
+from app import models  # register all tables before create_all
+from app.migrations import run_migrations
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
 
 # Health check endpoint
 @app.get("/")
@@ -57,19 +94,47 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Detailed health check"""
+    from app.services.job_queue import get_job_queue
+    from app.services.result_cache import get_result_cache
+    from app.services.events import get_event_bus
+    from app.database import engine, async_engine, pool_stats
+    from app.services.model_scheduler import get_model_scheduler
+    from app.services.file_readiness import get_file_waiter
+    from app.services.file_registry import get_file_registry
+    from app.services.structured_output import get_parse_metrics
+    from app.services.response_cache import get_response_cache
     gemini_key = os.getenv("GEMINI_API_KEY")
     return {
         "status": "healthy",
         "gemini_configured": bool(gemini_key),
         "upload_dir": UPLOAD_DIR,
-        "upload_dir_exists": os.path.exists(UPLOAD_DIR)
+        "upload_dir_exists": os.path.exists(UPLOAD_DIR),
+        "jobs": await asyncio.to_thread(get_job_queue().stats),
+        "cache": get_result_cache().stats(),
+        "events": get_event_bus().stats(),
+        "database": pool_stats(engine),
+        "database_async": pool_stats(async_engine),
+        "model": get_model_scheduler().stats(),
+        "files": get_file_waiter().stats(),
+        "remote_files": get_file_registry().stats(),
+        "summary_parsing": get_parse_metrics().stats(),
+        "response_cache": await asyncio.to_thread(get_response_cache().stats)
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics"""
+    from prometheus_client import CONTENT_TYPE_LATEST
+    from app.metrics import render_metrics
+    return Response(await asyncio.to_thread(render_metrics), media_type=CONTENT_TYPE_LATEST)
+
 # Import and include routers
-from app.routes import meetings, tasks
+from app.routes import meetings, tasks, jobs, search
 
 app.include_router(meetings.router, prefix="/api/meetings", tags=["meetings"])
 app.include_router(tasks.router, prefix="/api/tasks", tags=["tasks"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["jobs"])
+app.include_router(search.router, prefix="/api/search", tags=["search"])
 
 if __name__ == "__main__":
     import uvicorn
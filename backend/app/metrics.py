@@ -0,0 +1,129 @@
+"""
+Prometheus metrics
+Exposed at /metrics. Stage and job metrics carry a "model" label so a
+model switch shows up as a separate series.
+
+- meeting_stage_seconds / meeting_stage_failures_total: pipeline stages
+  (audio upload to Gemini, file wait, transcription, summarization)
+- job_seconds: processing job attempts by kind, outcome and model
+- upload_bytes / upload_seconds: recordings received by the API (no model
+  is involved yet)
+- http_request_seconds: API latency per route template
+- db_query_seconds: database time per route; background jobs report as
+  "job:<kind>"
+- job_queue_jobs, response_cache_*, remote_file_*: read from their
+  services on scrape
+
+With several API processes, each process exposes its own series.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from prometheus_client import REGISTRY, Counter, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from sqlalchemy import event
+
+# Route the current request (or background job) belongs to, for per-route DB timings
+current_route: ContextVar[str] = ContextVar("current_route", default="background")
+
+STAGE_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+SIZE_BUCKETS = tuple(2 ** n for n in range(16, 28))  # 64KB .. 128MB
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+STAGE_SECONDS = Histogram(
+    "meeting_stage_seconds", "Time spent in a processing stage",
+    ["stage", "model"], buckets=STAGE_BUCKETS,
+)
+STAGE_FAILURES = Counter(
+    "meeting_stage_failures_total", "Processing stages that raised",
+    ["stage", "model"],
+)
+JOB_SECONDS = Histogram(
+    "job_seconds", "Time per processing job attempt",
+    ["kind", "outcome", "model"], buckets=STAGE_BUCKETS,
+)
+UPLOAD_BYTES = Histogram("upload_bytes", "Size of accepted recordings", buckets=SIZE_BUCKETS)
+UPLOAD_SECONDS = Histogram(
+    "upload_seconds", "Time to receive, check and store a recording", buckets=STAGE_BUCKETS,
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_seconds", "API request latency",
+    ["method", "route", "status"],
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_seconds", "Database statement latency",
+    ["route"], buckets=DB_BUCKETS,
+)
+
+
+@contextmanager
+def track_stage(stage: str, model: str):
+    """Time a processing stage, counting it as failed if it raises"""
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        STAGE_FAILURES.labels(stage, model).inc()
+        raise
+    finally:
+        STAGE_SECONDS.labels(stage, model).observe(time.perf_counter() - started)
+
+
+def instrument_engine(engine) -> None:
+    """Time every statement run on a (sync) engine, by current route"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        context._query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop(conn, cursor, statement, parameters, context, executemany):
+        DB_QUERY_SECONDS.labels(current_route.get()).observe(time.perf_counter() - context._query_started)
+
+
+class ServiceCollector:
+    """Reads queue and response cache counters from their services at scrape time"""
+
+    def describe(self):
+        # Registering would otherwise call collect(), before the tables exist
+        return []
+
+    def collect(self):
+        from app.services.file_registry import get_file_registry
+        from app.services.job_queue import get_job_queue
+        from app.services.response_cache import get_response_cache
+
+        queue = get_job_queue().stats()
+        jobs = GaugeMetricFamily("job_queue_jobs", "Processing jobs by status", labels=["status"])
+        for status in ("queued", "running", "failed"):
+            jobs.add_metric([status], queue.get(status, 0))
+        yield jobs
+        yield GaugeMetricFamily("job_queue_workers", "Job worker tasks", value=queue.get("workers", 0))
+
+        cache = get_response_cache().stats()
+        lookups = CounterMetricFamily("response_cache_lookups", "Response cache lookups", labels=["result"])
+        lookups.add_metric(["hit"], cache["hits"])
+        lookups.add_metric(["miss"], cache["misses"])
+        yield lookups
+        yield CounterMetricFamily("response_cache_not_modified", "Requests answered with 304", value=cache["not_modified"])
+        yield CounterMetricFamily("response_cache_invalidations", "Invalidating writes", value=cache["invalidations"])
+        yield GaugeMetricFamily("response_cache_hit_ratio", "Share of lookups served from the cache", value=cache["hit_ratio"])
+        yield GaugeMetricFamily("response_cache_bytes", "Size of cached bodies", value=cache["bytes"])
+
+        files = get_file_registry().stats()
+        yield CounterMetricFamily("remote_file_uploads", "Audio files uploaded to the model", value=files["uploads"])
+        yield CounterMetricFamily("remote_file_reuses", "Uploads avoided by reusing a remote file", value=files["reuses"])
+        yield CounterMetricFamily("remote_file_bytes_uploaded", "Audio bytes uploaded", value=files["bytes_uploaded"])
+        yield CounterMetricFamily("remote_file_bytes_saved", "Audio bytes not uploaded again", value=files["bytes_saved"])
+        yield CounterMetricFamily("remote_file_deleted", "Remote files deleted once expired or no longer needed", value=files["deleted"])
+
+
+REGISTRY.register(ServiceCollector())
+
+
+def render_metrics() -> bytes:
+    """Metrics in the Prometheus text format (blocking: the collector queries the database)"""
+    return generate_latest(REGISTRY)
+
@@ -0,0 +1,265 @@
+"""
+ASGI middleware
+"""
+import json
+import time
+import zlib
+
+import brotli
+from starlette.datastructures import MutableHeaders
+from starlette.exceptions import HTTPException
+from starlette.routing import Match
+
+from app.metrics import HTTP_REQUEST_SECONDS, current_route
+from app.services.ingestion import too_large_message
+
+
+class RequestTooLarge(HTTPException):
+    """Raised from receive() once a request body passes the limit"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(status_code=413, detail=too_large_message(max_bytes))
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Refuse request bodies over the limit
+
+    A declared Content-Length over the limit is answered with 413 before
+    the body is received at all. Bodies without one (chunked transfer) are
+    counted as they are received, and RequestTooLarge is raised as soon as
+    they pass the limit, before the multipart parser spools the rest.
+    """
+
+    def __init__(self, app, max_bytes: int, overhead_bytes: int = 1024 * 1024):
+        self.app = app
+        # Multipart framing and form fields add a little on top of the file
+        self.limit = max_bytes + overhead_bytes
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT"):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length and content_length.isdigit():
+            if int(content_length) > self.limit:
+                await self._reject(send)
+                return
+            # The server already refuses bodies longer than declared
+            await self.app(scope, receive, send)
+            return
+
+        received = 0
+        response_started = False
+
+        async def counting_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.limit:
+                    raise RequestTooLarge(self.max_bytes)
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, counting_receive, tracking_send)
+        except RequestTooLarge:
+            # Normally answered by the app's exception handling; this covers
+            # bodies read outside of it
+            if response_started:
+                raise
+            await self._reject(send)
+
+    async def _reject(self, send) -> None:
+        body = json.dumps({"detail": too_large_message(self.max_bytes)}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """Accept-Encoding as {coding: quality}"""
+    qualities = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            qualities[coding.strip().lower()] = quality
+    return qualities
+
+
+def choose_encoding(header: str) -> str:
+    """Preferred response coding the client accepts: br, then gzip, else ''"""
+    qualities = parse_accept_encoding(header)
+    for coding in ("br", "gzip"):
+        if qualities.get(coding, qualities.get("*", 0)) > 0:
+            return coding
+    return ""
+
+
+class _Compressor:
+    """Streaming gzip or brotli compressor with one interface"""
+
+    def __init__(self, coding: str, gzip_level: int, brotli_quality: int):
+        if coding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+            self._gzip = None
+        else:
+            self._brotli = None
+            self._gzip = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, last: bool) -> bytes:
+        if self._brotli is not None:
+            out = self._brotli.process(data)
+            return out + (self._brotli.finish() if last else self._brotli.flush())
+        out = self._gzip.compress(data)
+        return out + self._gzip.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with brotli or gzip, as the client's Accept-Encoding allows
+
+    Small bodies, already encoded responses and server-sent event streams
+    are passed through unchanged. Streamed bodies are compressed chunk by
+    chunk and flushed, so clients still receive data as it is produced.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        coding = choose_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if not coding:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                response_headers = MutableHeaders(raw=start_message["headers"])
+                content_type = response_headers.get("content-type", "")
+                if (
+                    "content-encoding" in response_headers
+                    or content_type.startswith("text/event-stream")
+                    or start_message["status"] in (204, 304)
+                    or (not more_body and len(body) < self.minimum_size)
+                ):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                compressor = _Compressor(coding, self.gzip_level, self.brotli_quality)
+                body = compressor.compress(body, last=not more_body)
+                response_headers["Content-Encoding"] = coding
+                response_headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del response_headers["Content-Length"]
+                else:
+                    response_headers["Content-Length"] = str(len(body))
+                await send(start_message)
+                await send({"type": "http.response.body", "body": body, "more_body": more_body})
+                return
+
+            await send({
+                "type": "http.response.body",
+                "body": compressor.compress(body, last=not more_body),
+                "more_body": more_body,
+            })
+
+        await self.app(scope, receive, send_compressed)
+
+
+def route_template(scope) -> str:
+    """Path template of the route a request matches ("/api/tasks/{task_id}"), for low-cardinality labels"""
+    router = getattr(scope.get("app"), "router", None)
+    for route in getattr(router, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Record request latency per route and tag the request with its route
+
+    Latency is measured until the response headers are sent, so streamed
+    responses (server-sent events) are not timed for their whole lifetime.
+    Database statements run while handling the request are labeled with
+    the same route (see app.metrics.instrument_engine).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = route_template(scope)
+        token = current_route.set(route)
+        started = time.perf_counter()
+        recorded = False
+
+        def record(status: int) -> None:
+            nonlocal recorded
+            if not recorded:
+                recorded = True
+                HTTP_REQUEST_SECONDS.labels(scope["method"], route, status).observe(time.perf_counter() - started)
+
+        async def send_timed(message):
+            if message["type"] == "http.response.start":
+                record(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            # Raised before responding: the server answers 500
+            record(500)
+            current_route.reset(token)
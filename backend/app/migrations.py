@@ -0,0 +1,257 @@
+"""
+Schema migrations
+create_all() only creates missing tables. These steps bring an existing
+database up to date with the models; each one runs once and is recorded
+in the schema_migrations table. On a fresh database they find nothing
+to change and are simply recorded.
+"""
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.models.transcript import TranscriptChunk, encode_transcript
+
+
+def _add_column(conn: Connection, table: str, column: str, ddl_type: str) -> None:
+    """Add a column if the table does not have it yet"""
+    columns = {c["name"] for c in inspect(conn).get_columns(table)}
+    if column not in columns:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+
+
+def _add_meeting_content_hash(conn: Connection) -> None:
+    _add_column(conn, "meetings", "content_hash", "VARCHAR(64)")
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_meetings_content_hash ON meetings (content_hash)"))
+
+
+def _add_pagination_indexes(conn: Connection) -> None:
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_meetings_created_at_id ON meetings (created_at, id)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_action_items_created_at_id ON action_items (created_at, id)"))
+
+
+def _create_search_index(conn: Connection) -> None:
+    """Full-text index used by app.services.search, filled from existing rows"""
+    if conn.dialect.name == "sqlite":
+        conn.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+            "kind UNINDEXED, ref_id UNINDEXED, meeting_id UNINDEXED, title, body, "
+            "tokenize = 'porter unicode61')"
+        ))
+        conn.execute(text(
+            "INSERT OR REPLACE INTO search_index (rowid, kind, ref_id, meeting_id, title, body) "
+            "SELECT id * 2, 'meeting', id, id, title, "
+            "COALESCE(transcription, '') || char(10) || COALESCE("
+            "(SELECT group_concat(value, char(10)) FROM json_each(summary, '$.key_points')), '') "
+            "FROM meetings WHERE status = 'completed'"
+        ))
+        conn.execute(text(
+            "INSERT OR REPLACE INTO search_index (rowid, kind, ref_id, meeting_id, title, body) "
+            "SELECT id * 2 + 1, 'action_item', id, meeting_id, '', description FROM action_items"
+        ))
+    elif conn.dialect.name == "postgresql":
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS search_documents ("
+            "id SERIAL PRIMARY KEY, kind VARCHAR(20) NOT NULL, ref_id INTEGER NOT NULL, "
+            "meeting_id INTEGER NOT NULL, title TEXT NOT NULL, body TEXT NOT NULL, "
+            "document TSVECTOR NOT NULL, UNIQUE (kind, ref_id))"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_search_documents_document ON search_documents USING GIN (document)"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_search_documents_meeting_id ON search_documents (meeting_id)"
+        ))
+        conn.execute(text(
+            "INSERT INTO search_documents (kind, ref_id, meeting_id, title, body, document) "
+            "SELECT 'meeting', id, id, title, body, "
+            "setweight(to_tsvector('english', title), 'A') || setweight(to_tsvector('english', body), 'B') "
+            "FROM (SELECT id, title, COALESCE(transcription, '') || E'\\n' || "
+            "COALESCE((SELECT string_agg(value, E'\\n') FROM json_array_elements_text(summary::json->'key_points')), '') "
+            "AS body FROM meetings WHERE status = 'completed') m "
+            "ON CONFLICT (kind, ref_id) DO NOTHING"
+        ))
+        conn.execute(text(
+            "INSERT INTO search_documents (kind, ref_id, meeting_id, title, body, document) "
+            "SELECT 'action_item', id, meeting_id, '', description, "
+            "setweight(to_tsvector('english', description), 'B') FROM action_items "
+            "ON CONFLICT (kind, ref_id) DO NOTHING"
+        ))
+
+
+def _add_job_kind(conn: Connection) -> None:
+    _add_column(conn, "processing_jobs", "kind", "VARCHAR(20) NOT NULL DEFAULT 'process'")
+
+
+def _add_job_not_before(conn: Connection) -> None:
+    _add_column(conn, "processing_jobs", "not_before", "TIMESTAMP")
+
+
+def _add_action_item_user_edited_at(conn: Connection) -> None:
+    """Record user edits explicitly; existing rows are judged by the old heuristic once"""
+    _add_column(conn, "action_items", "user_edited_at", "TIMESTAMP")
+    if conn.dialect.name == "sqlite":
+        edited_later = "julianday(updated_at) - julianday(created_at) > 1.0 / 86400"
+    else:
+        edited_later = "updated_at - created_at > INTERVAL '1 second'"
+    conn.execute(text(
+        f"UPDATE action_items SET user_edited_at = updated_at "
+        f"WHERE user_edited_at IS NULL AND (status <> 'pending' OR {edited_later})"
+    ))
+
+
+def _add_action_item_indexes(conn: Connection) -> None:
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_action_items_meeting_id ON action_items (meeting_id)"))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_action_items_status_created_at_id ON action_items (status, created_at, id)"
+    ))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_action_items_assignee_status ON action_items (assignee, status)"))
+
+
+# Counted dimensions of task_stats: (dimension, value, counted when, columns it depends on).
+# {row} is NEW/OLD in triggers and action_items when rebuilding.
+TASK_STAT_DIMENSIONS = [
+    ("status", "COALESCE({row}.status, '')", "1 = 1", ("status",)),
+    ("priority", "COALESCE({row}.priority, '')", "1 = 1", ("priority",)),
+    ("assignee", "COALESCE({row}.assignee, '')", "1 = 1", ("assignee",)),
+    (
+        "open_due", "CAST({row}.due_date AS TEXT)",
+        "{row}.due_date IS NOT NULL AND COALESCE({row}.status, '') <> 'completed'", ("due_date", "status"),
+    ),
+]
+
+
+def _task_stat_statements(row: str, delta: int, distinct_op: str = None):
+    """
+    Statements that add (delta=1) or remove (delta=-1) one row's counts
+
+    With distinct_op (an UPDATE trigger), a dimension is only touched when
+    one of its columns changed.
+    """
+    statements = []
+    for dimension, value, counted, columns in TASK_STAT_DIMENSIONS:
+        value = value.format(row=row)
+        condition = counted.format(row=row)
+        if distinct_op:
+            changed = " OR ".join(f"OLD.{column} {distinct_op} NEW.{column}" for column in columns)
+            condition = f"({condition}) AND ({changed})"
+        if delta > 0:
+            statements.append(
+                f"INSERT INTO task_stats (dimension, value, count) SELECT '{dimension}', {value}, 1 "
+                f"WHERE {condition} ON CONFLICT (dimension, value) DO UPDATE SET count = task_stats.count + 1"
+            )
+        else:
+            statements.append(
+                f"UPDATE task_stats SET count = count - 1 "
+                f"WHERE dimension = '{dimension}' AND value = {value} AND {condition}"
+            )
+    return statements
+
+
+def rebuild_task_stats(conn: Connection) -> None:
+    """Recount task_stats from action_items"""
+    conn.execute(text("DELETE FROM task_stats"))
+    for dimension, value, counted, _ in TASK_STAT_DIMENSIONS:
+        value = value.format(row="action_items")
+        conn.execute(text(
+            f"INSERT INTO task_stats (dimension, value, count) "
+            f"SELECT '{dimension}', {value}, COUNT(*) FROM action_items "
+            f"WHERE {counted.format(row='action_items')} GROUP BY {value}"
+        ))
+
+
+def _create_task_stats(conn: Connection) -> None:
+    """Aggregate counts behind GET /api/tasks/stats, maintained by triggers on every write"""
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS task_stats ("
+        "dimension VARCHAR(20) NOT NULL, value VARCHAR(255) NOT NULL, count INTEGER NOT NULL DEFAULT 0, "
+        "PRIMARY KEY (dimension, value))"
+    ))
+    rebuild_task_stats(conn)
+
+    if conn.dialect.name == "sqlite":
+        triggers = {
+            "INSERT": _task_stat_statements("NEW", 1),
+            "DELETE": _task_stat_statements("OLD", -1),
+            "UPDATE OF status, priority, assignee, due_date": (
+                _task_stat_statements("OLD", -1, "IS NOT") + _task_stat_statements("NEW", 1, "IS NOT")
+            ),
+        }
+        for event, statements in triggers.items():
+            name = "task_stats_" + event.split()[0].lower()
+            body = "".join(f"{statement}; " for statement in statements)
+            conn.execute(text(f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON action_items BEGIN {body}END"))
+    elif conn.dialect.name == "postgresql":
+        def block(statements):
+            return "".join(f"{statement}; " for statement in statements)
+        conn.execute(text(
+            "CREATE OR REPLACE FUNCTION task_stats_apply() RETURNS trigger AS $$ BEGIN "
+            f"IF TG_OP = 'INSERT' THEN {block(_task_stat_statements('NEW', 1))}"
+            f"ELSIF TG_OP = 'DELETE' THEN {block(_task_stat_statements('OLD', -1))}"
+            f"ELSE {block(_task_stat_statements('OLD', -1, 'IS DISTINCT FROM'))}"
+            f"{block(_task_stat_statements('NEW', 1, 'IS DISTINCT FROM'))}END IF; "
+            "RETURN NULL; END $$ LANGUAGE plpgsql"
+        ))
+        conn.execute(text("DROP TRIGGER IF EXISTS task_stats_apply ON action_items"))
+        conn.execute(text(
+            "CREATE TRIGGER task_stats_apply AFTER INSERT OR DELETE OR UPDATE OF status, priority, assignee, due_date "
+            "ON action_items FOR EACH ROW EXECUTE FUNCTION task_stats_apply()"
+        ))
+
+
+def _move_transcripts_to_chunks(conn: Connection) -> None:
+    """Compress transcripts out of the meetings table into transcript_chunks"""
+    TranscriptChunk.__table__.create(conn, checkfirst=True)
+    while True:
+        rows = conn.execute(text(
+            "SELECT id, transcription FROM meetings WHERE transcription IS NOT NULL LIMIT 100"
+        )).all()
+        if not rows:
+            break
+        for meeting_id, transcription in rows:
+            chunks = [
+                {
+                    "meeting_id": meeting_id, "seq": chunk.seq,
+                    "char_start": chunk.char_start, "char_count": chunk.char_count,
+                    "segment_start": chunk.segment_start, "segment_count": chunk.segment_count,
+                    "data": chunk.data,
+                }
+                for chunk in encode_transcript(transcription)
+            ]
+            conn.execute(TranscriptChunk.__table__.delete().where(TranscriptChunk.meeting_id == meeting_id))
+            if chunks:
+                conn.execute(TranscriptChunk.__table__.insert(), chunks)
+            conn.execute(text("UPDATE meetings SET transcription = NULL WHERE id = :id"), {"id": meeting_id})
+
+
+# (version, migration) pairs, applied in order
+MIGRATIONS = [
+    ("001_meeting_content_hash", _add_meeting_content_hash),
+    ("002_pagination_indexes", _add_pagination_indexes),
+    ("003_search_index", _create_search_index),
+    ("004_job_kind", _add_job_kind),
+    ("005_action_item_indexes", _add_action_item_indexes),
+    ("006_task_stats", _create_task_stats),
+    ("007_transcript_chunks", _move_transcripts_to_chunks),
+    ("008_job_not_before", _add_job_not_before),
+    ("009_action_item_user_edited_at", _add_action_item_user_edited_at),
+]
+
+
+def run_migrations(engine: Engine) -> None:
+    """Apply all migrations that have not run on this database yet"""
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations "
+            "(version VARCHAR(100) PRIMARY KEY, applied_at TIMESTAMP)"
+        ))
+        applied = {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+        for version, migrate in MIGRATIONS:
+            if version in applied:
+                continue
+            migrate(conn)
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, applied_at) VALUES (:version, :applied_at)"),
+                {"version": version, "applied_at": datetime.utcnow()},
+            )
@@ -3,5 +3,9 @@ Database Models
 """
 from app.models.meeting import Meeting
 from app.models.action_item import ActionItem
+from app.models.job import ProcessingJob
+from app.models.remote_file import RemoteFile
+from app.models.task_stat import TaskStat
+from app.models.transcript import TranscriptChunk
 
-__all__ = ["Meeting", "ActionItem"]
+__all__ = ["Meeting", "ActionItem", "ProcessingJob", "RemoteFile", "TaskStat", "TranscriptChunk"]
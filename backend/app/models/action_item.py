@@ -1,7 +1,7 @@
 """
 Action Item database model
 """
-from sqlalchemy import Column, Integer, String, Text, Date, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, date
 from typing import Optional
@@ -10,9 +10,16 @@ from app.database import Base
 class ActionItem(Base):
     """Action Item model - stores tasks from meetings"""
     __tablename__ = "action_items"
+    __table_args__ = (
+        # Keyset pagination: newest first by (created_at, id)
+        Index("ix_action_items_created_at_id", "created_at", "id"),
+        # Task list filtered by status, in the same order
+        Index("ix_action_items_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_action_items_assignee_status", "assignee", "status"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    meeting_id = Column(Integer, ForeignKey("meetings.id"), nullable=False)
+    meeting_id = Column(Integer, ForeignKey("meetings.id"), nullable=False, index=True)
     description = Column(Text, nullable=False)
     assignee = Column(String(255), nullable=True)
     due_date = Column(Date, nullable=True)
@@ -20,6 +27,8 @@ class ActionItem(Base):
     status = Column(String(50), default="pending")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Set when a user creates or edits the item; re-summarizing never removes these
+    user_edited_at = Column(DateTime, nullable=True)
     
     def to_dict(self):
         """Convert model to dictionary"""
@@ -0,0 +1,37 @@
+"""
+Processing Job database model
+"""
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from datetime import datetime
+from app.database import Base
+
+class ProcessingJob(Base):
+    """Processing Job model - tracks background processing of a meeting"""
+    __tablename__ = "processing_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    meeting_id = Column(Integer, ForeignKey("meetings.id"), nullable=False, index=True)
+    kind = Column(String(20), nullable=False, default="process", server_default="process")  # process, resummarize
+    status = Column(String(50), default="queued", index=True)  # queued, running, completed, failed
+    attempts = Column(Integer, default=0)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    not_before = Column(DateTime, nullable=True)  # a failed job waits until then before it is retried
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        """Convert model to dictionary"""
+        return {
+            "id": self.id,
+            "meeting_id": self.meeting_id,
+            "kind": self.kind,
+            "status": self.status,
+            "attempts": self.attempts,
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "not_before": self.not_before.isoformat() if self.not_before else None,
+        }
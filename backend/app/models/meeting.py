@@ -1,27 +1,52 @@
 """
 Meeting database model
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Index
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
 from typing import Optional
 from app.database import Base
+from app.models.transcript import encode_transcript
 
 class Meeting(Base):
     """Meeting model - stores meeting information"""
     __tablename__ = "meetings"
+    __table_args__ = (
+        # Keyset pagination: newest first by (created_at, id)
+        Index("ix_meetings_created_at_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     audio_filename = Column(String(255), nullable=True)
     audio_path = Column(String(500), nullable=True)
-    transcription = Column(Text, nullable=True)
+    content_hash = Column(String(64), nullable=True, index=True)  # SHA-256 of the audio
+    # Emptied by the 007_transcript_chunks migration; transcripts live in transcript_chunks
+    transcription_legacy = deferred(Column("transcription", Text, nullable=True))
     summary = Column(JSON, nullable=True)
     duration = Column(Integer, nullable=True)
     participants = Column(String(500), nullable=True)
-    status = Column(String(50), default="processing")
+    status = Column(String(50), default="queued")  # queued, transcribing, summarizing, completed, failed
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Deleted explicitly with the meeting (see the delete route), never loaded for it
+    transcript_chunks = relationship(
+        "TranscriptChunk", order_by="TranscriptChunk.seq",
+        cascade="all, delete-orphan", passive_deletes=True
+    )
+    
+    @property
+    def transcription(self) -> Optional[str]:
+        """Full transcript, decompressed from its chunks"""
+        if not self.transcript_chunks:
+            return None
+        return "".join(chunk.text for chunk in self.transcript_chunks)
+    
+    @transcription.setter
+    def transcription(self, text: Optional[str]) -> None:
+        self.transcript_chunks = encode_transcript(text) if text else []
+    
     def to_dict(self):
         """Convert model to dictionary"""
         return {
@@ -0,0 +1,18 @@
+"""
+Remote File database model
+"""
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from app.database import Base
+
+class RemoteFile(Base):
+    """Remote File model - an audio file uploaded to Gemini, keyed by its content"""
+    __tablename__ = "remote_files"
+
+    content_hash = Column(String(64), primary_key=True)
+    remote_name = Column(String(255), nullable=False)
+    size_bytes = Column(Integer, nullable=False, default=0)
+    uploaded_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    finished_at = Column(DateTime, nullable=True, index=True)  # set once the transcription succeeded
+    reuses = Column(Integer, default=0)
@@ -0,0 +1,22 @@
+"""
+Task Stat database model
+"""
+from sqlalchemy import Column, Integer, String
+from app.database import Base
+
+class TaskStat(Base):
+    """
+    Task Stat model - action item counts per dimension value
+
+    Kept up to date by database triggers on action_items (see
+    app.migrations), so reading the dashboard counts never scans tasks.
+
+    dimension is one of:
+    - status, priority, assignee ('' when unassigned)
+    - open_due: open (not completed) tasks per due date, for overdue counts
+    """
+    __tablename__ = "task_stats"
+
+    dimension = Column(String(20), primary_key=True)
+    value = Column(String(255), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
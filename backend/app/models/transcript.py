@@ -0,0 +1,85 @@
+"""
+Transcript Chunk database model
+"""
+import os
+import re
+import zlib
+from typing import List
+
+from sqlalchemy import Column, Integer, LargeBinary, ForeignKey
+from app.database import Base
+
+# Characters per stored chunk; a ranged read decompresses only the chunks it touches
+TRANSCRIPT_CHUNK_CHARS = int(os.getenv("TRANSCRIPT_CHUNK_CHARS", 32768))
+TRANSCRIPT_COMPRESSION_LEVEL = int(os.getenv("TRANSCRIPT_COMPRESSION_LEVEL", 6))
+
+# A segment is one line of the transcript (usually one speaker turn), newline included
+SEGMENT_PATTERN = re.compile(r"[^\n]*\n|[^\n]+$")
+
+
+class TranscriptChunk(Base):
+    """
+    Transcript Chunk model - one zlib-compressed piece of a meeting transcript
+
+    Transcripts live here rather than in the meetings table, split on line
+    boundaries into chunks of about TRANSCRIPT_CHUNK_CHARS (longer lines are
+    cut). Joined in seq order the chunks give back the transcript exactly.
+    """
+    __tablename__ = "transcript_chunks"
+
+    meeting_id = Column(Integer, ForeignKey("meetings.id"), primary_key=True)
+    seq = Column(Integer, primary_key=True)
+    char_start = Column(Integer, nullable=False)  # offset of the chunk in the transcript
+    char_count = Column(Integer, nullable=False)
+    segment_start = Column(Integer, nullable=False)  # segments starting before this chunk
+    segment_count = Column(Integer, nullable=False)  # segments starting in this chunk
+    data = Column(LargeBinary, nullable=False)
+
+    @property
+    def text(self) -> str:
+        return decode_chunk(self.data)
+
+
+def decode_chunk(data: bytes) -> str:
+    return zlib.decompress(data).decode("utf-8")
+
+
+def split_segments(text: str) -> List[str]:
+    """Lines of a transcript, each with its newline"""
+    return SEGMENT_PATTERN.findall(text)
+
+
+def encode_transcript(text: str, chunk_chars: int = TRANSCRIPT_CHUNK_CHARS) -> List[TranscriptChunk]:
+    """Split a transcript into compressed chunks (meeting_id is set by the relationship)"""
+    chunks = []
+    parts: List[str] = []
+    length = starts = 0
+    char_start = segment_start = 0
+
+    def flush():
+        nonlocal parts, length, starts, char_start, segment_start
+        chunk_text = "".join(parts)
+        chunks.append(TranscriptChunk(
+            seq=len(chunks),
+            char_start=char_start,
+            char_count=len(chunk_text),
+            segment_start=segment_start,
+            segment_count=starts,
+            data=zlib.compress(chunk_text.encode("utf-8"), TRANSCRIPT_COMPRESSION_LEVEL),
+        ))
+        char_start += len(chunk_text)
+        segment_start += starts
+        parts, length, starts = [], 0, 0
+
+    for segment in split_segments(text):
+        for offset in range(0, len(segment), chunk_chars):
+            piece = segment[offset:offset + chunk_chars]
+            if parts and length + len(piece) > chunk_chars:
+                flush()
+            parts.append(piece)
+            length += len(piece)
+            if offset == 0:
+                starts += 1
+    if parts:
+        flush()
+    return chunks
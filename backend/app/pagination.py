@@ -0,0 +1,74 @@
+"""
+Keyset (cursor) pagination helpers
+Lists are ordered newest first by (created_at, id). A cursor encodes the
+last row of a page, and the next page starts strictly after it. Unlike
+offsets this stays fast on deep pages and does not skip or repeat rows
+while new ones are inserted.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque cursor for the row a page ended on"""
+    raw = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Read a cursor back; raises a 400 error if it was tampered with"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def order_newest_first(query, model):
+    """Stable newest-first order; id breaks ties between equal timestamps"""
+    return query.order_by(model.created_at.desc(), model.id.desc())
+
+
+def apply_cursor(query, model, cursor: Optional[str]):
+    """
+    Restrict an ordered query to rows after the cursor
+
+    Works on ORM queries and select() statements. An empty cursor means
+    the first page.
+    """
+    query = order_newest_first(query, model)
+    if not cursor:
+        return query
+
+    created_at, row_id = decode_cursor(cursor)
+    return query.filter(
+        or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < row_id),
+        )
+    )
+
+
+def _split_page(rows: List, limit: int) -> Tuple[List, Optional[str]]:
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
+
+
+def fetch_page(query, limit: int) -> Tuple[List, Optional[str]]:
+    """Fetch one page and the cursor of the next one (None on the last page)"""
+    return _split_page(query.limit(limit + 1).all(), limit)
+
+
+async def fetch_page_async(db, stmt, limit: int) -> Tuple[List, Optional[str]]:
+    """fetch_page for a select() statement on an AsyncSession"""
+    rows = (await db.scalars(stmt.limit(limit + 1))).all()
+    return _split_page(list(rows), limit)
@@ -1,22 +1,43 @@
 """
 Meeting routes - handle meeting-related operations
 """
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form, Body, Header, Query, Request, Response
+from pydantic import TypeAdapter
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, selectinload
+from typing import List, Literal, Optional, Union
 import os
-import shutil
 from datetime import datetime
+import asyncio
 import json
-import traceback
+import logging
+import time
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.meeting import Meeting
 from app.models.action_item import ActionItem
-from app.schemas import MeetingResponse, ActionItemResponse
-from app.services.gemini_service import get_gemini_service
+from app.models.job import ProcessingJob
+from app.models.transcript import TranscriptChunk
+from app.schemas import (
+    MeetingResponse, MeetingSummaryResponse, MeetingUploadResponse,
+    ActionItemCreate, ActionItemResponse, JobResponse, Page,
+    ResummarizeFilter, ResummarizeBatchResponse, TranscriptPage,
+)
+from app.pagination import apply_cursor, fetch_page_async, order_newest_first
+from app.services.job_queue import get_job_queue
+from app.services.ingestion import ingest_upload, UploadRejected
+from app.services.events import get_event_bus, meeting_channel
+from app.services.search import get_search_index
+from app.services.action_items import bulk_create_action_items, MAX_BATCH_SIZE
+from app.services.transcripts import read_transcript
+from app.services.response_cache import get_response_cache, etag_matches, meeting_tags, task_tags
+from app.metrics import UPLOAD_BYTES, UPLOAD_SECONDS
+from app.logs import log_context
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 UPLOAD_DIR = os.getenv("UPLOAD_DIR", "./uploads")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
@@ -24,19 +45,36 @@ os.makedirs(UPLOAD_DIR, exist_ok=True)
 ALLOWED_EXTENSIONS = {".mp3", ".wav", ".mp4", ".webm", ".m4a", ".ogg"}
 MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", 104857600))  # 100MB
 
-@router.post("/", response_model=MeetingResponse)
+# Columns loaded for the compact list view
+SUMMARY_COLUMNS = (
+    Meeting.id, Meeting.title, Meeting.audio_filename, Meeting.duration,
+    Meeting.participants, Meeting.status, Meeting.created_at, Meeting.updated_at,
+)
+
+FINAL_STATUSES = {"completed", "failed"}
+EVENTS_KEEPALIVE_SECONDS = 15
+
+# Serializers for cached responses, built once
+MEETING_LIST_ADAPTERS = {
+    "full": TypeAdapter(List[MeetingResponse]),
+    "summary": TypeAdapter(List[MeetingSummaryResponse]),
+}
+ACTIONS_ADAPTER = TypeAdapter(List[ActionItemResponse])
+
+@router.post("/", response_model=MeetingUploadResponse, status_code=202)
 async def upload_meeting(
     file: UploadFile = File(...),
     title: Optional[str] = Form(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Upload and process a meeting audio file
+    Upload a meeting audio file and queue it for processing
     
     - Accepts audio files (mp3, wav, mp4, webm, m4a, ogg)
-    - Max size: 100MB
-    - Transcribes using Gemini AI
-    - Generates summary and action items
+    - Max size: 100MB, checked while the file streams to disk
+    - File content must match a supported format
+    - Returns 202 with a job ID right away
+    - Transcription, summary and action items are produced by background workers
     """
     
     # Validate file extension
@@ -48,114 +86,334 @@ async def upload_meeting(
             detail=f"Invalid file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
         )
     
-    # Create meeting record
-    meeting = Meeting(
-        title=title or f"Meeting {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-        audio_filename=file.filename,
-        status="processing"
-    )
-    db.add(meeting)
-    db.commit()
-    db.refresh(meeting)
+    # Stream the file to disk before touching the database
+    started = time.perf_counter()
+    try:
+        ingested = await ingest_upload(
+            file, UPLOAD_DIR, file_ext, MAX_FILE_SIZE, ALLOWED_EXTENSIONS
+        )
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     
-    # Save uploaded file
-    file_path = os.path.join(UPLOAD_DIR, f"meeting_{meeting.id}{file_ext}")
+    # Create meeting record and its processing job in one transaction
+    queue = get_job_queue()
+    file_path = None
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        meeting = Meeting(
+            title=title or f"Meeting {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+            audio_filename=file.filename,
+            content_hash=ingested.content_hash,
+            status="queued"
+        )
+        db.add(meeting)
+        await db.flush()
         
+        file_path = os.path.join(UPLOAD_DIR, f"meeting_{meeting.id}{file_ext}")
+        os.replace(ingested.path, file_path)
         meeting.audio_path = file_path
-        db.commit()
-        
-        # Process with Gemini AI (in background in production)
-        try:
-            gemini = get_gemini_service()
-            
-            # Transcribe audio
-            transcription = gemini.transcribe_audio(file_path)
-            meeting.transcription = transcription
-            
-            # Generate summary
-            summary = gemini.generate_summary(transcription)
-            meeting.summary = summary
-            
-            # Extract and save action items
-            if summary and "action_items" in summary:
-                for item_data in summary["action_items"]:
-                    action_item = ActionItem(
-                        meeting_id=meeting.id,
-                        description=item_data.get("task", ""),
-                        assignee=item_data.get("assignee", "Unassigned"),
-                        priority=item_data.get("priority", "medium"),
-                        status="pending"
-                    )
-                    db.add(action_item)
-            
-            meeting.status = "completed"
-            
-        except Exception as e:
-            print(f"ERROR in processing: {str(e)}")
-            print(traceback.format_exc())
-            meeting.status = "failed"
-            meeting.summary = {"error": str(e)}
-            db.commit()
-            raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
-        
-        db.commit()
-        db.refresh(meeting)
-        
-        return meeting
-        
+        job = queue.enqueue(db, meeting)
+        await db.commit()
     except Exception as e:
-        print(f"ERROR in upload: {str(e)}")
-        print(traceback.format_exc())
-        meeting.status = "failed"
-        db.commit()
+        logger.exception("Upload failed", extra={"audio_filename": filename, "error": str(e)})
+        await db.rollback()
+        for path in (ingested.path, file_path):
+            if path and os.path.exists(path):
+                os.remove(path)
         raise HTTPException(status_code=500, detail=str(e))
+    
+    queue.notify()
+    get_response_cache().invalidate("meetings")
+    
+    UPLOAD_BYTES.observe(ingested.size)
+    UPLOAD_SECONDS.observe(time.perf_counter() - started)
+    with log_context(meeting.id, job.id):
+        logger.info("Meeting uploaded", extra={"bytes": ingested.size, "audio_filename": filename})
+    
+    return MeetingUploadResponse(
+        id=meeting.id,
+        job_id=job.id,
+        title=meeting.title,
+        status=meeting.status,
+        created_at=meeting.created_at
+    )
+
+async def _has_open_job(db: AsyncSession, meeting_ids) -> set:
+    """IDs among meeting_ids that already have a queued or running job"""
+    rows = await db.scalars(
+        select(ProcessingJob.meeting_id).where(
+            ProcessingJob.meeting_id.in_(meeting_ids),
+            ProcessingJob.status.in_(("queued", "running")),
+        )
+    )
+    return set(rows.all())
+
+async def _has_transcript(db: AsyncSession, meeting_id: int) -> bool:
+    chunk = await db.scalar(
+        select(TranscriptChunk.seq).where(TranscriptChunk.meeting_id == meeting_id).limit(1)
+    )
+    return chunk is not None
+
+@router.post("/resummarize", response_model=ResummarizeBatchResponse, status_code=202)
+async def resummarize_meetings(
+    selection: ResummarizeFilter = Body(default_factory=ResummarizeFilter),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Queue re-summarization for every meeting matching a filter
+
+    - Only meetings with a stored transcription are eligible
+    - Meetings that already have a queued or running job are skipped
+    - Jobs run on the background workers, at most RESUMMARIZE_CONCURRENCY at
+      a time, and new uploads are always picked up first
+    """
+    query = select(Meeting).where(Meeting.transcript_chunks.any())
+    if selection.meeting_ids is not None:
+        query = query.where(Meeting.id.in_(selection.meeting_ids))
+    if selection.statuses:
+        query = query.where(Meeting.status.in_(selection.statuses))
+    if selection.created_after:
+        query = query.where(Meeting.created_at >= selection.created_after)
+    if selection.created_before:
+        query = query.where(Meeting.created_at < selection.created_before)
+    meetings = (await db.scalars(
+        query.options(load_only(Meeting.id, Meeting.status)).order_by(Meeting.id).limit(selection.limit)
+    )).all()
+
+    busy = await _has_open_job(db, [m.id for m in meetings]) if meetings else set()
+    queue = get_job_queue()
+    jobs = [queue.enqueue(db, m, kind="resummarize") for m in meetings if m.id not in busy]
+    await db.commit()
+    if jobs:
+        queue.notify()
+        get_response_cache().invalidate(*(tag for job in jobs for tag in meeting_tags(job.meeting_id)))
+
+    return ResummarizeBatchResponse(queued=len(jobs), skipped=len(busy), job_ids=[job.id for job in jobs])
 
-@router.get("/", response_model=List[MeetingResponse])
-def get_meetings(
+@router.get(
+    "/",
+    response_model=Union[
+        List[MeetingResponse], List[MeetingSummaryResponse],
+        Page[MeetingResponse], Page[MeetingSummaryResponse],
+    ]
+)
+async def get_meetings(
+    request: Request,
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db)
+    view: Literal["full", "summary"] = "full",
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all meetings"""
-    meetings = db.query(Meeting).order_by(Meeting.created_at.desc()).offset(skip).limit(limit).all()
-    return meetings
+    """
+    Get all meetings, newest first
+    
+    - view=full (default): every field, including transcription and summary
+    - view=summary: compact rows; only the listed columns are read from the database
+    - cursor: keyset pagination. Pass an empty cursor for the first page, then the
+      returned next_cursor; the response becomes {"items": [...], "next_cursor": ...}
+    - skip/limit without a cursor: offset pagination, returns a plain list
+    - Served from the response cache; sends an ETag and answers If-None-Match with 304
+    """
+    async def build() -> bytes:
+        query = select(Meeting)
+        if view == "summary":
+            query = query.options(load_only(*SUMMARY_COLUMNS))
+        else:
+            query = query.options(selectinload(Meeting.transcript_chunks))
+        schema = MeetingSummaryResponse if view == "summary" else MeetingResponse
+        
+        if cursor is not None:
+            meetings, next_cursor = await fetch_page_async(db, apply_cursor(query, Meeting, cursor), limit)
+            return Page[schema](
+                items=[schema.model_validate(m) for m in meetings],
+                next_cursor=next_cursor
+            ).model_dump_json().encode()
+        
+        meetings = (await db.scalars(order_newest_first(query, Meeting).offset(skip).limit(limit))).all()
+        return MEETING_LIST_ADAPTERS[view].dump_json([schema.model_validate(m) for m in meetings])
+    
+    return await get_response_cache().respond(request, ["meetings"], build)
 
 @router.get("/{meeting_id}", response_model=MeetingResponse)
-def get_meeting(meeting_id: int, db: Session = Depends(get_db)):
-    """Get a specific meeting by ID"""
-    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
-    if not meeting:
-        raise HTTPException(status_code=404, detail="Meeting not found")
-    return meeting
+async def get_meeting(meeting_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get a specific meeting by ID
+    
+    Includes the full transcription; GET /{meeting_id}/transcript reads it in pages
+    """
+    async def build() -> bytes:
+        meeting = await db.get(Meeting, meeting_id, options=[selectinload(Meeting.transcript_chunks)])
+        if not meeting:
+            raise HTTPException(status_code=404, detail="Meeting not found")
+        return MeetingResponse.model_validate(meeting).model_dump_json().encode()
+    
+    return await get_response_cache().respond(request, [f"meeting:{meeting_id}"], build)
 
 @router.delete("/{meeting_id}")
-def delete_meeting(meeting_id: int, db: Session = Depends(get_db)):
+async def delete_meeting(meeting_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete a meeting"""
-    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+    meeting = await db.get(Meeting, meeting_id)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
     
-    # Delete associated action items
-    db.query(ActionItem).filter(ActionItem.meeting_id == meeting_id).delete()
+    # Delete associated action items, processing jobs and search entries
+    action_item_ids = (
+        await db.scalars(select(ActionItem.id).where(ActionItem.meeting_id == meeting_id))
+    ).all()
+    await db.run_sync(lambda session: get_search_index(session).remove_meeting(session, meeting_id, action_item_ids))
+    await db.execute(delete(ActionItem).where(ActionItem.meeting_id == meeting_id))
+    await db.execute(delete(ProcessingJob).where(ProcessingJob.meeting_id == meeting_id))
+    await db.execute(delete(TranscriptChunk).where(TranscriptChunk.meeting_id == meeting_id))
     
     # Delete audio file if exists
     if meeting.audio_path and os.path.exists(meeting.audio_path):
         os.remove(meeting.audio_path)
     
-    db.delete(meeting)
-    db.commit()
+    await db.delete(meeting)
+    await db.commit()
+    get_response_cache().invalidate(
+        *meeting_tags(meeting_id), *task_tags(action_item_ids, [meeting_id])
+    )
     
     return {"message": "Meeting deleted successfully"}
 
 @router.get("/{meeting_id}/actions", response_model=List[ActionItemResponse])
-def get_meeting_actions(meeting_id: int, db: Session = Depends(get_db)):
+async def get_meeting_actions(meeting_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get all action items for a specific meeting"""
-    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+    async def build() -> bytes:
+        meeting = await db.get(Meeting, meeting_id)
+        if not meeting:
+            raise HTTPException(status_code=404, detail="Meeting not found")
+        actions = (await db.scalars(select(ActionItem).where(ActionItem.meeting_id == meeting_id))).all()
+        return ACTIONS_ADAPTER.dump_json([ActionItemResponse.model_validate(a) for a in actions])
+    
+    return await get_response_cache().respond(request, [f"meeting:{meeting_id}:actions"], build)
+
+@router.post("/{meeting_id}/actions:batch", response_model=List[ActionItemResponse], status_code=201)
+async def create_meeting_actions(
+    meeting_id: int,
+    items: List[ActionItemCreate] = Body(..., min_length=1, max_length=MAX_BATCH_SIZE),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create many action items for a meeting in one transaction"""
+    if await db.get(Meeting, meeting_id) is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+
+    created = await db.run_sync(
+        bulk_create_action_items, [{"meeting_id": meeting_id, **item.model_dump()} for item in items],
+        edited_by_user=True,
+    )
+    await db.commit()
+    get_response_cache().invalidate(*task_tags(meeting_ids=[meeting_id]))
+    return created
+
+@router.post("/{meeting_id}/resummarize", response_model=JobResponse, status_code=202)
+async def resummarize_meeting(meeting_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Queue a new summary for a meeting from its stored transcription
+
+    Only the summary step runs again. Action items are reconciled with the
+    new summary: items a user edited (status, assignee, ...) are kept.
+    """
+    meeting = await db.get(Meeting, meeting_id)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
+    if not await _has_transcript(db, meeting_id):
+        raise HTTPException(status_code=409, detail="Meeting has no transcription yet")
+    if await _has_open_job(db, [meeting_id]):
+        raise HTTPException(status_code=409, detail="Meeting already has a job in progress")
+
+    queue = get_job_queue()
+    job = queue.enqueue(db, meeting, kind="resummarize")
+    await db.commit()
+    queue.notify()
+    get_response_cache().invalidate(*meeting_tags(meeting_id))
+    return job
+
+def transcript_etag(meeting: Meeting) -> str:
+    """Weak validator: the transcript changes only together with updated_at"""
+    version = meeting.updated_at.timestamp() if meeting.updated_at else 0
+    return f'W/"{meeting.id}-{version:.6f}"'
+
+@router.get("/{meeting_id}/transcript", response_model=TranscriptPage)
+async def get_transcript(
+    meeting_id: int,
+    response: Response,
+    unit: Literal["chars", "segments"] = "chars",
+    start: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=200000),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Read a meeting transcript in pages
+    
+    - unit=chars: characters [start, start + limit), 20000 by default
+    - unit=segments: lines (speaker turns) [start, start + limit), 200 by default
+    - next_start is the start of the following page, null on the last one
+    - Sends an ETag; a request with a matching If-None-Match gets 304
+    """
+    meeting = await db.get(Meeting, meeting_id, options=[load_only(Meeting.id, Meeting.updated_at)])
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    
+    etag = transcript_etag(meeting)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(etag, if_none_match):
+        return Response(status_code=304, headers=headers)
+    
+    page = await db.run_sync(read_transcript, meeting_id, unit, start, limit)
+    if page["total_chars"] == 0:
+        raise HTTPException(status_code=404, detail="Meeting has no transcription yet")
+    response.headers.update(headers)
+    return page
+
+def format_sse(event_type: str, data: dict) -> str:
+    """Encode one server-sent event"""
+    return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+@router.get("/{meeting_id}/events")
+async def meeting_events(meeting_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Stream processing progress as server-sent events
     
-    actions = db.query(ActionItem).filter(ActionItem.meeting_id == meeting_id).all()
-    return actions
+    - `status`: every status transition, starting with the current one
+    - `transcript_segment`: transcript text as soon as it is produced
+    - The stream ends once the meeting is completed or failed
+    """
+    bus = get_event_bus()
+    # Subscribe before reading the current status so no transition is missed
+    subscription = bus.subscribe(meeting_channel(meeting_id))
+    
+    meeting = await db.get(Meeting, meeting_id)
+    if not meeting:
+        bus.unsubscribe(subscription)
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    current_status = meeting.status
+    # Release the connection; the stream itself never touches the database
+    await db.close()
+    
+    async def stream():
+        try:
+            yield format_sse("status", {"type": "status", "meeting_id": meeting_id, "status": current_status})
+            if current_status in FINAL_STATUSES:
+                return
+            
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.get(), timeout=EVENTS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                
+                yield format_sse(event["type"], event)
+                if event["type"] == "status" and event["status"] in FINAL_STATUSES:
+                    return
+        finally:
+            bus.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,29 @@
+"""
+Search routes - full-text search over meetings and action items
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Literal, Optional
+
+from app.database import get_db
+from app.schemas import SearchResult
+from app.services.search import get_search_index
+
+router = APIRouter()
+
+@router.get("/", response_model=List[SearchResult])
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    kind: Optional[Literal["meeting", "action_item"]] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """
+    Search meeting titles, transcriptions, key points and action items
+    
+    Results are ranked by relevance; matches in the snippet are wrapped in <mark> tags.
+    """
+    try:
+        return get_search_index(db).search(db, q, limit=limit, kind=kind)
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
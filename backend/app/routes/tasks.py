@@ -1,48 +1,168 @@
 """
 Task/Action Item routes
 """
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Body, Depends, HTTPException, Request
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+from datetime import date, datetime
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.action_item import ActionItem
-from app.schemas import ActionItemResponse, ActionItemUpdate
+from app.models.meeting import Meeting
+from app.models.task_stat import TaskStat
+from app.schemas import (
+    ActionItemResponse, ActionItemUpdate, TaskCreate, TaskBatchUpdate,
+    TaskBatchUpdateResponse, TaskUpdateResult, TaskStatsResponse, Page,
+)
+from app.pagination import apply_cursor, fetch_page_async, order_newest_first
+from app.services.search import get_search_index
+from app.services.action_items import bulk_create_action_items, bulk_update_action_items, MAX_BATCH_SIZE
+from app.services.response_cache import get_response_cache, task_tags
 
 router = APIRouter()
 
-@router.get("/", response_model=List[ActionItemResponse])
-def get_all_tasks(
+TASKS_ADAPTER = TypeAdapter(List[ActionItemResponse])
+
+@router.get("/", response_model=Union[List[ActionItemResponse], Page[ActionItemResponse]])
+async def get_all_tasks(
+    request: Request,
     status: str | None = None,
     skip: int = 0,
     limit: int = 50,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all action items, optionally filtered by status"""
-    query = db.query(ActionItem)
+    """
+    Get all action items, optionally filtered by status
     
-    if status:
-        query = query.filter(ActionItem.status == status)
+    - cursor: keyset pagination. Pass an empty cursor for the first page, then the
+      returned next_cursor; the response becomes {"items": [...], "next_cursor": ...}
+    - skip/limit without a cursor: offset pagination, returns a plain list
+    - Served from the response cache; sends an ETag and answers If-None-Match with 304
+    """
+    async def build() -> bytes:
+        query = select(ActionItem)
+        
+        if status:
+            query = query.where(ActionItem.status == status)
+        
+        if cursor is not None:
+            tasks, next_cursor = await fetch_page_async(db, apply_cursor(query, ActionItem, cursor), limit)
+            return Page[ActionItemResponse](
+                items=[ActionItemResponse.model_validate(t) for t in tasks],
+                next_cursor=next_cursor
+            ).model_dump_json().encode()
+        
+        tasks = (await db.scalars(order_newest_first(query, ActionItem).offset(skip).limit(limit))).all()
+        return TASKS_ADAPTER.dump_json([ActionItemResponse.model_validate(t) for t in tasks])
     
-    tasks = query.order_by(ActionItem.created_at.desc()).offset(skip).limit(limit).all()
-    return tasks
+    return await get_response_cache().respond(request, ["tasks"], build)
+
+@router.post("/batch", response_model=List[ActionItemResponse], status_code=201)
+async def create_tasks(
+    tasks: List[TaskCreate] = Body(..., min_length=1, max_length=MAX_BATCH_SIZE),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create many tasks, possibly across meetings, in one transaction"""
+    meeting_ids = {task.meeting_id for task in tasks}
+    found = set((await db.scalars(select(Meeting.id).where(Meeting.id.in_(meeting_ids)))).all())
+    missing = sorted(meeting_ids - found)
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Meetings not found: {missing}")
+
+    created = await db.run_sync(bulk_create_action_items, [task.model_dump() for task in tasks], edited_by_user=True)
+    await db.commit()
+    get_response_cache().invalidate(*task_tags(meeting_ids=meeting_ids))
+    return created
+
+@router.patch("/", response_model=TaskBatchUpdateResponse)
+async def update_tasks(
+    updates: List[TaskBatchUpdate] = Body(..., min_length=1, max_length=MAX_BATCH_SIZE),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update many tasks in one transaction
+
+    Every entry gets a result in request order. Entries that fail (unknown
+    or repeated id, nothing to change, rejected by the database) are
+    reported with an error; the others are still applied.
+    """
+    errors = await db.run_sync(
+        bulk_update_action_items, [update.model_dump(exclude_unset=True) for update in updates], edited_by_user=True
+    )
+    await db.commit()
+
+    updated_ids = [task_id for task_id, error in errors.items() if error is None]
+    tasks = {
+        task.id: task
+        for task in (await db.scalars(select(ActionItem).where(ActionItem.id.in_(updated_ids)))).all()
+    } if updated_ids else {}
+    if tasks:
+        get_response_cache().invalidate(*task_tags(tasks, {task.meeting_id for task in tasks.values()}))
+
+    results = [
+        TaskUpdateResult(
+            id=update.id,
+            ok=errors[update.id] is None,
+            error=errors[update.id],
+            task=ActionItemResponse.model_validate(tasks[update.id]) if update.id in tasks else None,
+        )
+        for update in updates
+    ]
+    return TaskBatchUpdateResponse(
+        updated=sum(r.ok for r in results),
+        failed=sum(not r.ok for r in results),
+        results=results
+    )
+
+@router.get("/stats", response_model=TaskStatsResponse)
+async def get_task_stats(db: AsyncSession = Depends(get_async_db)):
+    """
+    Task counts per status, priority and assignee, plus overdue counts
+
+    Read from the task_stats table, which database triggers keep up to
+    date on every task write, so the cost does not grow with the number
+    of tasks.
+    """
+    rows = await db.execute(select(TaskStat.dimension, TaskStat.value, TaskStat.count).where(TaskStat.count > 0))
+    counts = {"status": {}, "priority": {}, "assignee": {}, "open_due": {}}
+    for dimension, value, count in rows:
+        if dimension == "assignee" and not value:
+            value = "Unassigned"
+        bucket = counts.setdefault(dimension, {})
+        bucket[value] = bucket.get(value, 0) + count
+    
+    today = date.today().isoformat()
+    return TaskStatsResponse(
+        total=sum(counts["status"].values()),
+        by_status=counts["status"],
+        by_priority=counts["priority"],
+        by_assignee=counts["assignee"],
+        overdue=sum(count for due, count in counts["open_due"].items() if due < today),
+        due_today=counts["open_due"].get(today, 0),
+    )
 
 @router.get("/{task_id}", response_model=ActionItemResponse)
-def get_task(task_id: int, db: Session = Depends(get_db)):
+async def get_task(task_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get a specific task by ID"""
-    task = db.query(ActionItem).filter(ActionItem.id == task_id).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    return task
+    async def build() -> bytes:
+        task = await db.get(ActionItem, task_id)
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found")
+        return ActionItemResponse.model_validate(task).model_dump_json().encode()
+    
+    return await get_response_cache().respond(request, [f"task:{task_id}"], build)
 
 @router.patch("/{task_id}", response_model=ActionItemResponse)
-def update_task(
+async def update_task(
     task_id: int,
     task_update: ActionItemUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a task"""
-    task = db.query(ActionItem).filter(ActionItem.id == task_id).first()
+    task = await db.get(ActionItem, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
@@ -50,19 +170,28 @@ def update_task(
     update_data = task_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(task, field, value)
+    if update_data:
+        # Re-summarizing the meeting keeps tasks a user touched
+        task.user_edited_at = datetime.utcnow()
+    
+    if "description" in update_data:
+        await db.run_sync(lambda session: get_search_index(session).index_action_item(session, task))
     
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    get_response_cache().invalidate(*task_tags([task_id], [task.meeting_id]))
+    await db.refresh(task)
     return task
 
 @router.delete("/{task_id}")
-def delete_task(task_id: int, db: Session = Depends(get_db)):
+async def delete_task(task_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete a task"""
-    task = db.query(ActionItem).filter(ActionItem.id == task_id).first()
+    task = await db.get(ActionItem, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    db.delete(task)
-    db.commit()
+    await db.run_sync(lambda session: get_search_index(session).remove_action_item(session, task_id))
+    await db.delete(task)
+    await db.commit()
+    get_response_cache().invalidate(*task_tags([task_id], [task.meeting_id]))
     
     return {"message": "Task deleted successfully"}
@@ -1,10 +1,17 @@
 """
 Pydantic schemas for request/response validation
 """
-from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Any, Generic, TypeVar
 from datetime import date, datetime
 
+T = TypeVar("T")
+
+# Cursor-paginated list
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str]
+
 # Meeting schemas
 class MeetingCreate(BaseModel):
     title: Optional[str] = None
@@ -24,6 +31,31 @@ class MeetingResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class TranscriptPage(BaseModel):
+    meeting_id: int
+    unit: str  # "chars" or "segments"
+    start: int
+    end: int
+    total: int  # length of the transcript in this unit
+    total_chars: int
+    total_segments: int
+    next_start: Optional[int]
+    text: str
+
+class MeetingSummaryResponse(BaseModel):
+    """Compact meeting for lists - no transcription or summary"""
+    id: int
+    title: str
+    audio_filename: Optional[str]
+    duration: Optional[int]
+    participants: Optional[str]
+    status: str
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
 # Action Item schemas
 class ActionItemCreate(BaseModel):
     description: str
@@ -31,6 +63,10 @@ class ActionItemCreate(BaseModel):
     due_date: Optional[date] = None
     priority: str = "medium"
 
+class TaskCreate(ActionItemCreate):
+    """Action item created outside a meeting's own batch endpoint"""
+    meeting_id: int
+
 class ActionItemUpdate(BaseModel):
     description: Optional[str] = None
     assignee: Optional[str] = None
@@ -38,6 +74,10 @@ class ActionItemUpdate(BaseModel):
     priority: Optional[str] = None
     status: Optional[str] = None
 
+class TaskBatchUpdate(ActionItemUpdate):
+    """One entry of a batch update: the task id plus the fields to change"""
+    id: int
+
 class ActionItemResponse(BaseModel):
     id: int
     meeting_id: int
@@ -51,3 +91,66 @@ class ActionItemResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+class TaskUpdateResult(BaseModel):
+    id: int
+    ok: bool
+    error: Optional[str] = None
+    task: Optional[ActionItemResponse] = None
+
+class TaskBatchUpdateResponse(BaseModel):
+    updated: int
+    failed: int
+    results: List[TaskUpdateResult]
+
+class TaskStatsResponse(BaseModel):
+    total: int
+    by_status: Dict[str, int]
+    by_priority: Dict[str, int]
+    by_assignee: Dict[str, int]
+    overdue: int  # open tasks with a due date before today
+    due_today: int
+
+# Processing Job schemas
+class JobResponse(BaseModel):
+    id: int
+    meeting_id: int
+    kind: str
+    status: str
+    attempts: int
+    error: Optional[str]
+    created_at: Optional[datetime]
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    not_before: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class ResummarizeFilter(BaseModel):
+    meeting_ids: Optional[List[int]] = None
+    statuses: Optional[List[str]] = None  # meeting statuses, e.g. ["completed", "failed"]
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    limit: int = Field(500, ge=1, le=5000)
+
+class ResummarizeBatchResponse(BaseModel):
+    queued: int
+    skipped: int
+    job_ids: List[int]
+
+class MeetingUploadResponse(BaseModel):
+    id: int
+    job_id: int
+    title: str
+    status: str
+    created_at: Optional[datetime]
+
+# Search schemas
+class SearchResult(BaseModel):
+    kind: str  # "meeting" or "action_item"
+    id: int
+    meeting_id: int
+    title: str
+    snippet: str
+    score: float
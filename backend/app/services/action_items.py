@@ -0,0 +1,189 @@
+"""
+Action Item persistence
+Creates many action items with a single multi-row INSERT instead of one
+ORM object per row, and updates many with set-based UPDATEs. Search
+index entries are written in the same transaction.
+"""
+
+import re
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.action_item import ActionItem
+from app.services.search import get_search_index
+
+# Upper bound for the batch create/update endpoints
+MAX_BATCH_SIZE = 1000
+
+
+def action_item_rows_from_summary(meeting_id: int, summary: Dict) -> List[Dict]:
+    """Turn the action_items of a generated summary into row values"""
+    if not summary or "action_items" not in summary:
+        return []
+    return [
+        {
+            "meeting_id": meeting_id,
+            "description": item_data.get("task", ""),
+            "assignee": item_data.get("assignee", "Unassigned"),
+            "priority": item_data.get("priority", "medium"),
+            "status": "pending",
+        }
+        for item_data in summary["action_items"]
+    ]
+
+
+def bulk_create_action_items(db: Session, rows: List[Dict], edited_by_user: bool = False) -> List[ActionItem]:
+    """
+    Insert action items in bulk without committing
+
+    Args:
+        db: Database session; the caller commits
+        rows: Column values per item (meeting_id and description required)
+        edited_by_user: The items come from a user, not from a summary
+
+    Returns:
+        The created action items, in the order of rows
+    """
+    if not rows:
+        return []
+    if edited_by_user:
+        now = datetime.utcnow()
+        rows = [{**row, "user_edited_at": now} for row in rows]
+
+    # One INSERT ... RETURNING for all rows; column defaults still apply
+    items = list(db.scalars(insert(ActionItem).returning(ActionItem, sort_by_parameter_order=True), rows))
+    get_search_index(db).index_action_items(db, items)
+    return items
+
+
+def _apply_update_group(db: Session, members: List, same_values: bool, stamps: Dict) -> Optional[str]:
+    """Run one set-based UPDATE in a savepoint; returns the error, if any"""
+    try:
+        with db.begin_nested():
+            if same_values:
+                db.execute(
+                    update(ActionItem)
+                    .where(ActionItem.id.in_([task_id for task_id, _ in members]))
+                    .values(**members[0][1], **stamps),
+                    execution_options={"synchronize_session": False},
+                )
+            else:
+                db.execute(update(ActionItem), [{"id": task_id, **fields, **stamps} for task_id, fields in members])
+    except SQLAlchemyError as e:
+        return f"Update failed: {e.orig if getattr(e, 'orig', None) is not None else e}"
+    return None
+
+
+def bulk_update_action_items(db: Session, updates: List[Dict], edited_by_user: bool = False) -> Dict[int, Optional[str]]:
+    """
+    Apply many partial updates without committing
+
+    Updates that set the same fields are grouped: one UPDATE ... WHERE id IN
+    when they also set the same values, otherwise one executemany UPDATE by
+    primary key. Each group runs in a savepoint; when a group fails its
+    tasks are retried one by one, so only the failing ones are reported
+    and nothing else is undone.
+
+    Args:
+        db: Database session; the caller commits
+        updates: One dict per task with "id" and the fields to change
+        edited_by_user: The changes come from a user (see reconcile_action_items)
+
+    Returns:
+        Error message per task id, None for tasks that were updated
+    """
+    results: Dict[int, Optional[str]] = {}
+    counts = defaultdict(int)
+    for item in updates:
+        counts[item["id"]] += 1
+
+    requested = [item["id"] for item in updates]
+    existing = set(db.scalars(select(ActionItem.id).where(ActionItem.id.in_(requested))))
+
+    groups = defaultdict(list)
+    for item in updates:
+        task_id = item["id"]
+        fields = {k: v for k, v in item.items() if k != "id"}
+        if counts[task_id] > 1:
+            results[task_id] = "Task appears more than once in the batch"
+        elif task_id not in existing:
+            results[task_id] = "Task not found"
+        elif not fields:
+            results[task_id] = "No fields to update"
+        else:
+            groups[tuple(sorted(fields))].append((task_id, fields))
+
+    now = datetime.utcnow()
+    stamps = {"updated_at": now, "user_edited_at": now} if edited_by_user else {"updated_at": now}
+    for field_names, members in groups.items():
+        distinct_values = {tuple(fields[name] for name in field_names) for _, fields in members}
+        error = _apply_update_group(db, members, same_values=len(distinct_values) == 1, stamps=stamps)
+        if error is not None and len(members) > 1:
+            # Retry one by one so only the offending tasks are reported
+            for member in members:
+                results[member[0]] = _apply_update_group(db, [member], same_values=True, stamps=stamps)
+        else:
+            results.update((task_id, error) for task_id, _ in members)
+
+    # Reindex tasks whose description changed
+    reindex = [
+        task_id for field_names, members in groups.items() if "description" in field_names
+        for task_id, _ in members if results[task_id] is None
+    ]
+    if reindex:
+        items = db.scalars(select(ActionItem).where(ActionItem.id.in_(reindex))).all()
+        get_search_index(db).index_action_items(db, list(items))
+
+    return results
+
+
+def _normalize_description(description: str) -> str:
+    return re.sub(r"\s+", " ", (description or "").strip().lower())
+
+
+def _is_user_edited(item: ActionItem) -> bool:
+    """Whether a user created or changed an action item (the API routes record it)"""
+    return item.user_edited_at is not None
+
+
+def reconcile_action_items(db: Session, meeting_id: int, rows: List[Dict]) -> Dict[str, int]:
+    """
+    Bring a meeting's action items in line with a new summary without committing
+
+    Items are matched on their normalized description:
+    - matches keep their row untouched, so user edits (status, assignee, ...) survive
+    - new items are bulk-inserted
+    - old items missing from the new summary are deleted, unless a user
+      edited them; those are kept
+
+    Returns:
+        Counts of kept, added and removed items
+    """
+    existing = list(db.scalars(select(ActionItem).where(ActionItem.meeting_id == meeting_id)))
+    by_description = defaultdict(list)
+    for item in existing:
+        by_description[_normalize_description(item.description)].append(item)
+
+    to_add = []
+    matched = set()
+    for row in rows:
+        candidates = by_description.get(_normalize_description(row["description"]))
+        if candidates:
+            matched.add(candidates.pop(0).id)
+        else:
+            to_add.append(row)
+
+    to_remove = [item.id for item in existing if item.id not in matched and not _is_user_edited(item)]
+    if to_remove:
+        search_index = get_search_index(db)
+        for item_id in to_remove:
+            search_index.remove_action_item(db, item_id)
+        db.execute(delete(ActionItem).where(ActionItem.id.in_(to_remove)), execution_options={"synchronize_session": False})
+
+    bulk_create_action_items(db, to_add)
+    return {"kept": len(existing) - len(to_remove), "added": len(to_add), "removed": len(to_remove)}
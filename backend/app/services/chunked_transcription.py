@@ -0,0 +1,249 @@
+"""
+Chunked Transcription Service
+Splits long recordings into overlapping time segments, transcribes them
+concurrently and stitches the transcripts back together.
+
+Any object with an async transcribe_audio(path) method can do the actual
+transcription (AsyncGeminiService, or a fake model in tests). Splitting
+uses ffmpeg/ffprobe when they are installed; without them, or for short
+recordings, the whole file is sent in one request as before.
+"""
+
+import asyncio
+import os
+import re
+import shutil
+import tempfile
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional, Protocol, Tuple
+
+from app.services.model_scheduler import is_retryable, unavailable_cause
+
+# "auto" splits long recordings when ffmpeg is available, "off" never splits
+TRANSCRIBE_CHUNKING = os.getenv("TRANSCRIBE_CHUNKING", "auto")
+CHUNK_SECONDS = float(os.getenv("TRANSCRIBE_CHUNK_SECONDS", 300))  # 5 minutes
+CHUNK_OVERLAP_SECONDS = float(os.getenv("TRANSCRIBE_CHUNK_OVERLAP_SECONDS", 10))
+CHUNK_CONCURRENCY = int(os.getenv("TRANSCRIBE_CHUNK_CONCURRENCY", 4))
+CHUNK_RETRIES = int(os.getenv("TRANSCRIBE_CHUNK_RETRIES", 2))
+CHUNK_RETRY_DELAY = 1.0  # seconds, doubled after every failed attempt
+
+# Overlap matching: the start of a segment is compared word by word with
+# the last words of the previous one. An overlap must be at least
+# OVERLAP_MIN_WORDS long; one word in OVERLAP_WORDS_PER_MISMATCH may differ
+# (the model rarely transcribes the same audio identically twice).
+OVERLAP_MIN_WORDS = 4
+OVERLAP_WORDS_PER_MISMATCH = 8
+OVERLAP_SEARCH_WORDS = 80
+
+
+class Transcriber(Protocol):
+    """Anything that can turn an audio file into text"""
+
+    async def transcribe_audio(self, audio_path: str) -> str:
+        ...
+
+
+@dataclass
+class Segment:
+    """One time slice of a recording"""
+    index: int
+    start: float
+    end: float
+    path: str
+
+
+def plan_segments(duration: float, segment_seconds: float, overlap_seconds: float) -> List[Tuple[float, float]]:
+    """
+    Cut a duration into (start, end) windows
+
+    Each window after the first starts overlap_seconds before the previous
+    one ends, so words spoken across a boundary appear in both.
+    """
+    if duration <= segment_seconds:
+        return [(0.0, duration)]
+
+    step = segment_seconds - overlap_seconds
+    if step <= 0:
+        raise ValueError("Segment length must be larger than the overlap")
+
+    windows = []
+    start = 0.0
+    while start < duration:
+        end = min(start + segment_seconds, duration)
+        windows.append((start, end))
+        if end >= duration:
+            break
+        start += step
+    return windows
+
+
+def _normalize(word: str) -> str:
+    """Compare words without case or punctuation"""
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+def _overlap_length(previous: List[str], current: List[str]) -> int:
+    """
+    Number of leading words of `current` that repeat the end of `previous`
+
+    Every suffix of the tail of `previous` is compared with the same number
+    of words at the start of `current`, shortest first, so a phrase that
+    also occurs earlier in the tail can't stretch the overlap. When nothing
+    matches (e.g. the model dropped a word in one of the copies) nothing is
+    removed: a repeated sentence is better than lost words.
+    """
+    tail = [_normalize(w) for w in previous[-OVERLAP_SEARCH_WORDS:]]
+    head = [_normalize(w) for w in current[:len(tail)]]
+    for length in range(OVERLAP_MIN_WORDS, len(head) + 1):
+        mismatches = sum(a != b for a, b in zip(tail[-length:], head[:length]))
+        if mismatches <= length // OVERLAP_WORDS_PER_MISMATCH:
+            return length
+    return 0
+
+
+def stitch_transcripts(parts: List[str]) -> str:
+    """Join segment transcripts, dropping text repeated in the overlaps"""
+    result = ""
+    previous_words: List[str] = []
+
+    for part in parts:
+        part = part.strip()
+        if not part:
+            continue
+
+        tokens = list(re.finditer(r"\S+", part))
+        words = [t.group() for t in tokens]
+        skip = _overlap_length(previous_words, words)
+        remainder = part[tokens[skip].start():] if skip < len(tokens) else ""
+
+        if remainder:
+            result = f"{result}\n{remainder}" if result else remainder
+        previous_words = (previous_words + words[skip:])[-OVERLAP_SEARCH_WORDS:]
+
+    return result
+
+
+class FFmpegSplitter:
+    """Reads durations with ffprobe and cuts segments with ffmpeg"""
+
+    @staticmethod
+    def available() -> bool:
+        return bool(shutil.which("ffmpeg") and shutil.which("ffprobe"))
+
+    async def duration(self, audio_path: str) -> Optional[float]:
+        """Length of the recording in seconds, or None if unknown"""
+        process = await asyncio.create_subprocess_exec(
+            "ffprobe", "-v", "error",
+            "-show_entries", "format=duration",
+            "-of", "default=noprint_wrappers=1:nokey=1",
+            audio_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, _ = await process.communicate()
+        try:
+            return float(stdout.decode().strip())
+        except ValueError:
+            return None
+
+    async def cut(self, audio_path: str, start: float, end: float, out_path: str) -> None:
+        """Copy the audio between start and end into out_path"""
+        process = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-v", "error", "-y",
+            "-ss", f"{start:.3f}", "-t", f"{end - start:.3f}",
+            "-i", audio_path,
+            "-vn", "-c:a", "copy",
+            out_path,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise Exception(f"ffmpeg failed to cut segment: {stderr.decode().strip()}")
+
+
+class ChunkedTranscriber:
+    """Transcribes long recordings segment by segment, in parallel"""
+
+    def __init__(
+        self,
+        transcriber: Transcriber,
+        splitter=None,
+        segment_seconds: float = CHUNK_SECONDS,
+        overlap_seconds: float = CHUNK_OVERLAP_SECONDS,
+        concurrency: int = CHUNK_CONCURRENCY,
+        retries: int = CHUNK_RETRIES,
+        retry_delay: float = CHUNK_RETRY_DELAY,
+        on_segment: Optional[Callable[[Segment, str], Awaitable[None]]] = None,
+    ):
+        self.transcriber = transcriber
+        self.splitter = splitter or FFmpegSplitter()
+        self.segment_seconds = segment_seconds
+        self.overlap_seconds = overlap_seconds
+        self.concurrency = concurrency
+        self.retries = retries
+        self.retry_delay = retry_delay
+        # Called with each segment's text as soon as it is ready (any order)
+        self.on_segment = on_segment
+
+    async def transcribe_audio(self, audio_path: str) -> str:
+        """
+        Transcribe a recording, splitting it first if it is long
+
+        Args:
+            audio_path: Path to the audio file
+
+        Returns:
+            Transcription text
+        """
+        duration = await self.splitter.duration(audio_path)
+        if duration is None or duration <= self.segment_seconds:
+            return await self.transcriber.transcribe_audio(audio_path)
+
+        windows = plan_segments(duration, self.segment_seconds, self.overlap_seconds)
+        ext = os.path.splitext(audio_path)[1]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        with tempfile.TemporaryDirectory(prefix="segments_") as tmp_dir:
+            segments = [
+                Segment(index=i, start=start, end=end, path=os.path.join(tmp_dir, f"segment_{i:04d}{ext}"))
+                for i, (start, end) in enumerate(windows)
+            ]
+            texts = await asyncio.gather(
+                *(self._transcribe_segment(audio_path, segment, semaphore) for segment in segments)
+            )
+
+        return stitch_transcripts(list(texts))
+
+    async def _transcribe_segment(self, audio_path: str, segment: Segment, semaphore: asyncio.Semaphore) -> str:
+        """
+        Cut and transcribe one segment, retrying only this segment on failure
+
+        Quota, overload and timeout errors are not retried here: the model
+        scheduler has already retried them, and once it gives up the job
+        queue re-queues the whole job.
+        """
+        async with semaphore:
+            await self.splitter.cut(audio_path, segment.start, segment.end, segment.path)
+
+            delay = self.retry_delay
+            for attempt in range(self.retries + 1):
+                try:
+                    text = await self.transcriber.transcribe_audio(segment.path)
+                    break
+                except Exception as e:
+                    if unavailable_cause(e) is not None or is_retryable(e) or attempt == self.retries:
+                        raise Exception(f"Segment {segment.index} failed after {attempt + 1} attempts: {str(e)}") from e
+                    await asyncio.sleep(delay)
+                    delay *= 2
+
+        if self.on_segment is not None:
+            await self.on_segment(segment, text)
+        return text
+
+
+def get_transcriber(transcriber: Transcriber, on_segment=None) -> Transcriber:
+    """Wrap a transcriber in ChunkedTranscriber when chunking is enabled and possible"""
+    if TRANSCRIBE_CHUNKING == "off" or not FFmpegSplitter.available():
+        return transcriber
+    return ChunkedTranscriber(transcriber, on_segment=on_segment)
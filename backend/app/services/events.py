@@ -0,0 +1,86 @@
+"""
+Event Bus Service
+In-process publish/subscribe for meeting progress events.
+
+Publishers (the processing pipeline) and subscribers (the SSE endpoint)
+only use publish() / subscribe() / unsubscribe(), so this class can be
+replaced by a broker-backed one (Redis pub/sub, NATS, ...) when the API
+runs as several processes.
+"""
+
+import asyncio
+from typing import Dict, Set
+
+SUBSCRIBER_QUEUE_SIZE = 256
+
+
+def meeting_channel(meeting_id: int) -> str:
+    """Channel name for one meeting's events"""
+    return f"meeting:{meeting_id}"
+
+
+class Subscription:
+    """A subscriber's view of one channel"""
+
+    def __init__(self, channel: str, maxsize: int = SUBSCRIBER_QUEUE_SIZE):
+        self.channel = channel
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    async def get(self) -> Dict:
+        """Wait for the next event"""
+        return await self.queue.get()
+
+    def deliver(self, event: Dict) -> None:
+        """Queue an event; a slow subscriber loses its oldest events first"""
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+
+class EventBus:
+    """Fan-out of events to every subscriber of a channel"""
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+
+    def subscribe(self, channel: str) -> Subscription:
+        """Start receiving events published on a channel"""
+        subscription = Subscription(channel)
+        self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop receiving events"""
+        subscribers = self._subscribers.get(subscription.channel)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.channel]
+
+    def publish(self, channel: str, event: Dict) -> None:
+        """
+        Send an event to all current subscribers
+
+        Must be called from the event loop thread.
+        """
+        for subscription in list(self._subscribers.get(channel, ())):
+            subscription.deliver(event)
+
+    def stats(self) -> Dict:
+        """Subscriber counts, for the health endpoint"""
+        return {
+            "channels": len(self._subscribers),
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+        }
+
+
+# Singleton instance
+_event_bus = None
+
+def get_event_bus() -> EventBus:
+    """Get or create EventBus instance"""
+    global _event_bus
+    if _event_bus is None:
+        _event_bus = EventBus()
+    return _event_bus
@@ -0,0 +1,212 @@
+"""
+File Readiness Waiter
+Uploaded audio must reach the ACTIVE state before Gemini can use it.
+Instead of every transcription polling its own file on a fixed interval,
+callers await a future and one shared loop checks all pending files:
+
+- each file is checked quickly at first, then less often (adaptive backoff)
+- files that are due in the same tick are checked together, with a single
+  list call once enough of them are waiting
+- futures resolve with the ACTIVE file, or fail on FAILED state or timeout
+
+Wait times (upload to ACTIVE) are tracked for the health endpoint.
+"""
+
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import google.generativeai as genai
+
+from app.services.model_scheduler import SystemClock
+
+FILE_POLL_INITIAL = float(os.getenv("GEMINI_FILE_POLL_INITIAL", 0.5))  # seconds
+FILE_POLL_MAX = float(os.getenv("GEMINI_FILE_POLL_MAX", 5.0))
+FILE_POLL_BACKOFF = 1.5  # interval multiplier after every check that is not ACTIVE
+FILE_READY_TIMEOUT = float(os.getenv("GEMINI_FILE_MAX_WAIT", 120))
+
+# With this many files due at once, one list call replaces the per-file calls
+LIST_FILES_THRESHOLD = 4
+
+
+@dataclass
+class PendingFile:
+    """A file some callers are waiting on"""
+    name: str
+    future: asyncio.Future
+    started: float
+    deadline: float
+    next_check: float
+    interval: float
+    waiters: int = 1
+
+
+def _default_list_files() -> List:
+    return list(genai.list_files())
+
+
+class FileReadinessWaiter:
+    """Resolves futures when uploaded files become ACTIVE, from one polling loop"""
+
+    def __init__(
+        self,
+        get_file: Callable = genai.get_file,
+        list_files: Callable = _default_list_files,
+        initial_interval: float = FILE_POLL_INITIAL,
+        max_interval: float = FILE_POLL_MAX,
+        timeout: float = FILE_READY_TIMEOUT,
+        clock=None,
+    ):
+        # get_file/list_files are the blocking SDK calls; they run in threads
+        self.get_file = get_file
+        self.list_files = list_files
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.timeout = timeout
+        self.clock = clock or SystemClock()
+
+        self._pending: Dict[str, PendingFile] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+        self.status_calls = 0
+        self.list_calls = 0
+        self.ready = 0
+        self.failed = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    async def wait_active(self, file):
+        """
+        Wait until an uploaded file is ACTIVE
+
+        Args:
+            file: File handle returned by genai.upload_file
+
+        Returns:
+            The refreshed, ACTIVE file handle
+        """
+        if file.state.name == "ACTIVE":
+            self._record_ready(0.0)
+            return file
+        if file.state.name == "FAILED":
+            self.failed += 1
+            raise Exception(f"File processing failed: {file.name}")
+
+        entry = self._pending.get(file.name)
+        if entry is None:
+            now = self.clock.monotonic()
+            entry = PendingFile(
+                name=file.name,
+                future=asyncio.get_running_loop().create_future(),
+                started=now,
+                deadline=now + self.timeout,
+                next_check=now + self.initial_interval,
+                interval=self.initial_interval,
+            )
+            self._pending[file.name] = entry
+            self._ensure_loop()
+        else:
+            entry.waiters += 1
+
+        # shield: one caller being cancelled must not cancel the others
+        return await asyncio.shield(entry.future)
+
+    def _ensure_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._poll_loop())
+        else:
+            self._wakeup.set()
+
+    async def _poll_loop(self) -> None:
+        while self._pending:
+            now = self.clock.monotonic()
+            due = [entry for entry in self._pending.values() if entry.next_check <= now]
+            if due:
+                await self._check(due)
+                continue
+
+            delay = min(entry.next_check for entry in self._pending.values()) - now
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(delay, 0))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _check(self, due: List[PendingFile]) -> None:
+        """Refresh the state of all due files and resolve the finished ones"""
+        try:
+            if len(due) >= LIST_FILES_THRESHOLD:
+                self.list_calls += 1
+                listed = await asyncio.to_thread(self.list_files)
+                files = {f.name: f for f in listed}
+            else:
+                self.status_calls += len(due)
+                fetched = await asyncio.gather(
+                    *(asyncio.to_thread(self.get_file, entry.name) for entry in due),
+                    return_exceptions=True
+                )
+                files = {entry.name: f for entry, f in zip(due, fetched)}
+        except Exception as e:
+            files = {entry.name: e for entry in due}
+
+        now = self.clock.monotonic()
+        for entry in due:
+            current = files.get(entry.name)
+            state = getattr(getattr(current, "state", None), "name", None)
+
+            if state == "ACTIVE":
+                self._resolve(entry, result=current)
+                self._record_ready(now - entry.started)
+            elif state == "FAILED":
+                self.failed += 1
+                self._resolve(entry, error=Exception(f"File processing failed: {entry.name}"))
+            elif now >= entry.deadline:
+                self.failed += 1
+                self._resolve(entry, error=Exception(f"File processing timeout. State: {state or 'unknown'}"))
+            else:
+                # Still processing, missing from the list, or a transient error: back off
+                entry.interval = min(entry.interval * FILE_POLL_BACKOFF, self.max_interval)
+                entry.next_check = min(now + entry.interval, entry.deadline)
+
+    def _resolve(self, entry: PendingFile, result=None, error: Optional[Exception] = None) -> None:
+        self._pending.pop(entry.name, None)
+        if entry.future.done():
+            return
+        if error is not None:
+            entry.future.set_exception(error)
+            # Mark retrieved so an abandoned future does not log a warning
+            entry.future.exception()
+        else:
+            entry.future.set_result(result)
+
+    def _record_ready(self, waited: float) -> None:
+        self.ready += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def stats(self) -> Dict:
+        """Counters for the health endpoint"""
+        return {
+            "pending": len(self._pending),
+            "ready": self.ready,
+            "failed": self.failed,
+            "status_calls": self.status_calls,
+            "list_calls": self.list_calls,
+            "wait_seconds_avg": round(self.wait_seconds_total / self.ready, 3) if self.ready else 0.0,
+            "wait_seconds_max": round(self.wait_seconds_max, 3),
+        }
+
+
+# Singleton instance
+_file_waiter = None
+
+def get_file_waiter() -> FileReadinessWaiter:
+    """Get or create the FileReadinessWaiter shared by all transcriptions"""
+    global _file_waiter
+    if _file_waiter is None:
+        _file_waiter = FileReadinessWaiter()
+    return _file_waiter
@@ -0,0 +1,276 @@
+"""
+Remote File Registry
+Remembers which audio files are already uploaded to Gemini, keyed by the
+content hash, so retries and reprocessing reuse the remote file instead
+of uploading the same bytes again.
+
+A background sweeper deletes remote files once they expire, or a while
+after their transcription succeeded, so remote storage does not grow.
+"""
+
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import google.generativeai as genai
+
+from app.database import SessionLocal
+from app.models.remote_file import RemoteFile
+from app.services.result_cache import hash_file
+
+logger = logging.getLogger(__name__)
+
+# Gemini keeps uploaded files for 48 hours; stop reusing them a bit earlier
+REMOTE_FILE_TTL = timedelta(hours=48)
+REMOTE_FILE_EXPIRY_MARGIN = timedelta(minutes=30)
+# Keep files whose transcription succeeded this long, for late retries
+REMOTE_FILE_RETENTION_SECONDS = float(os.getenv("REMOTE_FILE_RETENTION_SECONDS", 900))
+REMOTE_FILE_SWEEP_INTERVAL = float(os.getenv("REMOTE_FILE_SWEEP_INTERVAL", 300))  # seconds
+
+
+def _expiry_of(remote_file) -> datetime:
+    """Naive UTC expiry of an uploaded file"""
+    expiration = getattr(remote_file, "expiration_time", None)
+    if isinstance(expiration, datetime):
+        if expiration.tzinfo is not None:
+            expiration = expiration.astimezone(timezone.utc).replace(tzinfo=None)
+        return expiration
+    return datetime.utcnow() + REMOTE_FILE_TTL
+
+
+class FileRegistry:
+    """Uploads audio at most once per content hash and cleans up remote files"""
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        upload_file: Callable = genai.upload_file,
+        get_file: Callable = genai.get_file,
+        delete_file: Callable = genai.delete_file,
+        retention_seconds: float = REMOTE_FILE_RETENTION_SECONDS,
+        sweep_interval: float = REMOTE_FILE_SWEEP_INTERVAL,
+    ):
+        # upload_file/get_file/delete_file are the blocking SDK calls; they run in threads
+        self.session_factory = session_factory
+        self.upload_file = upload_file
+        self.get_file = get_file
+        self.delete_file = delete_file
+        self.retention_seconds = retention_seconds
+        self.sweep_interval = sweep_interval
+
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._lock_users: Dict[str, int] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+
+        self.uploads = 0
+        self.reuses = 0
+        self.bytes_uploaded = 0
+        self.bytes_saved = 0
+        self.deleted = 0
+
+    async def acquire(
+        self,
+        audio_path: str,
+        upload: Optional[Callable[[], Awaitable]] = None,
+        content_hash: Optional[str] = None,
+    ):
+        """
+        Get a remote file for a local recording, uploading only if needed
+
+        Args:
+            audio_path: Path to the audio file
+            upload: Performs the upload (defaults to upload_file in a thread)
+            content_hash: sha256 of the file, computed if not given
+
+        Returns:
+            Tuple of (remote file handle, content hash)
+        """
+        if content_hash is None:
+            content_hash = await asyncio.to_thread(hash_file, audio_path)
+
+        # One upload per hash, even when several segments or retries race
+        async with self._hash_lock(content_hash):
+            remote = await self._reuse(content_hash)
+            if remote is not None:
+                return remote, content_hash
+
+            if upload is None:
+                remote = await asyncio.to_thread(self.upload_file, path=audio_path)
+            else:
+                remote = await upload()
+            size = os.path.getsize(audio_path)
+            self.uploads += 1
+            self.bytes_uploaded += size
+            await asyncio.to_thread(self._save, content_hash, remote, size)
+            return remote, content_hash
+
+    @asynccontextmanager
+    async def _hash_lock(self, content_hash: str):
+        """Serialize uploads, reuses and deletes of one content hash"""
+        lock = self._locks.setdefault(content_hash, asyncio.Lock())
+        self._lock_users[content_hash] = self._lock_users.get(content_hash, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._lock_users[content_hash] -= 1
+            if not self._lock_users[content_hash]:
+                del self._lock_users[content_hash]
+                del self._locks[content_hash]
+
+    async def _reuse(self, content_hash: str):
+        """The registered remote file for a hash, if it is still usable"""
+        row = await asyncio.to_thread(self._load, content_hash)
+        if row is None:
+            return None
+        if row["expires_at"] - REMOTE_FILE_EXPIRY_MARGIN <= datetime.utcnow():
+            await self._delete(row["content_hash"], row["remote_name"])
+            return None
+        try:
+            remote = await asyncio.to_thread(self.get_file, row["remote_name"])
+        except Exception:
+            # Deleted or expired on the remote side
+            await asyncio.to_thread(self._forget, content_hash)
+            return None
+        if getattr(getattr(remote, "state", None), "name", None) == "FAILED":
+            await self._delete(row["content_hash"], row["remote_name"])
+            return None
+
+        self.reuses += 1
+        self.bytes_saved += row["size_bytes"]
+        await asyncio.to_thread(self._touch, content_hash)
+        return remote
+
+    async def finished(self, content_hash: str) -> None:
+        """Mark a file as no longer needed; the sweeper deletes it after the retention period"""
+        await asyncio.to_thread(self._mark_finished, content_hash)
+
+    async def sweep(self) -> int:
+        """Delete expired remote files and finished ones past the retention period"""
+        rows = await asyncio.to_thread(self._sweepable)
+        deleted = 0
+        for row in rows:
+            async with self._hash_lock(row["content_hash"]):
+                # A transcription may have reused the file since it was listed
+                row = await asyncio.to_thread(self._load, row["content_hash"])
+                if row is None or not self._is_sweepable(row, datetime.utcnow()):
+                    continue
+                await self._delete(row["content_hash"], row["remote_name"])
+                deleted += 1
+        return deleted
+
+    async def _delete(self, content_hash: str, remote_name: str) -> None:
+        """Delete a remote file and forget it; the caller holds the hash lock"""
+        try:
+            await asyncio.to_thread(self.delete_file, remote_name)
+            self.deleted += 1
+        except Exception as e:
+            # Already gone remotely, or a transient error: expired files disappear anyway
+            logger.warning("Could not delete remote file", extra={"remote_name": remote_name, "error": str(e)})
+        await asyncio.to_thread(self._forget, content_hash)
+
+    def _load(self, content_hash: str) -> Optional[Dict]:
+        with self.session_factory() as db:
+            row = db.get(RemoteFile, content_hash)
+            if row is None:
+                return None
+            return {"content_hash": row.content_hash, "remote_name": row.remote_name,
+                    "size_bytes": row.size_bytes, "expires_at": row.expires_at,
+                    "finished_at": row.finished_at}
+
+    def _save(self, content_hash: str, remote, size: int) -> None:
+        with self.session_factory() as db:
+            db.merge(RemoteFile(
+                content_hash=content_hash,
+                remote_name=remote.name,
+                size_bytes=size,
+                uploaded_at=datetime.utcnow(),
+                expires_at=_expiry_of(remote),
+                finished_at=None,
+                reuses=0,
+            ))
+            db.commit()
+
+    def _touch(self, content_hash: str) -> None:
+        with self.session_factory() as db:
+            row = db.get(RemoteFile, content_hash)
+            if row is not None:
+                row.reuses = (row.reuses or 0) + 1
+                # A reused file is in use again
+                row.finished_at = None
+                db.commit()
+
+    def _mark_finished(self, content_hash: str) -> None:
+        with self.session_factory() as db:
+            row = db.get(RemoteFile, content_hash)
+            if row is not None:
+                row.finished_at = datetime.utcnow()
+                db.commit()
+
+    def _forget(self, content_hash: str) -> None:
+        with self.session_factory() as db:
+            db.query(RemoteFile).filter(RemoteFile.content_hash == content_hash).delete()
+            db.commit()
+
+    def _is_sweepable(self, row: Dict, now: datetime) -> bool:
+        """Same condition as _sweepable, for one loaded row"""
+        finished_before = now - timedelta(seconds=self.retention_seconds)
+        return row["expires_at"] <= now or (
+            row["finished_at"] is not None and row["finished_at"] <= finished_before
+        )
+
+    def _sweepable(self) -> List[Dict]:
+        now = datetime.utcnow()
+        finished_before = now - timedelta(seconds=self.retention_seconds)
+        with self.session_factory() as db:
+            rows = db.query(RemoteFile).filter(
+                (RemoteFile.expires_at <= now)
+                | (RemoteFile.finished_at.isnot(None) & (RemoteFile.finished_at <= finished_before))
+            ).all()
+            return [{"content_hash": r.content_hash, "remote_name": r.remote_name} for r in rows]
+
+    async def start(self) -> None:
+        """Start the background sweeper"""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep_loop())
+
+    async def stop(self) -> None:
+        """Stop the background sweeper"""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            try:
+                deleted = await self.sweep()
+                if deleted:
+                    logger.info("Removed remote files", extra={"deleted": deleted})
+            except Exception:
+                logger.exception("File registry sweep failed")
+            await asyncio.sleep(self.sweep_interval)
+
+    def stats(self) -> Dict:
+        """Counters for the health endpoint"""
+        return {
+            "uploads": self.uploads,
+            "reuses": self.reuses,
+            "bytes_uploaded": self.bytes_uploaded,
+            "bytes_saved": self.bytes_saved,
+            "deleted": self.deleted,
+        }
+
+
+# Singleton instance
+_file_registry = None
+
+def get_file_registry() -> FileRegistry:
+    """Get or create the FileRegistry shared by all transcriptions"""
+    global _file_registry
+    if _file_registry is None:
+        _file_registry = FileRegistry()
+    return _file_registry
@@ -3,35 +3,65 @@ Gemini AI Service
 Handles all AI operations: transcription, summarization, action item extraction
 """
 
+import asyncio
+import logging
 import os
+import time
 import google.generativeai as genai
 from typing import Dict, List, Optional
 
-class GeminiService:
-    """Simple service to interact with Gemini AI"""
-    
-    def __init__(self):
-        """Initialize Gemini with API key"""
-        api_key = os.getenv('GEMINI_API_KEY')
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY not found in environment variables")
-        
-        genai.configure(api_key=api_key)
-        # Use Gemini 2.0 Flash - fast and cost-effective
-        self.model = genai.GenerativeModel('gemini-2.0-flash')
-    
-    def generate_summary(self, transcription: str) -> Dict:
-        """
-        Generate a meeting summary from transcription
-        
-        Args:
-            transcription: The full text transcription of the meeting
-            
-        Returns:
-            Dictionary with title, key_points, decisions, and action_items
-        """
-        
-        prompt = f"""
+from app.services.model_scheduler import ModelScheduler, get_model_scheduler
+from app.services.file_readiness import FileReadinessWaiter, get_file_waiter
+from app.services.file_registry import FileRegistry, get_file_registry
+from app.services.summarizer import estimate_tokens
+from app.services.structured_output import (
+    parse_summary, parse_action_items, parse_batch_action_items,
+    SUMMARY_RESPONSE_SCHEMA, ACTION_ITEMS_RESPONSE_SCHEMA, BATCH_ACTION_ITEMS_RESPONSE_SCHEMA,
+)
+from app.metrics import track_stage
+
+logger = logging.getLogger(__name__)
+
+# Use Gemini 2.0 Flash - fast and cost-effective
+GEMINI_MODEL = "gemini-2.0-flash"
+
+# Bump when a prompt changes so cached results from the old prompt are not
+# reused; each cached result type has its own, so a summary prompt change
+# does not force re-transcription
+TRANSCRIBE_PROMPT_VERSION = "1"
+SUMMARY_PROMPT_VERSION = "2"
+
+# Ask for summaries and action items in JSON mode with a response schema
+GEMINI_STRUCTURED_OUTPUT = os.getenv("GEMINI_STRUCTURED_OUTPUT", "true").lower() == "true"
+
+# Batched action item extraction: short texts share one request up to these
+# limits; longer texts, and inputs a batch reply missed, get their own request
+ACTION_ITEMS_BATCH_TOKENS = int(os.getenv("ACTION_ITEMS_BATCH_TOKENS", 12000))
+ACTION_ITEMS_BATCH_SIZE = int(os.getenv("ACTION_ITEMS_BATCH_SIZE", 20))
+
+TRANSCRIBE_PROMPT = "Please transcribe this audio file accurately. Provide the full transcription."
+
+# How long GeminiService waits for an uploaded file to become ACTIVE
+# (AsyncGeminiService uses the shared FileReadinessWaiter instead)
+FILE_POLL_INTERVAL = 2  # seconds
+FILE_MAX_WAIT = 120  # Maximum 2 minutes
+
+# Gemini bills audio at about 32 tokens per second; at ~128 kbit/s that is
+# one token per 500 bytes. Used to charge uploads against the token budget.
+AUDIO_BYTES_PER_TOKEN = 500
+
+
+def configure_gemini() -> None:
+    """Configure the Gemini client with the API key from the environment"""
+    api_key = os.getenv('GEMINI_API_KEY')
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY not found in environment variables")
+    genai.configure(api_key=api_key)
+
+
+def build_summary_prompt(transcription: str) -> str:
+    """Build the prompt that asks for title, key points, decisions and action items"""
+    return f"""
 You are a meeting assistant. Analyze this meeting transcription and provide:
 
 1. A short meeting title (5-8 words)
@@ -54,31 +84,125 @@ Respond in this exact JSON format (valid JSON only, no markdown):
 
 Keep it simple and clear. If something is not mentioned, use empty arrays.
 """
+
+
+def parse_summary_response(response_text: str) -> Dict:
+    """Parse and validate the model's summary reply into a dictionary"""
+    return parse_summary(response_text).model_dump()
+
+
+def json_generation_config(schema: Dict) -> Optional[Dict]:
+    """JSON mode with a response schema, unless turned off"""
+    if not GEMINI_STRUCTURED_OUTPUT:
+        return None
+    return {"response_mime_type": "application/json", "response_schema": schema}
+
+
+def build_action_items_prompt(text: str) -> str:
+    """Build the prompt that asks for a list of action items"""
+    return f"""
+Extract all action items from this meeting text.
+For each action item, identify:
+- The task description
+- Who it's assigned to (if mentioned)
+- Any deadline mentioned
+- Priority level (high/medium/low)
+
+Text:
+{text}
+
+Return as a simple list of action items in JSON format:
+[
+    {{"task": "description", "assignee": "name", "deadline": "date or null", "priority": "medium"}}
+]
+
+If no action items found, return an empty array [].
+"""
+
+
+def build_batch_action_items_prompt(texts: Dict[str, str]) -> str:
+    """Build one prompt that asks for the action items of several texts"""
+    sections = "\n\n".join(
+        f"=== ITEM {item_id} ===\n{text}\n=== END ITEM {item_id} ===" for item_id, text in texts.items()
+    )
+    return f"""
+Extract all action items from each of the meeting texts below.
+Every text starts with "=== ITEM <id> ===" and ends with "=== END ITEM <id> ===".
+Treat the texts separately: an action item belongs only to the text it appears in.
+For each action item, identify:
+- The task description
+- Who it's assigned to (if mentioned)
+- Any deadline mentioned
+- Priority level (high/medium/low)
+
+{sections}
+
+Return one entry per text, in the same order, in JSON format:
+[
+    {{"id": "<id>", "action_items": [
+        {{"task": "description", "assignee": "name", "deadline": "date or null", "priority": "medium"}}
+    ]}}
+]
+
+Use an empty action_items array for a text without action items.
+"""
+
+
+def pack_batches(texts: List[str], max_tokens: int, max_items: int):
+    """
+    Group texts into batches for one request each
+
+    Args:
+        texts: Input texts
+        max_tokens: Token budget for the texts of one batch
+        max_items: Most texts per batch
+
+    Returns:
+        (batches, singles): batches are lists of text indexes; singles are
+        indexes of texts too large to share a request
+    """
+    batches, singles = [], []
+    current, current_tokens = [], 0
+    for index, text in enumerate(texts):
+        tokens = estimate_tokens(text)
+        if tokens > max_tokens // 2:
+            singles.append(index)
+            continue
+        if current and (current_tokens + tokens > max_tokens or len(current) >= max_items):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(index)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches, singles
+
+
+class GeminiService:
+    """Simple service to interact with Gemini AI"""
+    
+    def __init__(self):
+        """Initialize Gemini with API key"""
+        configure_gemini()
+        self.model_name = GEMINI_MODEL
+        self.model = genai.GenerativeModel(self.model_name)
+    
+    def generate_summary(self, transcription: str) -> Dict:
+        """
+        Generate a meeting summary from transcription
         
-        try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
-            
-            # Try to parse JSON from response
-            # Remove markdown code blocks if present
-            if response_text.startswith("```json"):
-                response_text = response_text.replace("```json", "").replace("```", "").strip()
-            elif response_text.startswith("```"):
-                response_text = response_text.replace("```", "").strip()
-            
-            # Parse JSON
-            import json
-            summary = json.loads(response_text)
-            return summary
+        Args:
+            transcription: The full text transcription of the meeting
             
-        except json.JSONDecodeError:
-            # Fallback if JSON parsing fails
-            return {
-                "title": "Meeting Summary",
-                "key_points": [response_text[:200]] if response_text else [],
-                "decisions": [],
-                "action_items": []
-            }
+        Returns:
+            Dictionary with title, key_points, decisions, and action_items
+        """
+        try:
+            response = self.model.generate_content(
+                build_summary_prompt(transcription),
+                generation_config=json_generation_config(SUMMARY_RESPONSE_SCHEMA)
+            )
+            return parse_summary_response(response.text)
         except Exception as e:
             raise Exception(f"Error generating summary: {str(e)}")
     
@@ -93,36 +217,28 @@ Keep it simple and clear. If something is not mentioned, use empty arrays.
         Returns:
             Transcription text
         """
-        import time
-        
         try:
             # Upload the audio file
-            print(f"Uploading file: {audio_path}")
+            logger.debug("Uploading file", extra={"audio_path": audio_path})
             audio_file = genai.upload_file(path=audio_path)
-            print(f"File uploaded: {audio_file.name}, State: {audio_file.state.name}")
+            logger.debug("File uploaded", extra={"file": audio_file.name, "state": audio_file.state.name})
             
             # Wait for the file to be processed and become ACTIVE
-            max_wait = 120  # Maximum 2 minutes
             waited = 0
             while audio_file.state.name != "ACTIVE":
-                if waited >= max_wait:
+                if waited >= FILE_MAX_WAIT:
                     raise Exception(f"File processing timeout. State: {audio_file.state.name}")
                 
-                print(f"Waiting for file to be ACTIVE... Current state: {audio_file.state.name}")
-                time.sleep(2)
-                waited += 2
+                time.sleep(FILE_POLL_INTERVAL)
+                waited += FILE_POLL_INTERVAL
                 audio_file = genai.get_file(audio_file.name)
             
-            print(f"File is ACTIVE! Starting transcription...")
-            
-            # Create prompt for transcription
-            prompt = "Please transcribe this audio file accurately. Provide the full transcription."
+            logger.debug("File is active", extra={"file": audio_file.name, "waited_seconds": waited})
             
             # Generate transcription using Gemini 2.0
-            model = genai.GenerativeModel('gemini-2.0-flash')
-            response = model.generate_content([prompt, audio_file])
+            response = self.model.generate_content([TRANSCRIBE_PROMPT, audio_file])
             
-            print("Transcription completed!")
+            logger.debug("Transcription completed", extra={"file": audio_file.name})
             return response.text
             
         except Exception as e:
@@ -138,35 +254,189 @@ Keep it simple and clear. If something is not mentioned, use empty arrays.
         Returns:
             List of action items with details
         """
-        
-        prompt = f"""
-Extract all action items from this meeting text.
-For each action item, identify:
-- The task description
-- Who it's assigned to (if mentioned)
-- Any deadline mentioned
-- Priority level (high/medium/low)
-
-Text:
-{text}
-
-Return as a simple list of action items in JSON format:
-[
-    {{"task": "description", "assignee": "name", "deadline": "date or null", "priority": "medium"}}
-]
+        try:
+            response = self.model.generate_content(
+                build_action_items_prompt(text),
+                generation_config=json_generation_config(ACTION_ITEMS_RESPONSE_SCHEMA)
+            )
+            return [item.model_dump() for item in parse_action_items(response.text)]
+        except Exception as e:
+            raise Exception(f"Error extracting action items: {str(e)}")
 
-If no action items found, return an empty array [].
-"""
+class AsyncGeminiService:
+    """
+    Async variant of GeminiService
+    Every call is awaitable and never blocks the event loop, so one worker
+    process can keep many meetings in flight at once. All requests go
+    through the shared ModelScheduler (rate limits, retries, circuit breaker).
+    """
+    
+    def __init__(
+        self,
+        scheduler: Optional[ModelScheduler] = None,
+        file_waiter: Optional[FileReadinessWaiter] = None,
+        file_registry: Optional[FileRegistry] = None
+    ):
+        """Initialize Gemini with API key"""
+        configure_gemini()
+        self.model_name = GEMINI_MODEL
+        self.model = genai.GenerativeModel(self.model_name)
+        self.scheduler = scheduler or get_model_scheduler()
+        self.file_waiter = file_waiter or get_file_waiter()
+        self.file_registry = file_registry or get_file_registry()
+    
+    async def generate_summary(self, transcription: str) -> Dict:
+        """
+        Generate a meeting summary from transcription
+        
+        Args:
+            transcription: The full text transcription of the meeting
+            
+        Returns:
+            Dictionary with title, key_points, decisions, and action_items
+        """
+        try:
+            prompt = build_summary_prompt(transcription)
+            response = await self.scheduler.run(
+                lambda: self.model.generate_content_async(prompt, generation_config=json_generation_config(SUMMARY_RESPONSE_SCHEMA)),
+                estimated_tokens=estimate_tokens(prompt)
+            )
+            return parse_summary_response(response.text)
+        except Exception as e:
+            raise Exception(f"Error generating summary: {str(e)}")
+    
+    async def transcribe_audio(self, audio_path: str) -> str:
+        """
+        Transcribe audio file to text
+        
+        The upload only exists as a blocking call in the SDK, so it runs in
+        a worker thread, and is skipped when the FileRegistry already holds
+        the same content. Readiness is awaited on the shared FileReadinessWaiter.
+        
+        Args:
+            audio_path: Path to the audio file
+            
+        Returns:
+            Transcription text
+        """
+        try:
+            # Upload once per content; retries and reprocessing reuse the remote file
+            started = time.perf_counter()
+            with track_stage("file_upload", self.model_name):
+                audio_file, content_hash = await self.file_registry.acquire(
+                    audio_path,
+                    upload=lambda: self.scheduler.run(
+                        lambda: asyncio.to_thread(genai.upload_file, path=audio_path),
+                        rate_limited=False
+                    )
+                )
+            uploaded = time.perf_counter()
+            
+            # Wait for the file to be processed and become ACTIVE
+            with track_stage("file_wait", self.model_name):
+                audio_file = await self.file_waiter.wait_active(audio_file)
+            active = time.perf_counter()
+            
+            audio_tokens = os.path.getsize(audio_path) // AUDIO_BYTES_PER_TOKEN
+            response = await self.scheduler.run(
+                lambda: self.model.generate_content_async([TRANSCRIBE_PROMPT, audio_file]),
+                estimated_tokens=audio_tokens + estimate_tokens(TRANSCRIBE_PROMPT)
+            )
+            await self.file_registry.finished(content_hash)
+            logger.info("Audio transcribed", extra={
+                "file": audio_file.name,
+                "model": self.model_name,
+                "upload_seconds": round(uploaded - started, 3),
+                "file_wait_seconds": round(active - uploaded, 3),
+                "model_seconds": round(time.perf_counter() - active, 3),
+            })
+            return response.text
+            
+        except Exception as e:
+            raise Exception(f"Error transcribing audio: {str(e)}")
+    
+    async def _generate_json(self, prompt: str, schema: Dict):
+        """Send a text prompt in JSON mode through the scheduler"""
+        return await self.scheduler.run(
+            lambda: self.model.generate_content_async(prompt, generation_config=json_generation_config(schema)),
+            estimated_tokens=estimate_tokens(prompt)
+        )
+    
+    async def extract_action_items(self, text: str) -> List[Dict]:
+        """
+        Extract action items from meeting text
         
+        Args:
+            text: Meeting transcription or notes
+            
+        Returns:
+            List of action items with details
+        """
         try:
-            response = self.model.generate_content(prompt)
-            # In production, parse JSON response
-            return []
+            response = await self._generate_json(build_action_items_prompt(text), ACTION_ITEMS_RESPONSE_SCHEMA)
+            return [item.model_dump() for item in parse_action_items(response.text)]
         except Exception as e:
             raise Exception(f"Error extracting action items: {str(e)}")
+    
+    async def extract_action_items_batch(
+        self,
+        texts: List[str],
+        max_tokens: int = ACTION_ITEMS_BATCH_TOKENS,
+        max_items: int = ACTION_ITEMS_BATCH_SIZE
+    ) -> List[List[Dict]]:
+        """
+        Extract action items from many texts with as few requests as possible
+        
+        Short texts are packed into one request with per-text delimiters and
+        the reply is split back per text. Texts too large to share a request,
+        and texts a batch reply left out (e.g. a truncated reply), get a
+        request of their own.
+        
+        Args:
+            texts: Meeting transcriptions or notes
+            max_tokens: Token budget for the texts of one request
+            max_items: Most texts per request
+            
+        Returns:
+            One list of action items per input text, in input order
+        """
+        results: List[Optional[List[Dict]]] = [None] * len(texts)
+        batches, singles = pack_batches(texts, max_tokens, max_items)
+        
+        async def run_batch(indexes: List[int]) -> None:
+            if len(indexes) == 1:
+                singles.append(indexes[0])
+                return
+            ids = {str(n): index for n, index in enumerate(indexes, start=1)}
+            try:
+                response = await self._generate_json(
+                    build_batch_action_items_prompt({item_id: texts[i] for item_id, i in ids.items()}),
+                    BATCH_ACTION_ITEMS_RESPONSE_SCHEMA
+                )
+                parsed = parse_batch_action_items(response.text)
+            except Exception as e:
+                logger.warning(
+                    "Batched action item extraction failed, retrying one by one",
+                    extra={"model": self.model_name, "items": len(ids), "error": str(e)}
+                )
+                parsed = {}
+            for item_id, index in ids.items():
+                if item_id in parsed:
+                    results[index] = [item.model_dump() for item in parsed[item_id]]
+                else:
+                    singles.append(index)
+        
+        await asyncio.gather(*(run_batch(batch) for batch in batches))
+        
+        async def run_single(index: int) -> None:
+            results[index] = await self.extract_action_items(texts[index])
+        
+        await asyncio.gather(*(run_single(index) for index in singles))
+        return results
 
-# Singleton instance
+# Singleton instances
 _gemini_service = None
+_async_gemini_service = None
 
 def get_gemini_service() -> GeminiService:
     """Get or create GeminiService instance"""
@@ -174,3 +444,10 @@ def get_gemini_service() -> GeminiService:
     if _gemini_service is None:
         _gemini_service = GeminiService()
     return _gemini_service
+
+def get_async_gemini_service() -> AsyncGeminiService:
+    """Get or create AsyncGeminiService instance"""
+    global _async_gemini_service
+    if _async_gemini_service is None:
+        _async_gemini_service = AsyncGeminiService()
+    return _async_gemini_service
@@ -0,0 +1,133 @@
+"""
+Upload Ingestion Service
+Streams an uploaded recording to disk in fixed-size chunks. In the same
+pass it enforces the size limit, checks the file really is audio/video
+and computes its content hash. Nothing is left behind if it is rejected.
+"""
+
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import aiofiles
+from fastapi import UploadFile
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+SNIFF_BYTES = 12
+
+
+class UploadRejected(Exception):
+    """The upload was refused; carries the HTTP status to answer with"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def too_large_message(max_bytes: int) -> str:
+    """413 detail for a size limit (limits under 1MB are shown in KB)"""
+    if max_bytes < 1024 * 1024:
+        return f"File too large. Max size: {max_bytes / 1024:.1f}KB"
+    return f"File too large. Max size: {max_bytes / (1024 * 1024):.1f}MB"
+
+
+@dataclass
+class IngestedFile:
+    """A fully written upload"""
+    path: str
+    size: int
+    content_hash: str
+
+
+def sniff_format(header: bytes) -> Optional[str]:
+    """
+    Guess the container format from the first bytes of a file
+
+    Returns a file extension (".mp3", ".wav", ...) or None if unknown.
+    MP4 and M4A share a container, so both report ".mp4".
+    """
+    if header.startswith(b"ID3"):
+        return ".mp3"
+    if len(header) >= 2 and header[0] == 0xFF and (header[1] & 0xE0) == 0xE0:
+        return ".mp3"  # MPEG audio frame without ID3 tag
+    if header.startswith(b"RIFF") and header[8:12] == b"WAVE":
+        return ".wav"
+    if header[4:8] == b"ftyp":
+        return ".mp4"
+    if header.startswith(b"\x1a\x45\xdf\xa3"):
+        return ".webm"
+    if header.startswith(b"OggS"):
+        return ".ogg"
+    return None
+
+
+def _format_allowed(detected: str, allowed_extensions: Iterable[str]) -> bool:
+    """Check a sniffed format against the allowed extensions"""
+    allowed = set(allowed_extensions)
+    if detected == ".mp4":
+        return bool(allowed & {".mp4", ".m4a"})
+    return detected in allowed
+
+
+async def ingest_upload(
+    upload: UploadFile,
+    upload_dir: str,
+    file_ext: str,
+    max_bytes: int,
+    allowed_extensions: Iterable[str],
+) -> IngestedFile:
+    """
+    Write an upload to a temporary file under upload_dir
+
+    The caller moves the file to its final name once the meeting row
+    exists. On any error the partial file is removed.
+
+    Raises:
+        UploadRejected: file too large, empty, or not a supported format
+    """
+    path = os.path.join(upload_dir, f"upload_{uuid.uuid4().hex}{file_ext}.part")
+    digest = hashlib.sha256()
+    header = b""
+    size = 0
+
+    try:
+        async with aiofiles.open(path, "wb") as out:
+            while True:
+                chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadRejected(413, too_large_message(max_bytes))
+
+                if len(header) < SNIFF_BYTES:
+                    header += chunk[:SNIFF_BYTES - len(header)]
+                    if len(header) >= SNIFF_BYTES:
+                        _check_format(header, allowed_extensions)
+
+                digest.update(chunk)
+                await out.write(chunk)
+
+        if size == 0:
+            raise UploadRejected(400, "Uploaded file is empty")
+        if len(header) < SNIFF_BYTES:
+            _check_format(header, allowed_extensions)
+
+    except BaseException:
+        # Includes client disconnects and task cancellation
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+
+    return IngestedFile(path=path, size=size, content_hash=digest.hexdigest())
+
+
+def _check_format(header: bytes, allowed_extensions: Iterable[str]) -> None:
+    """Reject files whose content is not one of the allowed formats"""
+    detected = sniff_format(header)
+    if detected is None or not _format_allowed(detected, allowed_extensions):
+        raise UploadRejected(400, "File content is not a supported audio or video format")
@@ -0,0 +1,314 @@
+"""
+Job Queue Service
+Processes uploaded meetings in the background with a pool of workers.
+Job state lives in the database so queued work survives a restart.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import case, func, or_
+
+from app.database import SessionLocal
+from app.models.job import ProcessingJob
+from app.models.meeting import Meeting
+from app.services.gemini_service import get_async_gemini_service
+from app.services.processing import process_meeting, resummarize_meeting, publish_status, is_usable_summary
+from app.services.model_scheduler import unavailable_cause
+from app.services.response_cache import get_response_cache, meeting_tags
+from app.logs import log_context
+from app.metrics import JOB_SECONDS, current_route
+
+logger = logging.getLogger(__name__)
+
+# Workers are asyncio tasks, not threads: model calls are awaited, so a
+# single process can keep many meetings in flight.
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 16))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", 5))  # seconds
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+# A failed job is retried after JOB_RETRY_BACKOFF seconds, doubling with
+# every attempt up to JOB_RETRY_BACKOFF_MAX
+JOB_RETRY_BACKOFF = float(os.getenv("JOB_RETRY_BACKOFF", 30))
+JOB_RETRY_BACKOFF_MAX = float(os.getenv("JOB_RETRY_BACKOFF_MAX", 600))
+# Re-summarization backfills share the workers but never take more than
+# this many of them, and new uploads are always claimed first
+RESUMMARIZE_CONCURRENCY = int(os.getenv("RESUMMARIZE_CONCURRENCY", 4))
+
+# Job status after an attempt -> outcome label of job_seconds
+JOB_OUTCOMES = {"completed": "completed", "queued": "retried", "failed": "failed"}
+
+# Job kind -> coroutine that runs it
+JOB_HANDLERS = {
+    "process": process_meeting,
+    "resummarize": resummarize_meeting,
+}
+
+
+class JobQueue:
+    """Database-backed queue of meeting processing jobs"""
+
+    def __init__(
+        self,
+        workers: int = JOB_WORKERS,
+        poll_interval: float = JOB_POLL_INTERVAL,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        resummarize_concurrency: int = RESUMMARIZE_CONCURRENCY,
+        retry_backoff: float = JOB_RETRY_BACKOFF,
+        retry_backoff_max: float = JOB_RETRY_BACKOFF_MAX,
+        session_factory=SessionLocal,
+    ):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        self.resummarize_concurrency = resummarize_concurrency
+        self.session_factory = session_factory
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def enqueue(self, db, meeting: Meeting, kind: str = "process") -> ProcessingJob:
+        """
+        Add a job for a meeting
+
+        The job is added to the caller's session; it becomes visible to the
+        workers once the caller commits. Call notify() after committing.
+        """
+        meeting.status = "queued"
+        job = ProcessingJob(meeting_id=meeting.id, kind=kind, status="queued")
+        db.add(job)
+        return job
+
+    def notify(self) -> None:
+        """Wake up idle workers (safe to call from any thread)"""
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def start(self) -> None:
+        """Recover interrupted jobs and start the worker pool"""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        recovered = await asyncio.to_thread(self.recover)
+        if recovered:
+            logger.info("Re-queued interrupted jobs", extra={"recovered": recovered})
+        for n in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker(n)))
+
+    async def stop(self) -> None:
+        """Stop the worker pool; running jobs are recovered on next start"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def recover(self) -> int:
+        """Put jobs left running by a previous process back in the queue"""
+        with self.session_factory() as db:
+            jobs = db.query(ProcessingJob).filter(ProcessingJob.status == "running").all()
+            for job in jobs:
+                meeting = db.get(Meeting, job.meeting_id)
+                if job.attempts >= self.max_attempts:
+                    job.status = "failed"
+                    job.error = "Interrupted too many times"
+                    job.finished_at = datetime.utcnow()
+                    if meeting:
+                        meeting.status = "failed"
+                else:
+                    job.status = "queued"
+                    if meeting:
+                        meeting.status = "queued"
+            meeting_ids = [job.meeting_id for job in jobs]
+            db.commit()
+            get_response_cache().invalidate(*(tag for m in meeting_ids for tag in meeting_tags(m)))
+            return len(jobs)
+
+    def claim_next(self) -> Optional[int]:
+        """
+        Atomically claim the next queued job, returning its ID
+
+        Processing jobs go first, oldest first; re-summarization jobs only
+        while fewer than resummarize_concurrency of them are running. Jobs
+        waiting out a retry backoff are skipped.
+        """
+        with self.session_factory() as db:
+            while True:
+                query = db.query(ProcessingJob.id).filter(
+                    ProcessingJob.status == "queued",
+                    or_(ProcessingJob.not_before.is_(None), ProcessingJob.not_before <= datetime.utcnow()),
+                )
+                running_resummarize = (
+                    db.query(func.count(ProcessingJob.id))
+                    .filter(ProcessingJob.status == "running", ProcessingJob.kind == "resummarize")
+                    .scalar()
+                )
+                if running_resummarize >= self.resummarize_concurrency:
+                    query = query.filter(ProcessingJob.kind != "resummarize")
+                job_id = (
+                    query
+                    .order_by(case((ProcessingJob.kind == "process", 0), else_=1), ProcessingJob.id)
+                    .limit(1)
+                    .scalar()
+                )
+                if job_id is None:
+                    return None
+
+                # Only one worker can move the job out of "queued"
+                claimed = (
+                    db.query(ProcessingJob)
+                    .filter(ProcessingJob.id == job_id, ProcessingJob.status == "queued")
+                    .update(
+                        {
+                            "status": "running",
+                            "started_at": datetime.utcnow(),
+                            "attempts": ProcessingJob.attempts + 1,
+                        },
+                        synchronize_session=False,
+                    )
+                )
+                db.commit()
+                if claimed:
+                    return job_id
+
+    async def run_job(self, job_id: int) -> None:
+        """Run one claimed job and record the outcome"""
+        db = self.session_factory()
+        try:
+            job = await asyncio.to_thread(db.get, ProcessingJob, job_id)
+            if job is None:
+                return
+            meeting_id = job.meeting_id
+            kind = job.kind or "process"
+            handler = JOB_HANDLERS[kind]
+
+            route_token = current_route.set(f"job:{kind}")
+            started = time.perf_counter()
+            try:
+                with log_context(meeting_id, job_id):
+                    logger.info("Job started", extra={"kind": kind, "attempt": job.attempts})
+                    try:
+                        await handler(db, meeting_id)
+                        job.status = "completed"
+                        job.error = None
+                        logger.info("Job completed", extra={"kind": kind, "seconds": round(time.perf_counter() - started, 3)})
+                    except Exception as e:
+                        logger.exception("Job failed", extra={"kind": kind, "error": str(e), "attempt": job.attempts})
+                        status = await asyncio.to_thread(self._record_failure, db, job, e)
+                        publish_status(meeting_id, status, error=str(e))
+            finally:
+                current_route.reset(route_token)
+            JOB_SECONDS.labels(kind, JOB_OUTCOMES.get(job.status, job.status), _model_name()).observe(
+                time.perf_counter() - started
+            )
+
+            failed = job.status != "completed"
+            if job.status != "queued":
+                job.finished_at = datetime.utcnow()
+            await asyncio.to_thread(db.commit)
+            if failed:
+                # The failure changed the meeting's status (and maybe its summary)
+                get_response_cache().invalidate(*meeting_tags(meeting_id))
+        finally:
+            db.close()
+
+    def retry_delay(self, attempts: int) -> float:
+        """Seconds to wait before retrying a job that has failed `attempts` times"""
+        return min(self.retry_backoff_max, self.retry_backoff * 2 ** max(attempts - 1, 0))
+
+    def _record_failure(self, db, job: ProcessingJob, error: Exception) -> str:
+        """
+        Record a failed attempt; returns the meeting's resulting status
+
+        The job goes back in the queue (after a backoff) until it has used
+        up max_attempts; only then are the job and the meeting failed. When
+        the model was unavailable (quota, overload, open circuit) the attempt
+        is not counted: the job waits as long as the scheduler asks and is
+        tried again.
+        """
+        db.rollback()
+        meeting = db.get(Meeting, job.meeting_id)
+        job.error = str(error)
+        unavailable = unavailable_cause(error)
+        if unavailable is not None or job.attempts < self.max_attempts:
+            if unavailable is not None:
+                job.attempts -= 1
+                delay = max(unavailable.retry_after, self.retry_backoff)
+            else:
+                delay = self.retry_delay(job.attempts)
+            job.status = "queued"
+            job.not_before = datetime.utcnow() + timedelta(seconds=delay)
+            if meeting:
+                meeting.status = "queued"
+            return "queued"
+
+        if meeting and job.kind == "resummarize" and is_usable_summary(meeting.summary):
+            # The previous summary is still there; keep the meeting usable
+            meeting.status = "completed"
+        elif meeting:
+            meeting.status = "failed"
+            meeting.summary = {"error": str(error)}
+        job.status = "failed"
+        return meeting.status if meeting else "failed"
+
+    def stats(self) -> Dict:
+        """Job counts by status, for the health endpoint"""
+        with self.session_factory() as db:
+            rows = (
+                db.query(ProcessingJob.status, func.count(ProcessingJob.id))
+                .group_by(ProcessingJob.status)
+                .all()
+            )
+        counts = {status: count for status, count in rows}
+        return {
+            "workers": len(self._tasks),
+            "queued": counts.get("queued", 0),
+            "running": counts.get("running", 0),
+            "failed": counts.get("failed", 0),
+        }
+
+    async def _worker(self, n: int) -> None:
+        """Worker loop: claim a job, run it, repeat"""
+        while True:
+            self._wakeup.clear()
+            try:
+                job_id = await asyncio.to_thread(self.claim_next)
+            except Exception:
+                logger.exception("Could not claim a job", extra={"worker": n})
+                job_id = None
+
+            if job_id is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self.run_job(job_id)
+            except Exception as e:
+                # e.g. the meeting was deleted while it was being processed
+                logger.exception("Job could not be recorded", extra={"worker": n, "job_id": job_id, "error": str(e)})
+
+
+def _model_name() -> str:
+    """Model the jobs run on, for metric labels"""
+    try:
+        return get_async_gemini_service().model_name
+    except Exception:
+        # Not configured (e.g. no API key); the job failed for that reason
+        return "unknown"
+
+
+# Singleton instance
+_job_queue = None
+
+def get_job_queue() -> JobQueue:
+    """Get or create JobQueue instance"""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue()
+    return _job_queue
@@ -0,0 +1,302 @@
+"""
+Model Call Scheduler
+Every Gemini request goes through one ModelScheduler, which applies:
+
+- a token-bucket rate limit on requests per minute and tokens per minute
+- a global limit on concurrent requests
+- retries with exponential backoff and full jitter on retryable errors
+  (quota, overload, timeouts)
+- a circuit breaker that fails fast after repeated failures, then lets a
+  single trial request through once the cool-down has passed
+
+When it gives up on a call that may still succeed later (retries used up,
+or the circuit is open) it raises ModelUnavailableError, which the job
+queue answers by re-queueing the job instead of failing the meeting.
+
+The clock and random source are injectable, so the timing behaviour can
+be exercised with a fake clock and a fake model client.
+"""
+
+import asyncio
+import os
+import random
+import time
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+GEMINI_REQUESTS_PER_MINUTE = float(os.getenv("GEMINI_REQUESTS_PER_MINUTE", 15))
+GEMINI_TOKENS_PER_MINUTE = float(os.getenv("GEMINI_TOKENS_PER_MINUTE", 1000000))
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", 4))
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", 4))
+GEMINI_BACKOFF_BASE = float(os.getenv("GEMINI_BACKOFF_BASE", 1.0))  # seconds, doubled per attempt
+GEMINI_BACKOFF_MAX = float(os.getenv("GEMINI_BACKOFF_MAX", 60.0))
+GEMINI_BREAKER_THRESHOLD = int(os.getenv("GEMINI_BREAKER_THRESHOLD", 5))  # consecutive failures
+GEMINI_BREAKER_RESET_SECONDS = float(os.getenv("GEMINI_BREAKER_RESET_SECONDS", 60.0))
+
+# HTTP status codes worth retrying: rate limited, server errors, overloaded, timeout
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+RETRYABLE_MESSAGES = ("429", "quota", "resource exhausted", "rate limit", "unavailable", "overloaded", "deadline")
+
+
+class ModelUnavailableError(Exception):
+    """The model can't serve the call right now; try again after retry_after seconds"""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(ModelUnavailableError):
+    """Raised instead of calling the model while the circuit breaker is open"""
+
+
+def unavailable_cause(error: BaseException) -> Optional[ModelUnavailableError]:
+    """The ModelUnavailableError behind an error, if any (callers wrap model errors)"""
+    while error is not None:
+        if isinstance(error, ModelUnavailableError):
+            return error
+        error = error.__cause__ or error.__context__
+    return None
+
+
+class SystemClock:
+    """Real time; tests pass an object with the same two methods"""
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether a failed model call may succeed if repeated later"""
+    if isinstance(error, ModelUnavailableError):
+        # Already given up on by a scheduler
+        return False
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    code = getattr(error, "code", None)
+    if isinstance(code, int) and code in RETRYABLE_STATUS_CODES:
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in RETRYABLE_MESSAGES)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at rate_per_minute
+
+    A request larger than the bucket waits for a full bucket instead of
+    waiting forever.
+    """
+
+    def __init__(self, rate_per_minute: float, clock=None):
+        self.capacity = rate_per_minute
+        self.refill_per_second = rate_per_minute / 60.0
+        self.clock = clock or SystemClock()
+        self.tokens = rate_per_minute
+        self.updated = self.clock.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self.clock.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1) -> float:
+        """Take tokens, waiting until they are available; returns seconds waited"""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        # The lock keeps waiters in arrival order
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.refill_per_second
+                await self.clock.sleep(delay)
+                waited += delay
+
+
+class CircuitBreaker:
+    """
+    Opens after failure_threshold consecutive failures
+
+    While open, calls fail fast. After reset_seconds one trial call is let
+    through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float, clock=None):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock or SystemClock()
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def remaining(self) -> float:
+        """Seconds until an open circuit lets a trial call through"""
+        if self.state != "open":
+            return 0.0
+        return max(self.reset_seconds - (self.clock.monotonic() - self.opened_at), 0.0)
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError if the call must not go out"""
+        if self.state == "closed":
+            return
+        if self.state == "open":
+            if self.remaining() > 0:
+                raise CircuitOpenError(
+                    "Model circuit breaker is open; too many recent failures", retry_after=self.remaining(),
+                )
+            self.state = "half_open"
+        if self._trial_in_flight:
+            raise CircuitOpenError(
+                "Model circuit breaker is half-open; trial request in flight", retry_after=self.reset_seconds,
+            )
+        self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._trial_in_flight = False
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = self.clock.monotonic()
+
+    def release(self) -> None:
+        """Forget a trial call that ended without a verdict (e.g. a bad request)"""
+        self._trial_in_flight = False
+
+
+class ModelScheduler:
+    """Rate limits, bounds, retries and circuit-breaks calls to a model"""
+
+    def __init__(
+        self,
+        requests_per_minute: float = GEMINI_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = GEMINI_TOKENS_PER_MINUTE,
+        max_concurrency: int = GEMINI_MAX_CONCURRENCY,
+        max_retries: int = GEMINI_MAX_RETRIES,
+        backoff_base: float = GEMINI_BACKOFF_BASE,
+        backoff_max: float = GEMINI_BACKOFF_MAX,
+        breaker_threshold: int = GEMINI_BREAKER_THRESHOLD,
+        breaker_reset_seconds: float = GEMINI_BREAKER_RESET_SECONDS,
+        clock=None,
+        rng: Optional[random.Random] = None,
+    ):
+        self.clock = clock or SystemClock()
+        self.rng = rng or random.Random()
+        self.request_bucket = TokenBucket(requests_per_minute, self.clock)
+        self.token_bucket = TokenBucket(tokens_per_minute, self.clock)
+        self.max_concurrency = max_concurrency
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_reset_seconds, self.clock)
+
+        self.in_flight = 0
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.rejected = 0
+        self.throttled_seconds = 0.0
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full jitter: uniform between 0 and the capped exponential delay"""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return self.rng.uniform(0, ceiling)
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[T]],
+        estimated_tokens: int = 0,
+        rate_limited: bool = True,
+    ) -> T:
+        """
+        Run a model call under the scheduler's limits
+
+        Args:
+            call: Creates a fresh awaitable for every attempt
+            estimated_tokens: Tokens charged against the tokens-per-minute budget
+            rate_limited: False for calls outside the generation quota (file uploads)
+
+        Returns:
+            Result of the call
+
+        Raises:
+            ModelUnavailableError: Retries used up on a retryable error, or the circuit is open
+        """
+        attempt = 0
+        while True:
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError:
+                self.rejected += 1
+                raise
+
+            if rate_limited:
+                self.throttled_seconds += await self.request_bucket.acquire(1)
+                if estimated_tokens:
+                    self.throttled_seconds += await self.token_bucket.acquire(estimated_tokens)
+
+            try:
+                async with self.semaphore:
+                    self.in_flight += 1
+                    self.calls += 1
+                    try:
+                        result = await call()
+                    finally:
+                        self.in_flight -= 1
+            except Exception as e:
+                if not is_retryable(e):
+                    self.breaker.release()
+                    self.failures += 1
+                    raise
+                self.breaker.record_failure()
+                if attempt >= self.max_retries:
+                    self.failures += 1
+                    raise ModelUnavailableError(
+                        f"Model unavailable after {attempt + 1} attempts: {e}",
+                        retry_after=max(self.breaker.remaining(), self.backoff_max),
+                    ) from e
+                self.retries += 1
+                await self.clock.sleep(self.backoff_delay(attempt))
+                attempt += 1
+                continue
+
+            self.breaker.record_success()
+            return result
+
+    def stats(self) -> Dict:
+        """Counters for the health endpoint"""
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+            "circuit": self.breaker.state,
+        }
+
+
+# Singleton instance
+_model_scheduler = None
+
+def get_model_scheduler() -> ModelScheduler:
+    """Get or create the ModelScheduler shared by all model calls"""
+    global _model_scheduler
+    if _model_scheduler is None:
+        _model_scheduler = ModelScheduler()
+    return _model_scheduler
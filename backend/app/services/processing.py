@@ -0,0 +1,240 @@
+"""
+Meeting Processing Pipeline
+Runs the AI steps for one meeting: transcription, summary, action items
+"""
+
+import asyncio
+import json
+import logging
+from typing import Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.meeting import Meeting
+from app.models.action_item import ActionItem
+from app.services.gemini_service import get_async_gemini_service, SUMMARY_PROMPT_VERSION, TRANSCRIBE_PROMPT_VERSION
+from app.services.result_cache import get_result_cache, hash_file, hash_text
+from app.services.chunked_transcription import get_transcriber
+from app.services.summarizer import get_summarizer
+from app.services.events import get_event_bus, meeting_channel
+from app.services.search import get_search_index
+from app.services.response_cache import get_response_cache, meeting_tags, task_tags
+from app.metrics import track_stage
+from app.services.action_items import (
+    bulk_create_action_items, action_item_rows_from_summary, reconcile_action_items,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def set_meeting_status(db: Session, meeting: Meeting, status: str) -> None:
+    """Persist a status transition so clients can follow progress"""
+    meeting.status = status
+    db.commit()
+    get_response_cache().invalidate(*meeting_tags(meeting.id))
+
+
+def publish_status(meeting_id: int, status: str, **extra) -> None:
+    """Tell event subscribers about a status transition"""
+    event = {"type": "status", "meeting_id": meeting_id, "status": status, **extra}
+    get_event_bus().publish(meeting_channel(meeting_id), event)
+
+
+def publish_transcript_segment(meeting_id: int, index: int, text: str, start=None, end=None) -> None:
+    """Tell event subscribers about a newly transcribed piece of the recording"""
+    event = {
+        "type": "transcript_segment",
+        "meeting_id": meeting_id,
+        "index": index,
+        "start": start,
+        "end": end,
+        "text": text,
+    }
+    get_event_bus().publish(meeting_channel(meeting_id), event)
+
+
+def save_transcription(db: Session, meeting: Meeting, transcription: str, status: str) -> None:
+    """Persist the transcription together with the next status"""
+    meeting.transcription = transcription
+    set_meeting_status(db, meeting, status)
+
+
+def load_meeting(db: Session, meeting_id: int) -> Meeting:
+    """Load a meeting that is ready to be processed"""
+    meeting = db.get(Meeting, meeting_id)
+    if meeting is None:
+        raise ValueError(f"Meeting {meeting_id} not found")
+    if not meeting.audio_path:
+        raise ValueError(f"Meeting {meeting_id} has no audio file")
+    return meeting
+
+
+def save_results(db: Session, meeting: Meeting, transcription: str, summary: Dict) -> None:
+    """
+    Store transcription, summary and action items and mark the meeting completed
+
+    Everything is written in one transaction: the meeting update, one bulk
+    insert for all action items and the search index entries.
+    """
+    if meeting.transcription != transcription:
+        meeting.transcription = transcription
+    meeting.summary = summary
+    meeting.status = "completed"
+    db.flush()
+
+    bulk_create_action_items(db, action_item_rows_from_summary(meeting.id, summary))
+    get_search_index(db).index_meeting(db, meeting)
+
+    db.commit()
+    get_response_cache().invalidate(*meeting_tags(meeting.id), *task_tags(meeting_ids=[meeting.id]))
+    db.refresh(meeting)
+
+
+def is_usable_summary(summary) -> bool:
+    """Whether a stored summary is a real one rather than a recorded error"""
+    return isinstance(summary, dict) and bool(summary) and "error" not in summary
+
+
+def load_transcribed_meeting(db: Session, meeting_id: int) -> Meeting:
+    """Load a meeting that can be re-summarized"""
+    meeting = db.get(Meeting, meeting_id)
+    if meeting is None:
+        raise ValueError(f"Meeting {meeting_id} not found")
+    if not meeting.transcription:
+        raise ValueError(f"Meeting {meeting_id} has no transcription")
+    return meeting
+
+
+def save_resummary(db: Session, meeting: Meeting, summary: Dict) -> Dict:
+    """
+    Store a new summary and reconcile the meeting's action items
+
+    One transaction, like save_results. Returns the reconcile counts.
+    """
+    meeting.summary = summary
+    meeting.status = "completed"
+    db.flush()
+
+    # Items the reconcile keeps, updates or removes; cached copies of them go stale
+    previous_ids = db.scalars(select(ActionItem.id).where(ActionItem.meeting_id == meeting.id)).all()
+    counts = reconcile_action_items(db, meeting.id, action_item_rows_from_summary(meeting.id, summary))
+    get_search_index(db).index_meeting(db, meeting)
+
+    db.commit()
+    get_response_cache().invalidate(*meeting_tags(meeting.id), *task_tags(previous_ids, [meeting.id]))
+    db.refresh(meeting)
+    return counts
+
+
+async def transcribe_cached(gemini, audio_path: str, content_hash: Optional[str] = None, on_segment=None) -> str:
+    """Transcribe audio, reusing the result for a recording seen before"""
+    cache = get_result_cache()
+    if content_hash is None:
+        content_hash = await asyncio.to_thread(hash_file, audio_path)
+    key = cache.make_key("transcription", content_hash, gemini.model_name, TRANSCRIBE_PROMPT_VERSION)
+
+    transcription = await asyncio.to_thread(cache.get, key)
+    if transcription is None:
+        with track_stage("transcribe", gemini.model_name):
+            transcription = await get_transcriber(gemini, on_segment=on_segment).transcribe_audio(audio_path)
+        await asyncio.to_thread(cache.set, key, transcription)
+    else:
+        logger.info("Transcription served from cache", extra={"content_hash": content_hash})
+    return transcription
+
+
+async def summarize_cached(gemini, transcription: str, refresh: bool = False) -> Dict:
+    """
+    Summarize a transcription, reusing the result for identical text
+
+    Keyed by the transcription itself: a repeat upload hits the
+    transcription cache and then lands on the same summary entry.
+    With refresh=True the model is always called and the entry replaced.
+    """
+    cache = get_result_cache()
+    key = cache.make_key("summary", hash_text(transcription), gemini.model_name, SUMMARY_PROMPT_VERSION)
+
+    if not refresh:
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            logger.info("Summary served from cache")
+            return json.loads(cached)
+
+    with track_stage("summarize", gemini.model_name):
+        summary = await get_summarizer(gemini).generate_summary(transcription)
+    await asyncio.to_thread(cache.set, key, json.dumps(summary))
+    return summary
+
+
+async def process_meeting(db: Session, meeting_id: int) -> Meeting:
+    """
+    Process a stored meeting recording
+
+    Moves the meeting through transcribing -> summarizing -> completed.
+    Model calls are awaited on the event loop; the short blocking database
+    steps run in a worker thread. Errors are raised to the caller, which
+    decides how to record the failure.
+
+    Args:
+        db: Database session owned by the caller
+        meeting_id: ID of the meeting to process
+
+    Returns:
+        The processed meeting
+    """
+    meeting = await asyncio.to_thread(load_meeting, db, meeting_id)
+    audio_path = meeting.audio_path
+    content_hash = meeting.content_hash  # computed during upload
+    gemini = get_async_gemini_service()
+
+    # Long recordings stream their segments to subscribers as they finish
+    streamed_segments = []
+
+    async def on_segment(segment, text: str) -> None:
+        streamed_segments.append(segment.index)
+        publish_transcript_segment(meeting_id, segment.index, text, segment.start, segment.end)
+
+    # Transcribe audio
+    await asyncio.to_thread(set_meeting_status, db, meeting, "transcribing")
+    publish_status(meeting_id, "transcribing")
+    transcription = await transcribe_cached(gemini, audio_path, content_hash, on_segment)
+    if not streamed_segments:
+        publish_transcript_segment(meeting_id, 0, transcription)
+
+    # Generate summary
+    await asyncio.to_thread(save_transcription, db, meeting, transcription, "summarizing")
+    publish_status(meeting_id, "summarizing")
+    summary = await summarize_cached(gemini, transcription)
+
+    await asyncio.to_thread(save_results, db, meeting, transcription, summary)
+    publish_status(meeting_id, "completed")
+    return meeting
+
+
+async def resummarize_meeting(db: Session, meeting_id: int) -> Meeting:
+    """
+    Summarize a meeting again from its stored transcription
+
+    Skips transcription entirely. The model is always called (a changed
+    prompt or a failed run is the reason to get here), and the action
+    items are reconciled so user edits survive.
+
+    Args:
+        db: Database session owned by the caller
+        meeting_id: ID of the meeting to re-summarize
+
+    Returns:
+        The re-summarized meeting
+    """
+    meeting = await asyncio.to_thread(load_transcribed_meeting, db, meeting_id)
+    transcription = meeting.transcription
+    gemini = get_async_gemini_service()
+
+    await asyncio.to_thread(set_meeting_status, db, meeting, "summarizing")
+    publish_status(meeting_id, "summarizing")
+    summary = await summarize_cached(gemini, transcription, refresh=True)
+
+    counts = await asyncio.to_thread(save_resummary, db, meeting, summary)
+    publish_status(meeting_id, "completed", action_items=counts)
+    return meeting
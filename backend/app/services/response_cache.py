@@ -0,0 +1,318 @@
+"""
+Response Cache Service
+Caches the serialized JSON of read endpoints so repeated reads skip the
+database and Pydantic entirely, and answers conditional GETs with 304.
+
+- entries are keyed by route, query parameters and the versions of the
+  tags the response depends on ("meetings", "meeting:3", "task:17", ...)
+- a write bumps the versions of the tags it touches, so only responses
+  built from changed data stop matching; untouched entries keep serving
+- entries also expire after a TTL, as a bound on staleness for writes
+  made outside this API
+
+The default backend is an in-process LRU. RESPONSE_CACHE_BACKEND=sqlite
+keeps entries and tag versions in a SQLite file instead, shared by all
+API processes on the host.
+"""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import Request, Response
+
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "./uploads")
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")  # memory or sqlite
+RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH", os.path.join(UPLOAD_DIR, "response_cache.db"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", 60))  # seconds
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", 67108864))  # 64MB
+
+# (etag, body, expires_at)
+Entry = Tuple[str, bytes, float]
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """Weak comparison of an ETag against an If-None-Match header"""
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def meeting_tags(meeting_id: int) -> List[str]:
+    """Tags of a meeting's own fields (list and detail views)"""
+    return ["meetings", f"meeting:{meeting_id}"]
+
+
+def task_tags(task_ids: Iterable[int] = (), meeting_ids: Iterable[int] = ()) -> List[str]:
+    """Tags of action items, and of the per-meeting action item lists they appear in"""
+    return ["tasks"] + [f"task:{i}" for i in task_ids] + [f"meeting:{m}:actions" for m in meeting_ids]
+
+
+class MemoryBackend:
+    """
+    In-process LRU bounded by total body size
+
+    Tag versions are dropped once a tag has not been bumped for twice the
+    TTL: every entry built under an older version has expired by then, so
+    the tag can go back to version 0. Versions come from one counter and are
+    never reused, so an entry built under a dropped tag's version 0 stops
+    matching at the tag's next bump.
+    """
+
+    shared = False
+
+    def __init__(self, max_bytes: int, ttl: float = RESPONSE_CACHE_TTL):
+        self.max_bytes = max_bytes
+        self.version_ttl = 2 * ttl
+        self._entries: "OrderedDict[str, Entry]" = OrderedDict()
+        # tag -> (version, bumped at), least recently bumped first
+        self._versions: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._last_version = 0
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.evictions = 0
+
+    def versions(self, tags: List[str]) -> List[int]:
+        with self._lock:
+            return [self._versions[tag][0] if tag in self._versions else 0 for tag in tags]
+
+    def bump(self, tags: List[str]) -> None:
+        now = time.time()
+        with self._lock:
+            for tag in tags:
+                self._last_version += 1
+                self._versions[tag] = (self._last_version, now)
+                self._versions.move_to_end(tag)
+            while self._versions:
+                tag, (_, bumped_at) = next(iter(self._versions.items()))
+                if bumped_at > now - self.version_ttl:
+                    break
+                del self._versions[tag]
+
+    def get(self, key: str) -> Optional[Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[2] < time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: Entry) -> None:
+        size = len(entry[1])
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self.total_bytes -= len(entry[1])
+
+    def size(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries), "bytes": self.total_bytes, "evictions": self.evictions,
+                "tags": len(self._versions),
+            }
+
+
+class SQLiteBackend:
+    """Entries and tag versions in a SQLite file shared by processes on one host"""
+
+    shared = True
+
+    def __init__(self, path: str, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, etag TEXT NOT NULL, body BLOB NOT NULL, "
+            "size INTEGER NOT NULL, expires_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_responses_last_used ON responses (last_used)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS tag_versions (tag TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+        self._conn.commit()
+
+    def versions(self, tags: List[str]) -> List[int]:
+        with self._lock:
+            rows = dict(self._conn.execute(
+                f"SELECT tag, version FROM tag_versions WHERE tag IN ({','.join('?' * len(tags))})", tags
+            ).fetchall())
+        return [rows.get(tag, 0) for tag in tags]
+
+    def bump(self, tags: List[str]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO tag_versions (tag, version) VALUES (?, 1) "
+                "ON CONFLICT (tag) DO UPDATE SET version = version + 1",
+                [(tag,) for tag in tags],
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Entry]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, body, expires_at FROM responses WHERE key = ? AND expires_at >= ?", (key, now)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+        return (row[0], bytes(row[1]), row[2]) if row else None
+
+    def set(self, key: str, entry: Entry) -> None:
+        etag, body, expires_at = entry
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, etag, body, size, expires_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, etag, body, len(body), expires_at, now),
+            )
+            self._conn.execute("DELETE FROM responses WHERE expires_at < ?", (now,))
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            while total > self.max_bytes:
+                row = self._conn.execute(
+                    "SELECT key, size FROM responses ORDER BY last_used LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    break
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+                total -= row[1]
+                self.evictions += 1
+            self._conn.commit()
+
+    def size(self) -> Dict:
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {"entries": entries, "bytes": total, "evictions": self.evictions}
+
+
+class ResponseCache:
+    """Tag-invalidated cache of serialized responses with conditional GET support"""
+
+    def __init__(self, backend=None, ttl: float = RESPONSE_CACHE_TTL, enabled: bool = RESPONSE_CACHE_ENABLED):
+        self.backend = backend or MemoryBackend(RESPONSE_CACHE_MAX_BYTES, ttl)
+        self.ttl = ttl
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def invalidate(self, *tags: str) -> None:
+        """Make every cached response that depends on one of the tags stale"""
+        if not tags:
+            return
+        self.backend.bump(list(dict.fromkeys(tags)))
+        self._count("invalidations")
+
+    def _key(self, request: Request, tags: List[str]) -> str:
+        query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        versions = self.backend.versions(tags)
+        return f"{request.url.path}?{query}|" + ",".join(f"{tag}={v}" for tag, v in zip(tags, versions))
+
+    async def _call(self, fn, *args):
+        # The shared backend does file I/O; keep it off the event loop
+        if self.backend.shared:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    async def respond(
+        self,
+        request: Request,
+        tags: List[str],
+        build: Callable[[], Awaitable[bytes]],
+    ) -> Response:
+        """
+        Serve a JSON response from the cache, building it on a miss
+
+        Args:
+            request: The incoming request (path, query and If-None-Match)
+            tags: What the response depends on; invalidating one of them drops it
+            build: Produces the serialized JSON body; may raise HTTPException
+
+        Returns:
+            200 with the body and its ETag, or 304 when If-None-Match matches
+        """
+        if_none_match = request.headers.get("if-none-match")
+        entry = None
+        key = None
+        if self.enabled:
+            key = await self._call(self._key, request, tags)
+            entry = await self._call(self.backend.get, key)
+        self._count("hits" if entry else "misses")
+
+        if entry is None:
+            body = await build()
+            entry = (make_etag(body), body, time.time() + self.ttl)
+            if self.enabled:
+                await self._call(self.backend.set, key, entry)
+
+        etag, body, _ = entry
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(etag, if_none_match):
+            self._count("not_modified")
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def stats(self) -> Dict:
+        """Counters for the health endpoint"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            counters = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "not_modified": self.not_modified,
+                "invalidations": self.invalidations,
+            }
+        return {"backend": RESPONSE_CACHE_BACKEND if self.enabled else "disabled", **counters, **self.backend.size()}
+
+
+# Singleton instance
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache() -> ResponseCache:
+    """Get or create the ResponseCache shared by all read endpoints"""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            if RESPONSE_CACHE_BACKEND == "sqlite":
+                backend = SQLiteBackend(RESPONSE_CACHE_PATH, RESPONSE_CACHE_MAX_BYTES)
+            else:
+                backend = MemoryBackend(RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_TTL)
+            _response_cache = ResponseCache(backend)
+    return _response_cache
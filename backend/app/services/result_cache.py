@@ -0,0 +1,143 @@
+"""
+Result Cache Service
+Content-addressed cache for transcriptions and summaries, so a recording
+that was already processed never goes to the model again.
+
+Entries live in a small SQLite file under UPLOAD_DIR and are evicted
+least-recently-used first once the cache grows past its size limit.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "./uploads")
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH", os.path.join(UPLOAD_DIR, "result_cache.db"))
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", 268435456))  # 256MB
+
+HASH_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+def hash_file(path: str) -> str:
+    """SHA-256 of a file, read in chunks so large recordings never sit in memory"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_text(text: str) -> str:
+    """SHA-256 of a piece of text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Size-bounded LRU cache of model results stored in SQLite"""
+
+    def __init__(self, path: str = RESULT_CACHE_PATH, max_bytes: int = RESULT_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_cache_entries_last_used ON cache_entries (last_used)"
+        )
+        self._conn.commit()
+        row = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries").fetchone()
+        self.entries, self.total_bytes = row
+
+    @staticmethod
+    def make_key(kind: str, content_hash: str, model_name: str, prompt_version: str) -> str:
+        """Build a cache key; any change of model or prompt gives a new key"""
+        return f"{kind}:{model_name}:{prompt_version}:{content_hash}"
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a cached value and mark it as recently used"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE cache_entries SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        """Store a value, evicting least-recently-used entries if needed"""
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            if old is not None:
+                self.entries -= 1
+                self.total_bytes -= old[0]
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, value, size, time.time()),
+            )
+            self.entries += 1
+            self.total_bytes += size
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop the oldest entries until the cache fits in max_bytes"""
+        while self.total_bytes > self.max_bytes:
+            row = self._conn.execute(
+                "SELECT key, size FROM cache_entries ORDER BY last_used LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (row[0],))
+            self.entries -= 1
+            self.total_bytes -= row[1]
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and size, for the health endpoint"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": self.entries,
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+# Singleton instance
+_result_cache = None
+
+def get_result_cache() -> ResultCache:
+    """Get or create ResultCache instance"""
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = ResultCache()
+    return _result_cache
@@ -0,0 +1,237 @@
+"""
+Search Service
+Full-text search over meetings (title, transcription, summary key points)
+and action items (description).
+
+The inverted index is SQLite FTS5 on SQLite and a tsvector column with a
+GIN index on Postgres. Rows are (re)indexed inside the caller's
+transaction whenever a meeting finishes processing or a task changes.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models.meeting import Meeting
+from app.models.action_item import ActionItem
+
+SNIPPET_WORDS = 12
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+
+
+def meeting_body(meeting: Meeting) -> str:
+    """Searchable text of a meeting besides its title"""
+    parts = [meeting.transcription or ""]
+    if isinstance(meeting.summary, dict):
+        parts.extend(str(point) for point in meeting.summary.get("key_points", []) or [])
+    return "\n".join(part for part in parts if part)
+
+
+class SearchIndex:
+    """Interface shared by the database-specific indexes"""
+
+    def index_meeting(self, db: Session, meeting: Meeting) -> None:
+        raise NotImplementedError
+
+    def index_action_item(self, db: Session, item: ActionItem) -> None:
+        self.index_action_items(db, [item])
+
+    def index_action_items(self, db: Session, items: List[ActionItem]) -> None:
+        raise NotImplementedError
+
+    def remove_meeting(self, db: Session, meeting_id: int, action_item_ids: Iterable[int] = ()) -> None:
+        raise NotImplementedError
+
+    def remove_action_item(self, db: Session, item_id: int) -> None:
+        raise NotImplementedError
+
+    def search(self, db: Session, query: str, limit: int = 20, kind: Optional[str] = None) -> List[Dict]:
+        raise NotImplementedError
+
+
+class SQLiteSearchIndex(SearchIndex):
+    """
+    FTS5 index in the search_index virtual table
+
+    Row ids are derived from the source row (meetings: 2*id, action items:
+    2*id+1) so updates and deletes are direct rowid lookups.
+    """
+
+    @staticmethod
+    def _rowid(kind: str, ref_id: int) -> int:
+        return ref_id * 2 + (1 if kind == "action_item" else 0)
+
+    def _upsert(self, db: Session, rows: List[Dict]) -> None:
+        """Replace index rows; rows need kind, ref_id, meeting_id, title, body"""
+        if not rows:
+            return
+        params = [
+            {**row, "rowid": self._rowid(row["kind"], row["ref_id"]),
+             "title": row["title"] or "", "body": row["body"] or ""}
+            for row in rows
+        ]
+        db.execute(text("DELETE FROM search_index WHERE rowid = :rowid"), params)
+        db.execute(
+            text(
+                "INSERT INTO search_index (rowid, kind, ref_id, meeting_id, title, body) "
+                "VALUES (:rowid, :kind, :ref_id, :meeting_id, :title, :body)"
+            ),
+            params,
+        )
+
+    def index_meeting(self, db: Session, meeting: Meeting) -> None:
+        self._upsert(db, [{"kind": "meeting", "ref_id": meeting.id, "meeting_id": meeting.id,
+                           "title": meeting.title, "body": meeting_body(meeting)}])
+
+    def index_action_items(self, db: Session, items: List[ActionItem]) -> None:
+        self._upsert(db, [{"kind": "action_item", "ref_id": item.id, "meeting_id": item.meeting_id,
+                           "title": "", "body": item.description} for item in items])
+
+    def remove_meeting(self, db: Session, meeting_id: int, action_item_ids: Iterable[int] = ()) -> None:
+        rowids = [self._rowid("meeting", meeting_id)] + [self._rowid("action_item", i) for i in action_item_ids]
+        for rowid in rowids:
+            db.execute(text("DELETE FROM search_index WHERE rowid = :rowid"), {"rowid": rowid})
+
+    def remove_action_item(self, db: Session, item_id: int) -> None:
+        db.execute(
+            text("DELETE FROM search_index WHERE rowid = :rowid"),
+            {"rowid": self._rowid("action_item", item_id)},
+        )
+
+    @staticmethod
+    def _match_expression(query: str) -> str:
+        """
+        Turn free text into an FTS5 query where all words must match
+
+        Words are quoted so user input cannot inject FTS5 syntax. There is
+        no prefix matching: a short prefix can expand to thousands of terms,
+        and the porter tokenizer already matches word variants.
+        """
+        words = [w.replace('"', '""') for w in query.split()]
+        return " ".join(f'"{w}"' for w in words)
+
+    def search(self, db: Session, query: str, limit: int = 20, kind: Optional[str] = None) -> List[Dict]:
+        match = self._match_expression(query)
+        if not match:
+            return []
+
+        # Ordering by FTS5's built-in rank column lets SQLite return the best
+        # rows first and stop at LIMIT, so snippets are only built for those
+        sql = (
+            "SELECT kind, ref_id, meeting_id, title, "
+            f"snippet(search_index, -1, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', '…', {SNIPPET_WORDS}) AS snippet, "
+            "rank "
+            "FROM search_index WHERE search_index MATCH :match "
+            # Column weights: kind, ref_id, meeting_id, title, body
+            "AND rank MATCH 'bm25(0.0, 0.0, 0.0, 10.0, 1.0)' "
+        )
+        params = {"match": match, "limit": limit}
+        if kind:
+            sql += "AND kind = :kind "
+            params["kind"] = kind
+        sql += "ORDER BY rank LIMIT :limit"
+
+        rows = db.execute(text(sql), params).mappings().all()
+        # bm25 is lower-is-better; report higher-is-better scores
+        return [
+            {"kind": r["kind"], "id": r["ref_id"], "meeting_id": r["meeting_id"],
+             "title": r["title"], "snippet": r["snippet"], "score": round(-r["rank"], 6)}
+            for r in rows
+        ]
+
+
+class PostgresSearchIndex(SearchIndex):
+    """tsvector index in the search_documents table"""
+
+    def _upsert(self, db: Session, rows: List[Dict]) -> None:
+        """Insert or replace documents; rows need kind, ref_id, meeting_id, title, body"""
+        if not rows:
+            return
+        db.execute(
+            text(
+                "INSERT INTO search_documents (kind, ref_id, meeting_id, title, body, document) "
+                "VALUES (:kind, :ref_id, :meeting_id, :title, :body, "
+                "setweight(to_tsvector('english', :title), 'A') || setweight(to_tsvector('english', :body), 'B')) "
+                "ON CONFLICT (kind, ref_id) DO UPDATE SET "
+                "meeting_id = EXCLUDED.meeting_id, title = EXCLUDED.title, "
+                "body = EXCLUDED.body, document = EXCLUDED.document"
+            ),
+            [{**row, "title": row["title"] or "", "body": row["body"] or ""} for row in rows],
+        )
+
+    def index_meeting(self, db: Session, meeting: Meeting) -> None:
+        self._upsert(db, [{"kind": "meeting", "ref_id": meeting.id, "meeting_id": meeting.id,
+                           "title": meeting.title, "body": meeting_body(meeting)}])
+
+    def index_action_items(self, db: Session, items: List[ActionItem]) -> None:
+        self._upsert(db, [{"kind": "action_item", "ref_id": item.id, "meeting_id": item.meeting_id,
+                           "title": "", "body": item.description} for item in items])
+
+    def remove_meeting(self, db: Session, meeting_id: int, action_item_ids: Iterable[int] = ()) -> None:
+        db.execute(
+            text("DELETE FROM search_documents WHERE meeting_id = :meeting_id"),
+            {"meeting_id": meeting_id},
+        )
+
+    def remove_action_item(self, db: Session, item_id: int) -> None:
+        db.execute(
+            text("DELETE FROM search_documents WHERE kind = 'action_item' AND ref_id = :ref_id"),
+            {"ref_id": item_id},
+        )
+
+    def search(self, db: Session, query: str, limit: int = 20, kind: Optional[str] = None) -> List[Dict]:
+        if not query.strip():
+            return []
+
+        sql = (
+            "SELECT kind, ref_id, meeting_id, title, "
+            "ts_headline('english', body, q, "
+            f"'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, MaxWords={SNIPPET_WORDS}, MinWords=5') AS snippet, "
+            "ts_rank(document, q) AS rank "
+            "FROM search_documents, websearch_to_tsquery('english', :query) AS q "
+            "WHERE document @@ q "
+        )
+        params = {"query": query, "limit": limit}
+        if kind:
+            sql += "AND kind = :kind "
+            params["kind"] = kind
+        sql += "ORDER BY rank DESC LIMIT :limit"
+
+        rows = db.execute(text(sql), params).mappings().all()
+        return [
+            {"kind": r["kind"], "id": r["ref_id"], "meeting_id": r["meeting_id"],
+             "title": r["title"], "snippet": r["snippet"], "score": round(float(r["rank"]), 6)}
+            for r in rows
+        ]
+
+
+class NullSearchIndex(SearchIndex):
+    """Used on databases without full-text support; indexing is a no-op"""
+
+    def index_meeting(self, db, meeting):
+        pass
+
+    def index_action_items(self, db, items):
+        pass
+
+    def remove_meeting(self, db, meeting_id, action_item_ids=()):
+        pass
+
+    def remove_action_item(self, db, item_id):
+        pass
+
+    def search(self, db, query, limit=20, kind=None):
+        raise NotImplementedError("Full-text search needs SQLite or Postgres")
+
+
+_indexes = {
+    "sqlite": SQLiteSearchIndex(),
+    "postgresql": PostgresSearchIndex(),
+}
+_null_index = NullSearchIndex()
+
+def get_search_index(db: Session) -> SearchIndex:
+    """Search index for the database this session is bound to"""
+    return _indexes.get(db.get_bind().dialect.name, _null_index)
@@ -0,0 +1,303 @@
+"""
+Structured Model Output
+Summaries and action item lists are requested in JSON mode with a response
+schema, then parsed straight into typed Pydantic objects:
+
+- the common case is one validate_json pass on the raw reply
+- a reply cut off mid-way (token limit) is recovered with a partial JSON
+  parse: complete items are kept, the unfinished tail is dropped
+- replies that cannot be recovered raise SummaryParseError instead of
+  being stored as an empty summary
+
+Parse outcomes are counted so the failure rate shows up on /health.
+"""
+
+import re
+import threading
+from typing import Dict, List, Optional
+
+import pydantic_core
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, field_validator
+
+PRIORITIES = ("high", "medium", "low")
+
+# Code fences some models still wrap around JSON replies
+FENCE_PATTERN = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
+
+
+class SummaryParseError(ValueError):
+    """Raised when a model reply holds no usable summary"""
+
+
+class SummaryActionItem(BaseModel):
+    task: str = Field(min_length=1)
+    assignee: str = "Unassigned"
+    priority: str = "medium"
+
+    @field_validator("assignee", mode="before")
+    @classmethod
+    def _default_assignee(cls, value):
+        return value if isinstance(value, str) and value.strip() else "Unassigned"
+
+    @field_validator("priority", mode="before")
+    @classmethod
+    def _normalize_priority(cls, value):
+        value = str(value or "").strip().lower()
+        return value if value in PRIORITIES else "medium"
+
+
+class ExtractedActionItem(SummaryActionItem):
+    deadline: Optional[str] = None
+
+
+class BatchActionItems(BaseModel):
+    """Action items of one input in a batched extraction reply"""
+    id: str
+    action_items: List[ExtractedActionItem] = []
+
+
+class MeetingSummary(BaseModel):
+    # All required, like SUMMARY_RESPONSE_SCHEMA: a reply missing one is not
+    # a clean parse (truncated replies go through _salvage instead)
+    title: str
+    key_points: List[str]
+    decisions: List[str]
+    action_items: List[SummaryActionItem]
+
+
+# Filled in for the parts a truncated reply never got to
+SUMMARY_DEFAULTS = {"title": "Meeting Summary", "key_points": [], "decisions": [], "action_items": []}
+
+
+# Built once; validation runs in pydantic-core without Python-level parsing
+SUMMARY_ADAPTER = TypeAdapter(MeetingSummary)
+
+ACTION_ITEMS_ADAPTER = TypeAdapter(List[ExtractedActionItem])
+BATCH_ACTION_ITEMS_ADAPTER = TypeAdapter(List[BatchActionItems])
+
+# Response schemas for Gemini JSON mode (OpenAPI subset, mirror the models above)
+SUMMARY_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "key_points": {"type": "array", "items": {"type": "string"}},
+        "decisions": {"type": "array", "items": {"type": "string"}},
+        "action_items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "task": {"type": "string"},
+                    "assignee": {"type": "string"},
+                    "priority": {"type": "string", "enum": list(PRIORITIES)},
+                },
+                "required": ["task", "assignee", "priority"],
+            },
+        },
+    },
+    "required": ["title", "key_points", "decisions", "action_items"],
+}
+
+ACTION_ITEMS_RESPONSE_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "task": {"type": "string"},
+            "assignee": {"type": "string"},
+            "deadline": {"type": "string", "nullable": True},
+            "priority": {"type": "string", "enum": list(PRIORITIES)},
+        },
+        "required": ["task", "assignee", "priority"],
+    },
+}
+
+BATCH_ACTION_ITEMS_RESPONSE_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "id": {"type": "string"},
+            "action_items": ACTION_ITEMS_RESPONSE_SCHEMA,
+        },
+        "required": ["id", "action_items"],
+    },
+}
+
+
+class ParseMetrics:
+    """Counts how model replies were parsed"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.parsed = 0
+        self.recovered = 0
+        self.failed = 0
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.parsed + self.recovered + self.failed
+            return {
+                "parsed": self.parsed,
+                "recovered": self.recovered,
+                "failed": self.failed,
+                "failure_rate": round(self.failed / total, 4) if total else 0.0,
+            }
+
+
+_parse_metrics = ParseMetrics()
+
+def get_parse_metrics() -> ParseMetrics:
+    """The ParseMetrics shared by all summary parses"""
+    return _parse_metrics
+
+
+def strip_code_fences(text: str) -> str:
+    return FENCE_PATTERN.sub("", text.strip())
+
+
+def _complete_items(items) -> List[Dict]:
+    """Action items with a task; one cut off mid-way has none (or an empty one)"""
+    return [
+        item for item in items
+        if isinstance(item, dict) and isinstance(item.get("task"), str) and item["task"].strip()
+    ]
+
+
+def _salvage(data) -> Optional[Dict]:
+    """
+    Keep the parts of a partially parsed summary that are complete enough to use
+
+    Returns None when the reply has none of the summary's keys: that is a
+    reply in some other shape, not a cut-off summary.
+    """
+    if not isinstance(data, dict) or not set(data) & set(SUMMARY_DEFAULTS):
+        return None
+    summary = {}
+    if isinstance(data.get("title"), str) and data["title"].strip():
+        summary["title"] = data["title"]
+    for key in ("key_points", "decisions"):
+        values = data.get(key)
+        if isinstance(values, list):
+            summary[key] = [v for v in values if isinstance(v, str) and v.strip()]
+    items = data.get("action_items")
+    if isinstance(items, list):
+        summary["action_items"] = _complete_items(items)
+    return {**SUMMARY_DEFAULTS, **summary}
+
+
+def parse_summary(response_text: str) -> MeetingSummary:
+    """
+    Parse a model reply into a MeetingSummary
+
+    Args:
+        response_text: Raw reply, ideally JSON from JSON mode
+
+    Returns:
+        The validated summary
+
+    Raises:
+        SummaryParseError: Nothing usable could be recovered
+    """
+    metrics = get_parse_metrics()
+    text = strip_code_fences(response_text or "")
+
+    try:
+        summary = SUMMARY_ADAPTER.validate_json(text)
+        metrics.record("parsed")
+        return summary
+    except ValidationError:
+        pass
+
+    # Truncated or slightly off-shape reply: parse what is there and keep the complete parts
+    try:
+        data = pydantic_core.from_json(text, allow_partial=True)
+        salvaged = _salvage(data)
+        if salvaged is not None:
+            summary = SUMMARY_ADAPTER.validate_python(salvaged)
+            metrics.record("recovered")
+            return summary
+    except (ValueError, ValidationError):
+        pass
+
+    metrics.record("failed")
+    raise SummaryParseError(f"Model reply is not a valid summary: {text[:200]!r}")
+
+
+def _parse_partial_list(text: str):
+    """Parse a possibly truncated JSON array; None when it is not one"""
+    try:
+        data = pydantic_core.from_json(text, allow_partial=True)
+    except ValueError:
+        return None
+    return data if isinstance(data, list) else None
+
+
+def parse_action_items(response_text: str) -> List[ExtractedActionItem]:
+    """
+    Parse a model reply with a JSON array of action items
+
+    Raises:
+        SummaryParseError: The reply is not an action item list
+    """
+    metrics = get_parse_metrics()
+    text = strip_code_fences(response_text or "")
+
+    try:
+        items = ACTION_ITEMS_ADAPTER.validate_json(text)
+        metrics.record("parsed")
+        return items
+    except ValidationError:
+        pass
+
+    data = _parse_partial_list(text)
+    if data is not None:
+        try:
+            items = ACTION_ITEMS_ADAPTER.validate_python(_complete_items(data))
+            metrics.record("recovered")
+            return items
+        except ValidationError:
+            pass
+
+    metrics.record("failed")
+    raise SummaryParseError(f"Model reply is not an action item list: {text[:200]!r}")
+
+
+def parse_batch_action_items(response_text: str) -> Dict[str, List[ExtractedActionItem]]:
+    """
+    Parse a batched extraction reply into action items per input id
+
+    Inputs missing from the reply (or cut off before their list closed)
+    are absent from the result; the caller retries them one by one.
+    """
+    metrics = get_parse_metrics()
+    text = strip_code_fences(response_text or "")
+
+    try:
+        entries = BATCH_ACTION_ITEMS_ADAPTER.validate_json(text)
+        metrics.record("parsed")
+        return {entry.id: entry.action_items for entry in entries}
+    except ValidationError:
+        pass
+
+    # Partial parsing cannot tell a finished list from a cut-off one, so
+    # the entry still being written when the reply stopped is dropped
+    data = _parse_partial_list(text)
+    results = {}
+    if data is not None:
+        complete = data if text.rstrip().endswith("]") else data[:-1]
+        for entry in complete:
+            try:
+                parsed = BatchActionItems.model_validate(
+                    {**entry, "action_items": _complete_items(entry.get("action_items") or [])}
+                )
+            except (ValidationError, TypeError, AttributeError):
+                continue
+            results[parsed.id] = parsed.action_items
+
+    metrics.record("recovered" if results else "failed")
+    return results
@@ -0,0 +1,171 @@
+"""
+Hierarchical Summarizer
+Long transcripts are split into token-bounded chunks, each chunk is
+summarized in parallel (map), and the partial summaries are merged into
+the usual summary shape (reduce). Short transcripts keep the single-shot
+path.
+
+Any object with an async generate_summary(text) method can do the model
+calls (AsyncGeminiService, or a fake model in tests).
+"""
+
+import asyncio
+import os
+import re
+from typing import Dict, List, Protocol
+
+# Above this size the map-reduce path is used
+SUMMARY_MAP_REDUCE_THRESHOLD_TOKENS = int(os.getenv("SUMMARY_MAP_REDUCE_THRESHOLD_TOKENS", 30000))
+SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", 8000))
+SUMMARY_CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", 4))
+
+CHARS_PER_TOKEN = 4  # rough average for English text
+
+PRIORITY_RANK = {"low": 0, "medium": 1, "high": 2}
+
+
+class Summarizer(Protocol):
+    """Anything that can summarize a transcription into the summary shape"""
+
+    async def generate_summary(self, transcription: str) -> Dict:
+        ...
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate, good enough for choosing chunk boundaries"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _pieces(text: str, max_chars: int) -> List[str]:
+    """Break text into lines, then sentences, then hard cuts, all under max_chars"""
+    pieces = []
+    for line in text.splitlines():
+        if len(line) <= max_chars:
+            pieces.append(line)
+            continue
+        for sentence in re.split(r"(?<=[.!?])\s+", line):
+            while len(sentence) > max_chars:
+                pieces.append(sentence[:max_chars])
+                sentence = sentence[max_chars:]
+            pieces.append(sentence)
+    return pieces
+
+
+def split_transcript(text: str, max_tokens: int) -> List[str]:
+    """
+    Split a transcript into chunks of at most max_tokens
+
+    Chunks end on line or sentence boundaries whenever possible so a
+    speaker turn is not cut in half.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    chunks = []
+    current: List[str] = []
+    current_len = 0
+
+    for piece in _pieces(text, max_chars):
+        if current and current_len + len(piece) + 1 > max_chars:
+            chunks.append("\n".join(current))
+            current, current_len = [], 0
+        current.append(piece)
+        current_len += len(piece) + 1
+
+    if current:
+        chunks.append("\n".join(current))
+    return [chunk for chunk in chunks if chunk.strip()]
+
+
+def _normalize(text: str) -> str:
+    """Compare strings without case, punctuation or extra spaces"""
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+def _unique(items: List[str]) -> List[str]:
+    """Drop duplicates, keeping the first occurrence"""
+    seen = set()
+    result = []
+    for item in items:
+        key = _normalize(item)
+        if key and key not in seen:
+            seen.add(key)
+            result.append(item)
+    return result
+
+
+def merge_action_items(items: List[Dict]) -> List[Dict]:
+    """
+    Merge action items from several partial summaries
+
+    Items with the same task are combined: a named assignee wins over
+    "Unassigned", and the higher priority is kept.
+    """
+    merged: Dict[str, Dict] = {}
+    for item in items:
+        key = _normalize(item.get("task", ""))
+        if not key:
+            continue
+        if key not in merged:
+            merged[key] = dict(item)
+            continue
+
+        existing = merged[key]
+        if existing.get("assignee", "Unassigned") in (None, "", "Unassigned") and item.get("assignee"):
+            existing["assignee"] = item["assignee"]
+        if PRIORITY_RANK.get(item.get("priority"), 1) > PRIORITY_RANK.get(existing.get("priority"), 1):
+            existing["priority"] = item["priority"]
+    return list(merged.values())
+
+
+def merge_summaries(partials: List[Dict]) -> Dict:
+    """Reduce partial summaries into one summary with the same shape"""
+    title = next((p["title"] for p in partials if p.get("title")), "Meeting Summary")
+    return {
+        "title": title,
+        "key_points": _unique([point for p in partials for point in p.get("key_points", [])]),
+        "decisions": _unique([decision for p in partials for decision in p.get("decisions", [])]),
+        "action_items": merge_action_items([item for p in partials for item in p.get("action_items", [])]),
+    }
+
+
+class HierarchicalSummarizer:
+    """Chooses single-shot or map-reduce summarization by transcript size"""
+
+    def __init__(
+        self,
+        summarizer: Summarizer,
+        threshold_tokens: int = SUMMARY_MAP_REDUCE_THRESHOLD_TOKENS,
+        chunk_tokens: int = SUMMARY_CHUNK_TOKENS,
+        concurrency: int = SUMMARY_CONCURRENCY,
+    ):
+        self.summarizer = summarizer
+        self.threshold_tokens = threshold_tokens
+        self.chunk_tokens = chunk_tokens
+        self.concurrency = concurrency
+
+    async def generate_summary(self, transcription: str) -> Dict:
+        """
+        Generate a meeting summary from transcription
+
+        Args:
+            transcription: The full text transcription of the meeting
+
+        Returns:
+            Dictionary with title, key_points, decisions, and action_items
+        """
+        if estimate_tokens(transcription) <= self.threshold_tokens:
+            return await self.summarizer.generate_summary(transcription)
+
+        chunks = split_transcript(transcription, self.chunk_tokens)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def summarize_chunk(chunk: str) -> Dict:
+            async with semaphore:
+                return await self.summarizer.generate_summary(chunk)
+
+        partials = await asyncio.gather(*(summarize_chunk(chunk) for chunk in chunks))
+        return merge_summaries(list(partials))
+
+
+def get_summarizer(summarizer: Summarizer) -> Summarizer:
+    """Wrap a summarizer so long transcripts take the map-reduce path"""
+    return HierarchicalSummarizer(summarizer)
@@ -0,0 +1,116 @@
+"""
+Transcript Ranges
+Reads part of a stored transcript by character or segment (line) range.
+Only chunk metadata is loaded up front; just the chunks overlapping the
+range are fetched and decompressed.
+"""
+
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, defer
+
+from app.models.transcript import TranscriptChunk, decode_chunk
+
+DEFAULT_LIMITS = {"chars": 20000, "segments": 200}
+
+
+class TranscriptReader:
+    """Ranged access to one meeting's transcript chunks"""
+
+    def __init__(self, db: Session, meeting_id: int):
+        self.db = db
+        self.meeting_id = meeting_id
+        self.chunks: List[TranscriptChunk] = list(db.scalars(
+            select(TranscriptChunk)
+            .options(defer(TranscriptChunk.data))
+            .where(TranscriptChunk.meeting_id == meeting_id)
+            .order_by(TranscriptChunk.seq)
+        ))
+        self._texts: Dict[int, str] = {}
+
+    @property
+    def total_chars(self) -> int:
+        return sum(chunk.char_count for chunk in self.chunks)
+
+    @property
+    def total_segments(self) -> int:
+        return sum(chunk.segment_count for chunk in self.chunks)
+
+    def _load(self, chunks: List[TranscriptChunk]) -> None:
+        """Fetch the compressed data of chunks not read yet, in one query"""
+        missing = [chunk.seq for chunk in chunks if chunk.seq not in self._texts]
+        if not missing:
+            return
+        rows = self.db.execute(
+            select(TranscriptChunk.seq, TranscriptChunk.data).where(
+                TranscriptChunk.meeting_id == self.meeting_id,
+                TranscriptChunk.seq.in_(missing),
+            )
+        )
+        for seq, data in rows:
+            self._texts[seq] = decode_chunk(data)
+
+    def chars(self, start: int, end: int) -> str:
+        """Characters [start, end) of the transcript"""
+        overlapping = [
+            chunk for chunk in self.chunks
+            if chunk.char_start < end and chunk.char_start + chunk.char_count > start
+        ]
+        self._load(overlapping)
+        return "".join(
+            self._texts[chunk.seq][max(start - chunk.char_start, 0):end - chunk.char_start]
+            for chunk in overlapping
+        )
+
+    def segment_offset(self, index: int) -> int:
+        """Character offset where segment number index starts"""
+        for chunk in self.chunks:
+            if chunk.segment_start <= index < chunk.segment_start + chunk.segment_count:
+                self._load([chunk])
+                text = self._texts[chunk.seq]
+                starts = [i + 1 for i, char in enumerate(text) if char == "\n" and i + 1 < len(text)]
+                # The chunk itself starts a segment unless it continues a cut line
+                if len(starts) < chunk.segment_count:
+                    starts.insert(0, 0)
+                return chunk.char_start + starts[index - chunk.segment_start]
+        return self.total_chars
+
+    def read(self, unit: str, start: int, limit: Optional[int] = None) -> Dict:
+        """
+        Read a range of the transcript
+
+        Args:
+            unit: "chars" or "segments"
+            start: First character or segment
+            limit: Most characters or segments to return
+
+        Returns:
+            Page with the text, its range and the totals
+        """
+        limit = limit or DEFAULT_LIMITS[unit]
+        total = self.total_chars if unit == "chars" else self.total_segments
+        start = min(start, total)
+        end = min(start + limit, total)
+
+        if unit == "chars":
+            text = self.chars(start, end)
+        else:
+            text = self.chars(self.segment_offset(start), self.segment_offset(end))
+
+        return {
+            "meeting_id": self.meeting_id,
+            "unit": unit,
+            "start": start,
+            "end": end,
+            "total": total,
+            "total_chars": self.total_chars,
+            "total_segments": self.total_segments,
+            "next_start": end if end < total else None,
+            "text": text,
+        }
+
+
+def read_transcript(db: Session, meeting_id: int, unit: str, start: int, limit: Optional[int] = None) -> Dict:
+    """Read a range of a meeting's transcript (see TranscriptReader.read)"""
+    return TranscriptReader(db, meeting_id).read(unit, start, limit)
@@ -0,0 +1,9 @@
+"""
+Offline benchmarks - run from the backend directory, e.g.
+    python -m benchmarks.bench_meeting_list
+    python -m benchmarks.load_test --json --output results.json
+
+load_test drives the whole API with the model replaced by
+benchmarks.fakes.FakeGeminiService; no API key or network is needed.
+The tests in backend/tests reuse the same fakes and synthetic inputs.
+"""
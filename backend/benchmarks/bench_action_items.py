@@ -0,0 +1,122 @@
+"""
+Benchmark: persisting a processed meeting with many action items
+
+Compares the previous write path (one ORM object and one search index
+write per action item, plus a commit per status change) with
+save_results, which writes everything in one transaction with a bulk
+insert. Runs against a throwaway SQLite database.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_action_items
+    python -m benchmarks.bench_action_items --meetings 20 --items 500 --json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_summary(items: int) -> dict:
+    return {
+        "title": "Quarterly planning",
+        "key_points": [f"Key point {i}" for i in range(5)],
+        "decisions": [],
+        "action_items": [
+            {"task": f"Follow up with the vendor about contract item {i}", "assignee": "Unassigned", "priority": "medium"}
+            for i in range(items)
+        ],
+    }
+
+
+def save_per_row(db, meeting, transcription: str, summary: dict) -> None:
+    """The write path before bulk inserts: one add and one index write per item"""
+    from app.models import ActionItem
+    from app.services.search import get_search_index
+
+    meeting.transcription = transcription
+    db.commit()
+    meeting.summary = summary
+    db.commit()
+
+    action_items = []
+    for item_data in summary["action_items"]:
+        action_item = ActionItem(
+            meeting_id=meeting.id,
+            description=item_data.get("task", ""),
+            assignee=item_data.get("assignee", "Unassigned"),
+            priority=item_data.get("priority", "medium"),
+            status="pending",
+        )
+        db.add(action_item)
+        action_items.append(action_item)
+
+    meeting.status = "completed"
+    db.flush()
+    search_index = get_search_index(db)
+    search_index.index_meeting(db, meeting)
+    for action_item in action_items:
+        search_index.index_action_item(db, action_item)
+    db.commit()
+
+
+def run(session_factory, meeting_model, save, meetings: int, items: int) -> dict:
+    """Latency percentiles of one write path"""
+    transcription = "Speaker 1: Let's go through the open items. " * 200
+    summary = make_summary(items)
+    timings = []
+    for i in range(meetings):
+        with session_factory() as db:
+            meeting = meeting_model(title=f"Meeting {i}", audio_filename=f"m{i}.mp3", status="processing")
+            db.add(meeting)
+            db.commit()
+
+            start = time.perf_counter()
+            save(db, meeting, transcription, summary)
+            timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "p50_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(timings[max(int(len(timings) * 0.95) - 1, 0)], 2),
+        "mean_ms": round(statistics.mean(timings), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meetings", type=int, default=20)
+    parser.add_argument("--items", type=int, default=300, help="action items per meeting")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_items_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["UPLOAD_DIR"] = os.path.join(workdir, "uploads")
+
+    # Import after the environment points at the throwaway database
+    import app.main  # noqa: F401  creates the tables and search index
+    from app.database import SessionLocal
+    from app.models import Meeting
+    from app.services.processing import save_results
+
+    results = [
+        {"write_path": "per_row", **run(SessionLocal, Meeting, save_per_row, args.meetings, args.items)},
+        {"write_path": "bulk", **run(SessionLocal, Meeting, save_results, args.meetings, args.items)},
+    ]
+
+    if args.json:
+        print(json.dumps({"benchmark": "action_items", "params": vars(args), "results": results}, indent=2))
+        return
+
+    print(f"{args.meetings} meetings, {args.items} action items each\n")
+    print(f"{'write path':<12}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+    for r in results:
+        print(f"{r['write_path']:<12}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['mean_ms']:>10}")
+
+
+if __name__ == "__main__":
+    main()
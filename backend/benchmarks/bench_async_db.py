@@ -0,0 +1,164 @@
+"""
+Load test: async database sessions vs. the previous sync routes
+
+Seeds a throwaway SQLite database, then drives the same read endpoints
+with many concurrent clients, once through the app's async routes
+(AsyncSession) and once through sync `def` versions of them that use
+SessionLocal in Starlette's threadpool, as the routes did before.
+Reports requests/sec and latency percentiles for each.
+
+Sync routes hold a pooled connection per threadpool thread; when the
+pool is smaller than the threadpool (40 threads) they can time out
+waiting for connections. Those show up as errors.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_async_db
+    python -m benchmarks.bench_async_db --concurrency 128 --duration 10 --json
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def seed(session_factory, meeting_model, action_item_model, meetings: int, items_per_meeting: int) -> None:
+    """Insert completed meetings with a few action items each"""
+    with session_factory() as db:
+        for i in range(meetings):
+            meeting = meeting_model(
+                title=f"Meeting {i}",
+                audio_filename=f"meeting_{i}.mp3",
+                transcription="Speaker 1: Status update on the project. " * 50,
+                summary={"key_points": ["Status update"], "action_items": []},
+                status="completed",
+            )
+            db.add(meeting)
+            db.flush()
+            for j in range(items_per_meeting):
+                db.add(action_item_model(meeting_id=meeting.id, description=f"Follow up {j}", status="pending"))
+        db.commit()
+
+
+def build_sync_app():
+    """The same read endpoints as sync routes on the sync session"""
+    from fastapi import Depends, FastAPI, HTTPException
+    from sqlalchemy.orm import Session, load_only
+
+    from app.database import get_db
+    from app.models import ActionItem, Meeting
+    from app.pagination import order_newest_first
+    from app.routes.meetings import SUMMARY_COLUMNS
+    from app.schemas import ActionItemResponse, MeetingResponse, MeetingSummaryResponse
+
+    sync_app = FastAPI()
+
+    @sync_app.get("/api/meetings/")
+    def get_meetings(limit: int = 10, db: Session = Depends(get_db)):
+        query = db.query(Meeting).options(load_only(*SUMMARY_COLUMNS))
+        meetings = order_newest_first(query, Meeting).limit(limit).all()
+        return [MeetingSummaryResponse.model_validate(m) for m in meetings]
+
+    @sync_app.get("/api/meetings/{meeting_id}", response_model=MeetingResponse)
+    def get_meeting(meeting_id: int, db: Session = Depends(get_db)):
+        meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+        if not meeting:
+            raise HTTPException(status_code=404, detail="Meeting not found")
+        return meeting
+
+    @sync_app.get("/api/tasks/")
+    def get_all_tasks(status: str = None, limit: int = 50, db: Session = Depends(get_db)):
+        query = db.query(ActionItem)
+        if status:
+            query = query.filter(ActionItem.status == status)
+        tasks = order_newest_first(query, ActionItem).limit(limit).all()
+        return [ActionItemResponse.model_validate(t) for t in tasks]
+
+    return sync_app
+
+
+async def load(app, urls, concurrency: int, duration: float) -> dict:
+    """Hit the URLs round-robin from concurrent clients for a fixed time"""
+    import httpx
+
+    timings = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker(n: int):
+            nonlocal errors
+            i = n
+            while time.perf_counter() < deadline:
+                url = urls[i % len(urls)]
+                i += 1
+                start = time.perf_counter()
+                response = await client.get(url)
+                timings.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    timings.sort()
+    return {
+        "requests": len(timings),
+        "errors": errors,
+        "requests_per_sec": round(len(timings) / elapsed, 1),
+        "p50_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 2),
+        "p99_ms": round(timings[int(len(timings) * 0.99) - 1], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meetings", type=int, default=200)
+    parser.add_argument("--items", type=int, default=5, help="action items per meeting")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per run")
+    parser.add_argument("--pool-size", type=int, default=20, help="DB_POOL_SIZE for both engines")
+    parser.add_argument("--pool-timeout", type=float, default=5.0, help="DB_POOL_TIMEOUT in seconds")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_async_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["UPLOAD_DIR"] = os.path.join(workdir, "uploads")
+    os.environ["DB_POOL_SIZE"] = str(args.pool_size)
+    os.environ["DB_POOL_TIMEOUT"] = str(args.pool_timeout)
+
+    # Import after the environment points at the throwaway database
+    from app.main import app
+    from app.database import SessionLocal
+    from app.models import ActionItem, Meeting
+
+    seed(SessionLocal, Meeting, ActionItem, args.meetings, args.items)
+    urls = ["/api/meetings/?limit=10&view=summary", "/api/tasks/?limit=50"] + [
+        f"/api/meetings/{i}" for i in range(1, 11)
+    ]
+
+    results = []
+    for name, target in (("sync", build_sync_app()), ("async", app)):
+        results.append({"session": name, **asyncio.run(load(target, urls, args.concurrency, args.duration))})
+
+    if args.json:
+        print(json.dumps({"benchmark": "async_db", "params": vars(args), "results": results}, indent=2))
+        return
+
+    print(f"{args.concurrency} concurrent clients, {args.duration:g}s per run\n")
+    print(f"{'session':<10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for r in results:
+        print(f"{r['session']:<10}{r['requests_per_sec']:>10}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}{r['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark: GET /api/meetings/ full rows vs. the compact summary view
+
+Seeds a throwaway SQLite database with meetings that have long
+transcriptions, then compares payload size and latency of
+view=full and view=summary.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_meeting_list
+    python -m benchmarks.bench_meeting_list --meetings 500 --transcript-kb 100 --json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def seed(session_factory, meeting_model, count: int, transcript_kb: int) -> None:
+    """Insert meetings with realistic-looking transcripts and summaries"""
+    sentence = "Speaker 1: Let's review the roadmap and agree on owners for each item. "
+    transcript = (sentence * (transcript_kb * 1024 // len(sentence) + 1))[:transcript_kb * 1024]
+    summary = {
+        "title": "Roadmap review",
+        "key_points": [f"Key point {i}" for i in range(5)],
+        "decisions": [f"Decision {i}" for i in range(3)],
+        "action_items": [
+            {"task": f"Follow up on item {i}", "assignee": "Unassigned", "priority": "medium"}
+            for i in range(10)
+        ],
+    }
+    with session_factory() as db:
+        for i in range(count):
+            db.add(meeting_model(
+                title=f"Meeting {i}",
+                audio_filename=f"meeting_{i}.mp3",
+                transcription=transcript,
+                summary=summary,
+                status="completed",
+            ))
+        db.commit()
+
+
+def measure(client, url: str, requests: int) -> dict:
+    """Latency percentiles and payload size for one URL"""
+    client.get(url)  # warm up
+    timings = []
+    size = 0
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get(url)
+        timings.append((time.perf_counter() - start) * 1000)
+        size = len(response.content)
+    timings.sort()
+    return {
+        "url": url,
+        "payload_bytes": size,
+        "p50_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 2),
+        "mean_ms": round(statistics.mean(timings), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meetings", type=int, default=200)
+    parser.add_argument("--transcript-kb", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_list_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["UPLOAD_DIR"] = os.path.join(workdir, "uploads")
+
+    # Import after the environment points at the throwaway database
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.database import SessionLocal
+    from app.models import Meeting
+
+    seed(SessionLocal, Meeting, args.meetings, args.transcript_kb)
+    client = TestClient(app)  # no lifespan: job workers stay off
+
+    results = []
+    for view in ("full", "summary"):
+        url = f"/api/meetings/?limit={args.page_size}&view={view}"
+        results.append({"view": view, **measure(client, url, args.requests)})
+
+    if args.json:
+        print(json.dumps({"benchmark": "meeting_list", "params": vars(args), "results": results}, indent=2))
+        return
+
+    print(f"{args.meetings} meetings, {args.transcript_kb}KB transcripts, page size {args.page_size}\n")
+    print(f"{'view':<10}{'payload':>14}{'p50 ms':>10}{'p95 ms':>10}")
+    for r in results:
+        print(f"{r['view']:<10}{r['payload_bytes']:>14,}{r['p50_ms']:>10}{r['p95_ms']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Fake model backend for offline benchmarks
+
+FakeGeminiService has the interface of AsyncGeminiService but never
+touches the network: every call sleeps for a configurable latency (plus
+jitter), fails with a configurable probability, and returns synthetic
+results shaped like the real ones. install() puts it behind
+get_async_gemini_service(), so the job workers use it unchanged.
+"""
+import asyncio
+import os
+import random
+from typing import Dict, List, Optional
+
+from benchmarks.synthetic import (
+    WORDS_PER_SECOND, audio_seconds, make_action_items, make_summary, make_transcript,
+)
+
+
+class FakeModelError(Exception):
+    """Injected model failure"""
+
+
+class FakeGeminiService:
+    """Stand-in for AsyncGeminiService with simulated latency and errors"""
+
+    def __init__(
+        self,
+        latency: float = 0.2,
+        jitter: float = 0.05,
+        error_rate: float = 0.0,
+        realtime_factor: float = 0.002,
+        action_items: int = 5,
+        seed: int = 0,
+        model_name: str = "fake-gemini",
+    ):
+        """
+        Args:
+            latency: Seconds every call takes
+            jitter: Up to this many seconds are added or removed at random
+            error_rate: Probability that a call raises FakeModelError
+            realtime_factor: Extra transcription seconds per second of audio
+            action_items: Action items in every summary
+            seed: Seed for latencies, failures and generated content
+            model_name: Reported model name (metrics and cache keys use it)
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.realtime_factor = realtime_factor
+        self.action_items = action_items
+        self.model_name = model_name
+        self._rng = random.Random(seed)
+        self.calls = {"transcribe_audio": 0, "generate_summary": 0, "extract_action_items": 0}
+        self.errors = 0
+
+    async def _call(self, method: str, extra_seconds: float = 0.0) -> None:
+        """Simulate one model call: wait, then maybe fail"""
+        self.calls[method] += 1
+        delay = self.latency + extra_seconds + self._rng.uniform(-self.jitter, self.jitter)
+        await asyncio.sleep(max(delay, 0))
+        if self._rng.random() < self.error_rate:
+            self.errors += 1
+            raise FakeModelError(f"Injected failure in {method}")
+
+    async def transcribe_audio(self, audio_path: str) -> str:
+        seconds = audio_seconds(os.path.getsize(audio_path))
+        await self._call("transcribe_audio", seconds * self.realtime_factor)
+        return make_transcript(int(seconds * WORDS_PER_SECOND), seed=self._rng.randrange(1 << 30))
+
+    async def generate_summary(self, transcription: str) -> Dict:
+        await self._call("generate_summary")
+        return make_summary(transcription, self.action_items, seed=self._rng.randrange(1 << 30))
+
+    async def extract_action_items(self, text: str) -> List[Dict]:
+        await self._call("extract_action_items")
+        return [
+            {**item, "deadline": None}
+            for item in make_action_items(self.action_items, seed=self._rng.randrange(1 << 30))
+        ]
+
+    async def extract_action_items_batch(self, texts: List[str], max_tokens: Optional[int] = None,
+                                         max_items: Optional[int] = None) -> List[List[Dict]]:
+        # One simulated request for the whole batch, like the real packing
+        await self._call("extract_action_items")
+        return [
+            [{**item, "deadline": None} for item in make_action_items(self.action_items, seed=self._rng.randrange(1 << 30))]
+            for _ in texts
+        ]
+
+    def stats(self) -> Dict:
+        return {"calls": dict(self.calls), "injected_errors": self.errors}
+
+
+def install(fake: FakeGeminiService) -> FakeGeminiService:
+    """Make get_async_gemini_service() return the fake"""
+    from app.services import gemini_service
+
+    gemini_service._async_gemini_service = fake
+    return fake
@@ -0,0 +1,377 @@
+"""
+Load test: the whole API, offline
+
+Runs the FastAPI app in-process against a throwaway SQLite database with
+the job workers started and Gemini replaced by FakeGeminiService, so no
+API key or network is needed. Scenarios:
+
+- upload: concurrent uploads of synthetic recordings of several lengths,
+  then the time the workers need to process all of them
+- list: concurrent clients walking the meeting and task lists page by
+  page with cursor pagination
+- patch: a storm of concurrent task updates on random tasks
+- delete: concurrent meeting deletes
+
+Every scenario reports requests/sec and p50/p95/p99 latency. Use --json
+(and --output to keep a file) to compare runs over time.
+
+Usage (from the backend directory):
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --scenarios upload,patch --concurrency 32 --json
+    python -m benchmarks.load_test --latency 1.5 --jitter 0.5 --error-rate 0.05 --output results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Iterable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SCENARIOS = ("upload", "list", "patch", "delete")
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(q / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class Recorder:
+    """Times requests and counts the unexpected responses"""
+
+    def __init__(self):
+        self.timings: List[float] = []
+        self.errors = 0
+        self.started = time.perf_counter()
+
+    async def request(self, client, method: str, url: str, expect: Iterable[int] = (200,), **kwargs):
+        start = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.timings.append((time.perf_counter() - start) * 1000)
+        if response.status_code not in expect:
+            self.errors += 1
+        return response
+
+    def result(self) -> Dict:
+        elapsed = time.perf_counter() - self.started
+        timings = sorted(self.timings)
+        return {
+            "requests": len(timings),
+            "errors": self.errors,
+            "seconds": round(elapsed, 3),
+            "requests_per_sec": round(len(timings) / elapsed, 1) if elapsed else 0.0,
+            "p50_ms": round(percentile(timings, 50), 2),
+            "p95_ms": round(percentile(timings, 95), 2),
+            "p99_ms": round(percentile(timings, 99), 2),
+            "max_ms": round(timings[-1], 2) if timings else 0.0,
+        }
+
+
+async def run_pool(jobs: Iterable[Callable[[], Awaitable]], concurrency: int) -> None:
+    """Run the jobs with at most `concurrency` in flight"""
+    iterator = iter(jobs)
+
+    async def worker():
+        for job in iterator:
+            await job()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+def seed(session_factory, meetings: int, items: int, transcript_words: List[int], rng_seed: int) -> Dict:
+    """Insert completed meetings with transcripts of varying length and their action items"""
+    from app.models import ActionItem, Meeting
+    from benchmarks.synthetic import make_summary, make_transcript
+
+    meeting_ids, task_ids = [], []
+    with session_factory() as db:
+        for i in range(meetings):
+            transcription = make_transcript(transcript_words[i % len(transcript_words)], seed=rng_seed + i)
+            summary = make_summary(transcription, items, seed=rng_seed + i)
+            meeting = Meeting(
+                title=summary["title"],
+                audio_filename=f"meeting_{i}.wav",
+                transcription=transcription,
+                summary=summary,
+                status="completed",
+            )
+            db.add(meeting)
+            db.flush()
+            rows = [
+                ActionItem(
+                    meeting_id=meeting.id,
+                    description=item["task"],
+                    assignee=item["assignee"],
+                    priority=item["priority"],
+                    status="pending",
+                )
+                for item in summary["action_items"]
+            ]
+            db.add_all(rows)
+            db.flush()
+            meeting_ids.append(meeting.id)
+            task_ids.extend(row.id for row in rows)
+        db.commit()
+    return {"meeting_ids": meeting_ids, "task_ids": task_ids}
+
+
+async def wait_for_jobs(timeout: float) -> bool:
+    """Wait until the job queue is drained; False on timeout"""
+    from app.services.job_queue import get_job_queue
+
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        stats = await asyncio.to_thread(get_job_queue().stats)
+        if stats["queued"] == 0 and stats["running"] == 0:
+            return True
+        await asyncio.sleep(0.05)
+    return False
+
+
+async def scenario_upload(client, data: Dict, args) -> Dict:
+    """Concurrent uploads, then end-to-end processing by the workers"""
+    from sqlalchemy import func, select
+    from app.database import SessionLocal
+    from app.models import Meeting
+    from benchmarks.synthetic import make_audio
+
+    recorder = Recorder()
+    meeting_ids = []
+
+    def upload(i: int):
+        async def job():
+            seconds = args.audio_seconds[i % len(args.audio_seconds)]
+            audio = make_audio(seconds, seed=args.seed * 100000 + i)
+            response = await recorder.request(
+                client, "POST", "/api/meetings/", expect=(202,),
+                files={"file": (f"bench_{i}.wav", audio, "audio/wav")}, data={"title": f"Upload {i}"},
+            )
+            if response.status_code == 202:
+                meeting_ids.append(response.json()["id"])
+        return job
+
+    await run_pool((upload(i) for i in range(args.uploads)), args.concurrency)
+    result = recorder.result()
+
+    drained = await wait_for_jobs(args.job_timeout)
+    processing_seconds = time.perf_counter() - recorder.started
+
+    def count_by_status():
+        with SessionLocal() as db:
+            return dict(db.execute(
+                select(Meeting.status, func.count()).where(Meeting.id.in_(meeting_ids)).group_by(Meeting.status)
+            ).all())
+
+    statuses = await asyncio.to_thread(count_by_status)
+    return {
+        **result,
+        "processing": {
+            "drained": drained,
+            "seconds": round(processing_seconds, 3),
+            "meetings_per_sec": round(statuses.get("completed", 0) / processing_seconds, 2),
+            "completed": statuses.get("completed", 0),
+            "failed": statuses.get("failed", 0),
+        },
+    }
+
+
+async def scenario_list(client, data: Dict, args) -> Dict:
+    """Concurrent cursor walks over the meeting and task lists"""
+    recorder = Recorder()
+    lists = [
+        ("/api/meetings/", {"view": "summary", "limit": args.page_size}),
+        ("/api/tasks/", {"limit": args.page_size}),
+    ]
+
+    def walk(n: int):
+        async def job():
+            url, params = lists[n % len(lists)]
+            cursor = ""
+            for _ in range(args.max_pages):
+                response = await recorder.request(client, "GET", url, params={**params, "cursor": cursor})
+                cursor = response.json().get("next_cursor") if response.status_code == 200 else None
+                if not cursor:
+                    break
+        return job
+
+    await run_pool((walk(n) for n in range(args.walks)), args.concurrency)
+    return recorder.result()
+
+
+async def scenario_patch(client, data: Dict, args) -> Dict:
+    """Concurrent updates of random tasks"""
+    recorder = Recorder()
+    rng = random.Random(args.seed)
+    task_ids = data["task_ids"]
+    statuses = ["pending", "completed"]
+
+    def patch(i: int):
+        task_id = rng.choice(task_ids)
+        body = {"status": rng.choice(statuses), "priority": rng.choice(["high", "medium", "low"])}
+
+        async def job():
+            await recorder.request(client, "PATCH", f"/api/tasks/{task_id}", json=body)
+        return job
+
+    await run_pool((patch(i) for i in range(args.patches)), args.concurrency)
+    return recorder.result()
+
+
+async def scenario_delete(client, data: Dict, args) -> Dict:
+    """Concurrent deletes of seeded meetings"""
+    recorder = Recorder()
+    meeting_ids = data["meeting_ids"][:args.deletes]
+
+    def remove(meeting_id: int):
+        async def job():
+            await recorder.request(client, "DELETE", f"/api/meetings/{meeting_id}")
+        return job
+
+    await run_pool((remove(meeting_id) for meeting_id in meeting_ids), args.concurrency)
+    return recorder.result()
+
+
+SCENARIO_RUNNERS = {
+    "upload": scenario_upload,
+    "list": scenario_list,
+    "patch": scenario_patch,
+    "delete": scenario_delete,
+}
+
+
+async def run(args) -> List[Dict]:
+    import httpx
+    from app.main import app
+    from app.database import SessionLocal
+    from app.services.job_queue import get_job_queue
+
+    data = await asyncio.to_thread(
+        seed, SessionLocal, args.meetings, args.items, args.transcript_words, args.seed
+    )
+    queue = get_job_queue()
+    await queue.start()
+    results = []
+    try:
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            for name in args.scenarios:
+                result = await SCENARIO_RUNNERS[name](client, data, args)
+                results.append({"scenario": name, **result})
+    finally:
+        await queue.stop()
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated, run in this order")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients")
+    parser.add_argument("--seed", type=int, default=1)
+    # Seeded data
+    parser.add_argument("--meetings", type=int, default=300, help="meetings seeded before the run")
+    parser.add_argument("--items", type=int, default=5, help="action items per meeting")
+    parser.add_argument("--transcript-words", type=int_list, default=[300, 3000, 15000],
+                        help="transcript lengths of seeded meetings, cycled")
+    # Scenario sizes
+    parser.add_argument("--uploads", type=int, default=40)
+    parser.add_argument("--audio-seconds", type=int_list, default=[10, 60, 300],
+                        help="durations of uploaded recordings, cycled")
+    parser.add_argument("--walks", type=int, default=32, help="cursor walks in the list scenario")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--max-pages", type=int, default=50, help="pages per walk at most")
+    parser.add_argument("--patches", type=int, default=1000)
+    parser.add_argument("--deletes", type=int, default=100)
+    # Fake model
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per fake model call")
+    parser.add_argument("--jitter", type=float, default=0.05, help="+/- seconds added to each call")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of fake model calls that fail")
+    # App settings
+    parser.add_argument("--workers", type=int, default=16, help="JOB_WORKERS")
+    parser.add_argument("--job-timeout", type=float, default=300, help="seconds to wait for uploads to process")
+    parser.add_argument("--no-response-cache", action="store_true", help="disable the response cache")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--output", help="also write the JSON results to this file")
+    args = parser.parse_args()
+
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    workdir = tempfile.mkdtemp(prefix="bench_load_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["UPLOAD_DIR"] = os.path.join(workdir, "uploads")
+    os.environ["JOB_WORKERS"] = str(args.workers)
+    os.environ["JOB_POLL_INTERVAL"] = "0.1"
+    os.environ.setdefault("JOB_RETRY_BACKOFF", "0.2")  # injected failures are retried, don't wait minutes
+    os.environ["TRANSCRIBE_CHUNKING"] = "off"  # the fake transcribes any length in one call
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    if args.no_response_cache:
+        os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+
+    # Import after the environment points at the throwaway database
+    import logging
+    import app.main  # noqa: F401  creates the tables
+    from benchmarks.fakes import FakeGeminiService, install
+
+    # Keep stdout for the results; app logs (e.g. injected failures) go to stderr
+    for handler in logging.getLogger("app").handlers:
+        handler.setStream(sys.stderr)
+
+    fake = install(FakeGeminiService(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=args.seed,
+    ))
+    results = asyncio.run(run(args))
+
+    report = {
+        "benchmark": "load_test",
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "params": {key: value for key, value in vars(args).items() if key not in ("json", "output")},
+        "model": fake.stats(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{args.concurrency} concurrent clients, fake model {args.latency:g}s ± {args.jitter:g}s, "
+          f"{args.error_rate:.0%} errors\n")
+    print(f"{'scenario':<10}{'requests':>10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for r in results:
+        print(f"{r['scenario']:<10}{r['requests']:>10}{r['requests_per_sec']:>10}"
+              f"{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}{r['errors']:>8}")
+        if "processing" in r:
+            p = r["processing"]
+            print(f"{'':<10}processed {p['completed']} meetings in {p['seconds']}s "
+                  f"({p['meetings_per_sec']}/s), {p['failed']} failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Synthetic inputs for offline benchmarks
+
+Deterministic for a given seed, so two runs of a benchmark see the same
+data. Audio is a valid PCM WAV file (it passes the upload format check);
+every seed gives different bytes, so uploads never hit the result cache.
+"""
+import random
+import struct
+from typing import Dict, List
+
+SAMPLE_RATE = 8000  # Hz, 16-bit mono: 16KB per second of audio
+WORDS_PER_SECOND = 2.5  # typical speaking rate
+
+SPEAKERS = ["Alice", "Bob", "Carol", "Dan", "Erin"]
+WORDS = (
+    "budget roadmap launch customer release review metrics hiring vendor contract "
+    "timeline design backend frontend migration deadline quarter forecast risk owner "
+    "feedback demo sprint onboarding incident pricing partner campaign survey audit"
+).split()
+TASK_VERBS = ["Prepare", "Review", "Send", "Schedule", "Draft", "Follow up on", "Update", "Book"]
+
+
+def make_audio(seconds: float, seed: int = 0) -> bytes:
+    """A WAV file of the given duration filled with low-level noise"""
+    data = random.Random(seed).randbytes(int(seconds * SAMPLE_RATE) * 2)
+    header = b"RIFF" + struct.pack("<I", 36 + len(data)) + b"WAVE"
+    fmt = b"fmt " + struct.pack("<IHHIIHH", 16, 1, 1, SAMPLE_RATE, SAMPLE_RATE * 2, 2, 16)
+    return header + fmt + b"data" + struct.pack("<I", len(data)) + data
+
+
+def audio_seconds(size_bytes: int) -> float:
+    """Duration of a make_audio file from its size"""
+    return max(size_bytes - 44, 0) / (SAMPLE_RATE * 2)
+
+
+def make_transcript(words: int, seed: int = 0, speakers: int = 3) -> str:
+    """Speaker-labeled transcript of about the given number of words, one turn per line"""
+    rng = random.Random(seed)
+    lines = []
+    remaining = max(words, 1)
+    while remaining > 0:
+        turn = min(rng.randint(8, 40), remaining)
+        speaker = SPEAKERS[rng.randrange(min(speakers, len(SPEAKERS)))]
+        sentence = " ".join(rng.choice(WORDS) for _ in range(turn))
+        lines.append(f"{speaker}: {sentence.capitalize()}.")
+        remaining -= turn
+    return "\n".join(lines)
+
+
+def make_action_items(count: int, seed: int = 0) -> List[Dict]:
+    """Action items in the shape the model returns"""
+    rng = random.Random(seed)
+    return [
+        {
+            "task": f"{rng.choice(TASK_VERBS)} the {rng.choice(WORDS)} {rng.choice(WORDS)} ({i + 1})",
+            "assignee": rng.choice(SPEAKERS + ["Unassigned"]),
+            "priority": rng.choice(["high", "medium", "low"]),
+        }
+        for i in range(count)
+    ]
+
+
+def make_summary(transcription: str, action_items: int = 5, seed: int = 0) -> Dict:
+    """A summary in the shape generate_summary returns"""
+    rng = random.Random(seed)
+    lines = transcription.splitlines() or [""]
+    return {
+        "title": f"{rng.choice(WORDS).capitalize()} {rng.choice(WORDS)} sync",
+        "key_points": [line.partition(": ")[2][:120] for line in lines[:5]],
+        "decisions": [f"Go ahead with the {rng.choice(WORDS)} plan"],
+        "action_items": make_action_items(action_items, seed),
+    }
@@ -2,12 +2,14 @@
 Initialize database - create tables
 """
 from app.database import engine, Base
-from app.models import Meeting, ActionItem
+from app.models import Meeting, ActionItem, ProcessingJob, RemoteFile, TaskStat, TranscriptChunk
+from app.migrations import run_migrations
 
 def init_db():
     """Create all database tables"""
     print("Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
     print("✅ Database tables created successfully!")
 
 if __name__ == "__main__":
@@ -0,0 +1,58 @@
+"""
+Shared test setup
+
+Tests run from the backend directory (python -m pytest) against a
+throwaway database and upload directory; nothing talks to Gemini.
+"""
+import os
+import sys
+import tempfile
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+_workdir = tempfile.mkdtemp(prefix="meeting_tests_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_workdir, 'test.db')}")
+os.environ.setdefault("UPLOAD_DIR", os.path.join(_workdir, "uploads"))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+@pytest.fixture
+def fake_app(monkeypatch):
+    """Test client for the app with fast job workers; tests install the fake model"""
+    # Imported here so the environment above is in place before the app loads
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.services import chunked_transcription, gemini_service, job_queue
+    from app.services.job_queue import JobQueue
+
+    monkeypatch.setattr(gemini_service, "_async_gemini_service", None)
+    monkeypatch.setattr(job_queue, "_job_queue", JobQueue(workers=2, poll_interval=0.05, retry_backoff=0))
+    monkeypatch.setattr(chunked_transcription, "TRANSCRIBE_CHUNKING", "off")
+    with TestClient(app) as client:
+        yield client
+
+
+def upload(client, seconds: float, seed: int) -> dict:
+    from benchmarks.synthetic import make_audio
+
+    response = client.post(
+        "/api/meetings/",
+        files={"file": ("standup.wav", make_audio(seconds, seed), "audio/wav")},
+        data={"title": f"Standup {seed}"},
+    )
+    assert response.status_code == 202, response.text
+    return response.json()
+
+
+def wait_for_job(client, job_id: int, timeout: float = 10.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/api/jobs/{job_id}").json()
+        if job["status"] in ("completed", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} did not finish: {job}")
@@ -0,0 +1,152 @@
+"""
+Transcript stitching and ChunkedTranscriber, offline
+
+A fake splitter stands in for ffmpeg and a fake transcriber for the
+model, so segments, overlaps and failures are fully scripted.
+"""
+import asyncio
+
+import pytest
+
+from app.services.chunked_transcription import ChunkedTranscriber, plan_segments, stitch_transcripts
+from app.services.model_scheduler import ModelUnavailableError
+
+
+def test_plan_segments_overlap():
+    assert plan_segments(100, 300, 10) == [(0.0, 100)]
+    assert plan_segments(650, 300, 10) == [(0.0, 300.0), (290.0, 590.0), (580.0, 650)]
+    with pytest.raises(ValueError):
+        plan_segments(650, 10, 10)
+
+
+def test_stitch_drops_repeated_overlap():
+    parts = [
+        "We agreed to ship the release on Friday. Dana will update the roadmap",
+        "Dana will update the roadmap and send it to the team.",
+    ]
+    assert stitch_transcripts(parts) == (
+        "We agreed to ship the release on Friday. Dana will update the roadmap\n"
+        "and send it to the team."
+    )
+
+
+def test_stitch_tolerates_a_differently_transcribed_word():
+    parts = [
+        "first part of the call then the budget for the next quarter is fixed at forty",
+        "then the budget for the next quarter was fixed at forty thousand euros.",
+    ]
+    assert stitch_transcripts(parts).endswith("fixed at forty\nthousand euros.")
+
+
+def test_stitch_keeps_words_when_the_anchor_repeats_earlier():
+    # The segment's first words also occur earlier in the previous one, but
+    # what follows them there doesn't match: nothing may be removed
+    parts = [
+        "we need to talk about pricing. Later we need to review the contract today",
+        "we need to talk about hiring for the new team.",
+    ]
+    assert stitch_transcripts(parts) == "\n".join(parts)
+
+
+def test_stitch_keeps_everything_when_a_word_was_dropped():
+    parts = [
+        "the vendor asked for more time on the migration plan",
+        "asked for time on the migration plan and the audit.",
+    ]
+    assert stitch_transcripts(parts) == "\n".join(parts)
+
+
+class FakeSplitter:
+    """Pretends the recording is `duration` seconds long; cut() writes the window"""
+
+    def __init__(self, duration):
+        self._duration = duration
+
+    async def duration(self, audio_path):
+        return self._duration
+
+    async def cut(self, audio_path, start, end, out_path):
+        with open(out_path, "w") as f:
+            f.write(f"{start:g}-{end:g}")
+
+
+class FakeTranscriber:
+    """Returns scripted text per window, failing first with the scripted errors"""
+
+    def __init__(self, texts, errors=None):
+        self.texts = texts
+        self.errors = {window: list(errs) for window, errs in (errors or {}).items()}
+        self.calls = []
+
+    async def transcribe_audio(self, audio_path):
+        with open(audio_path) as f:
+            window = f.read()
+        self.calls.append(window)
+        if self.errors.get(window):
+            raise self.errors[window].pop(0)
+        return self.texts[window]
+
+
+TEXTS = {
+    "0-300": "Alice: Welcome everyone. Today we plan the launch of the mobile app",
+    "290-590": "the launch of the mobile app is set for March. Bob: I will book the venue",
+    "580-650": "I will book the venue by Friday.",
+}
+
+
+def make_transcriber(fake, **kwargs):
+    return ChunkedTranscriber(
+        fake, splitter=FakeSplitter(650), segment_seconds=300, overlap_seconds=10, retry_delay=0, **kwargs,
+    )
+
+
+def test_chunked_transcriber_stitches_segments_in_order():
+    async def scenario():
+        seen = []
+
+        async def on_segment(segment, text):
+            seen.append(segment.index)
+
+        fake = FakeTranscriber(TEXTS)
+        text = await make_transcriber(fake, on_segment=on_segment).transcribe_audio("meeting.mp3")
+        assert text == (
+            "Alice: Welcome everyone. Today we plan the launch of the mobile app\n"
+            "is set for March. Bob: I will book the venue\n"
+            "by Friday."
+        )
+        assert sorted(seen) == [0, 1, 2]
+
+    asyncio.run(scenario())
+
+
+def test_short_recordings_are_sent_whole():
+    async def scenario():
+        class Whole:
+            async def transcribe_audio(self, audio_path):
+                return f"whole {audio_path}"
+
+        transcriber = ChunkedTranscriber(Whole(), splitter=FakeSplitter(120), segment_seconds=300)
+        assert await transcriber.transcribe_audio("short.mp3") == "whole short.mp3"
+
+    asyncio.run(scenario())
+
+
+def test_failed_segment_is_retried_alone():
+    async def scenario():
+        fake = FakeTranscriber(TEXTS, errors={"290-590": [ValueError("empty response")]})
+        await make_transcriber(fake, retries=2).transcribe_audio("meeting.mp3")
+        assert sorted(fake.calls) == ["0-300", "290-590", "290-590", "580-650"]
+
+    asyncio.run(scenario())
+
+
+def test_model_unavailable_is_not_retried_per_segment():
+    async def scenario():
+        error = ModelUnavailableError("quota", retry_after=60)
+        fake = FakeTranscriber(TEXTS, errors={"290-590": [error, error]})
+        with pytest.raises(Exception) as info:
+            await make_transcriber(fake, retries=2).transcribe_audio("meeting.mp3")
+        assert info.value.__cause__ is error
+        assert fake.calls.count("290-590") == 1
+
+    asyncio.run(scenario())
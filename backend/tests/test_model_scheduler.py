@@ -0,0 +1,177 @@
+"""
+ModelScheduler timing behaviour, on a fake clock with a fake model client
+"""
+import asyncio
+import random
+
+import pytest
+
+from app.services.model_scheduler import (
+    CircuitBreaker, CircuitOpenError, ModelScheduler, ModelUnavailableError, TokenBucket, unavailable_cause,
+)
+
+
+class FakeClock:
+    """Time only moves when something sleeps (or the test advances it)"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class QuotaError(Exception):
+    code = 429
+
+
+class FakeClient:
+    """Fails with the given errors in turn, then succeeds"""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def generate(self) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def make_scheduler(clock, seed=7, **kwargs) -> ModelScheduler:
+    options = dict(
+        requests_per_minute=600, tokens_per_minute=100000, max_retries=3,
+        backoff_base=1.0, backoff_max=8.0, breaker_threshold=10, breaker_reset_seconds=30.0,
+    )
+    options.update(kwargs)
+    return ModelScheduler(clock=clock, rng=random.Random(seed), **options)
+
+
+def test_token_bucket_refills_over_time():
+    async def scenario():
+        clock = FakeClock()
+        bucket = TokenBucket(60, clock)  # one token per second
+        assert await bucket.acquire(60) == 0
+        assert await bucket.acquire(1) == pytest.approx(1.0)
+        clock.now += 30
+        assert await bucket.acquire(30) == 0
+        # Larger than the bucket: waits for a full bucket, not forever
+        assert await bucket.acquire(120) == pytest.approx(60.0)
+
+    asyncio.run(scenario())
+
+
+def test_backoff_delays_are_seeded_full_jitter():
+    scheduler = make_scheduler(FakeClock(), seed=3)
+    expected = random.Random(3)
+    for attempt in range(6):
+        ceiling = min(8.0, 2 ** attempt)
+        delay = scheduler.backoff_delay(attempt)
+        assert delay == expected.uniform(0, ceiling)
+        assert 0 <= delay <= ceiling
+
+
+def test_retries_retryable_errors_with_backoff():
+    async def scenario():
+        clock = FakeClock()
+        scheduler = make_scheduler(clock)
+        client = FakeClient(QuotaError("quota"), QuotaError("quota"))
+
+        assert await scheduler.run(client.generate) == "ok"
+        assert client.calls == 3
+        assert scheduler.retries == 2
+        rng = random.Random(7)
+        assert clock.sleeps[-2:] == [rng.uniform(0, 1.0), rng.uniform(0, 2.0)]
+
+    asyncio.run(scenario())
+
+
+def test_gives_up_with_model_unavailable_error():
+    async def scenario():
+        scheduler = make_scheduler(FakeClock())
+        client = FakeClient(*[QuotaError("quota")] * 4)
+
+        with pytest.raises(ModelUnavailableError) as info:
+            await scheduler.run(client.generate)
+        assert client.calls == 4
+        assert isinstance(info.value.__cause__, QuotaError)
+        assert info.value.retry_after >= scheduler.backoff_max
+
+    asyncio.run(scenario())
+
+
+def test_non_retryable_errors_are_raised_at_once():
+    async def scenario():
+        scheduler = make_scheduler(FakeClock())
+        client = FakeClient(ValueError("bad request"))
+
+        with pytest.raises(ValueError):
+            await scheduler.run(client.generate)
+        assert client.calls == 1
+        assert scheduler.breaker.state == "closed"
+
+    asyncio.run(scenario())
+
+
+def test_circuit_breaker_opens_half_opens_and_closes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30, clock=clock)
+
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now += 10
+    with pytest.raises(CircuitOpenError) as info:
+        breaker.before_call()
+    assert info.value.retry_after == pytest.approx(20)
+
+    clock.now += 20
+    breaker.before_call()
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # only one trial call at a time
+
+    # A failed trial re-opens the circuit for another cool-down
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock.now += 30
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.before_call()
+
+
+def test_open_circuit_fails_fast_without_calling_the_model():
+    async def scenario():
+        clock = FakeClock()
+        scheduler = make_scheduler(clock, max_retries=0, breaker_threshold=1)
+        client = FakeClient(QuotaError("quota"))
+
+        with pytest.raises(ModelUnavailableError):
+            await scheduler.run(client.generate)
+        with pytest.raises(CircuitOpenError):
+            await scheduler.run(client.generate)
+        assert client.calls == 1
+        assert scheduler.rejected == 1
+
+    asyncio.run(scenario())
+
+
+def test_unavailable_cause_sees_through_wrapping():
+    try:
+        try:
+            raise CircuitOpenError("open", retry_after=5)
+        except CircuitOpenError as e:
+            raise Exception(f"Error transcribing audio: {e}")
+    except Exception as wrapped:
+        assert unavailable_cause(wrapped).retry_after == 5
+    assert unavailable_cause(ValueError("bad")) is None
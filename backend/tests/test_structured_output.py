@@ -0,0 +1,41 @@
+"""
+Parsing model replies into summaries
+"""
+import pytest
+
+from app.services.structured_output import ParseMetrics, SummaryParseError, parse_summary
+from app.services import structured_output
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    fresh = ParseMetrics()
+    monkeypatch.setattr(structured_output, "_parse_metrics", fresh)
+    return fresh
+
+
+def test_complete_reply_is_parsed(metrics):
+    summary = parse_summary(
+        '```json\n{"title": "Launch sync", "key_points": ["Date set"], "decisions": [], '
+        '"action_items": [{"task": "Book venue", "assignee": "", "priority": "URGENT"}]}\n```'
+    )
+    assert summary.title == "Launch sync"
+    assert summary.action_items[0].assignee == "Unassigned"
+    assert summary.action_items[0].priority == "medium"
+    assert metrics.stats()["parsed"] == 1
+
+
+def test_truncated_reply_keeps_complete_parts(metrics):
+    summary = parse_summary(
+        '{"title": "Launch sync", "key_points": ["Date set", "Budget'
+    )
+    assert summary.title == "Launch sync"
+    assert summary.action_items == []
+    assert metrics.stats()["recovered"] == 1
+
+
+@pytest.mark.parametrize("reply", ["{}", '{"summary": "We met", "items": []}', "[]", "Sure! Here it is"])
+def test_replies_without_a_summary_fail(metrics, reply):
+    with pytest.raises(SummaryParseError):
+        parse_summary(reply)
+    assert metrics.stats() == {"parsed": 0, "recovered": 0, "failed": 1, "failure_rate": 1.0}
@@ -0,0 +1,112 @@
+"""
+GET /api/tasks/stats is read from the trigger-maintained task_stats table;
+after every kind of task write it must match a recount of action_items
+"""
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from app.database import engine
+from benchmarks.fakes import FakeGeminiService, install
+from conftest import upload, wait_for_job
+
+TODAY = date.today()
+YESTERDAY = TODAY - timedelta(days=1)
+TOMORROW = TODAY + timedelta(days=1)
+
+
+def recount() -> dict:
+    """What GET /api/tasks/stats should return, counted straight from action_items"""
+    with engine.connect() as conn:
+        def grouped(column: str) -> dict:
+            rows = conn.execute(text(
+                f"SELECT COALESCE({column}, ''), COUNT(*) FROM action_items GROUP BY COALESCE({column}, '')"
+            ))
+            return dict(rows.all())
+
+        def open_due(op: str) -> int:
+            return conn.execute(text(
+                f"SELECT COUNT(*) FROM action_items "
+                f"WHERE due_date {op} :today AND COALESCE(status, '') <> 'completed'"
+            ), {"today": TODAY}).scalar()
+
+        by_assignee = grouped("assignee")
+        if "" in by_assignee:
+            # The endpoint reports blank assignees with any literal "Unassigned"
+            by_assignee["Unassigned"] = by_assignee.get("Unassigned", 0) + by_assignee.pop("")
+        return {
+            "total": conn.execute(text("SELECT COUNT(*) FROM action_items")).scalar(),
+            "by_status": grouped("status"),
+            "by_priority": grouped("priority"),
+            "by_assignee": by_assignee,
+            "overdue": open_due("<"),
+            "due_today": open_due("="),
+        }
+
+
+def assert_stats_match(client) -> dict:
+    stats = client.get("/api/tasks/stats").json()
+    assert stats == recount()
+    return stats
+
+
+@pytest.fixture
+def meeting(fake_app):
+    """A processed meeting with a few generated action items"""
+    fake = install(FakeGeminiService(latency=0.01, jitter=0, action_items=3, seed=7))
+    created = upload(fake_app, seconds=4, seed=201)
+    assert wait_for_job(fake_app, created["job_id"])["status"] == "completed"
+    return {"id": created["id"], "fake": fake}
+
+
+def create_tasks(client, meeting_id: int) -> list:
+    response = client.post("/api/tasks/batch", json=[
+        {"meeting_id": meeting_id, "description": "Overdue", "assignee": "Alice", "due_date": str(YESTERDAY), "priority": "high"},
+        {"meeting_id": meeting_id, "description": "Due today", "assignee": "Bob", "due_date": str(TODAY)},
+        {"meeting_id": meeting_id, "description": "Due later", "due_date": str(TOMORROW), "priority": "low"},
+        {"meeting_id": meeting_id, "description": "No due date", "assignee": ""},
+    ])
+    assert response.status_code == 201, response.text
+    return [task["id"] for task in response.json()]
+
+
+def test_stats_after_insert(fake_app, meeting):
+    before = assert_stats_match(fake_app)
+    create_tasks(fake_app, meeting["id"])
+    after = assert_stats_match(fake_app)
+    assert after["total"] == before["total"] + 4
+
+
+def test_stats_after_batch_update(fake_app, meeting):
+    overdue, due_today, due_later, no_due = create_tasks(fake_app, meeting["id"])
+    response = fake_app.patch("/api/tasks/", json=[
+        {"id": overdue, "status": "completed"},
+        {"id": due_today, "assignee": "Alice", "due_date": str(YESTERDAY)},
+        {"id": due_later, "due_date": str(TODAY), "priority": "high"},
+        {"id": no_due, "assignee": "Carol", "status": "in_progress", "due_date": str(YESTERDAY)},
+    ])
+    assert response.json()["failed"] == 0
+    assert_stats_match(fake_app)
+
+    # Reopening a completed task brings its due date back into the counts
+    fake_app.patch("/api/tasks/", json=[{"id": overdue, "status": "pending"}, {"id": due_today, "due_date": None}])
+    assert_stats_match(fake_app)
+
+
+def test_stats_after_resummarize(fake_app, meeting):
+    create_tasks(fake_app, meeting["id"])
+    meeting["fake"].action_items = 6
+    job = fake_app.post(f"/api/meetings/{meeting['id']}/resummarize").json()
+    assert wait_for_job(fake_app, job["id"])["status"] == "completed"
+    assert_stats_match(fake_app)
+
+
+def test_stats_after_delete(fake_app, meeting):
+    task_ids = create_tasks(fake_app, meeting["id"])
+    for task_id in task_ids[:2]:
+        assert fake_app.delete(f"/api/tasks/{task_id}").status_code == 200
+    assert_stats_match(fake_app)
+
+    assert fake_app.delete(f"/api/meetings/{meeting['id']}").status_code == 200
+    assert_stats_match(fake_app)
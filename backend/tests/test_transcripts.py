@@ -0,0 +1,98 @@
+"""
+Chunked transcript storage (app/models/transcript.py) and ranged reads
+(app/services/transcripts.py), with chunks small enough that lines cross them
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import models  # noqa: F401 - registers every table on Base
+from app.database import Base
+from app.models.meeting import Meeting
+from app.models.transcript import encode_transcript, split_segments
+from app.services.transcripts import TranscriptReader
+
+CHUNK_CHARS = 16
+LINES = [
+    "Alice: hi\n",
+    "Bob: hello there\n",  # one character longer than a chunk
+    "Carol: this line is much longer than a chunk\n",
+    "Dan: ok\n",
+    "Erin: bye",  # no trailing newline
+]
+TEXT = "".join(LINES)
+
+
+@pytest.fixture
+def reader():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        meeting = Meeting(title="Standup")
+        meeting.transcript_chunks = encode_transcript(TEXT, chunk_chars=CHUNK_CHARS)
+        db.add(meeting)
+        db.commit()
+        yield TranscriptReader(db, meeting.id)
+
+
+def test_encode_round_trip():
+    chunks = encode_transcript(TEXT, chunk_chars=CHUNK_CHARS)
+    assert "".join(chunk.text for chunk in chunks) == TEXT
+    assert all(chunk.char_count <= CHUNK_CHARS for chunk in chunks)
+    assert [chunk.seq for chunk in chunks] == list(range(len(chunks)))
+
+    position = segments = 0
+    for chunk in chunks:
+        assert (chunk.char_start, chunk.segment_start) == (position, segments)
+        position += chunk.char_count
+        segments += chunk.segment_count
+    assert (position, segments) == (len(TEXT), len(LINES))
+    assert split_segments(TEXT) == LINES
+
+
+def test_encode_empty_transcript():
+    assert encode_transcript("", chunk_chars=CHUNK_CHARS) == []
+
+
+def test_long_line_is_split_across_chunks(reader):
+    # Some chunk continues a line cut at the previous chunk's end
+    assert any(
+        not TEXT[:chunk.char_start].endswith("\n") for chunk in reader.chunks if chunk.char_start
+    )
+    for index, line in enumerate(LINES):
+        assert reader.read("segments", index, 1)["text"] == line
+
+
+def test_char_ranges_across_chunk_boundaries(reader):
+    for start in range(len(TEXT) + 1):
+        for end in range(start, len(TEXT) + 1, 7):
+            assert reader.chars(start, end) == TEXT[start:end]
+
+
+def test_char_range_loads_only_overlapping_chunks(reader):
+    assert reader.chars(2, CHUNK_CHARS + 2) == TEXT[2:CHUNK_CHARS + 2]
+    assert sorted(reader._texts) == [0, 1]
+
+
+def test_char_paging_covers_transcript(reader):
+    pages, start = [], 0
+    while start is not None:
+        page = reader.read("chars", start, 10)
+        pages.append(page["text"])
+        start = page["next_start"]
+    assert "".join(pages) == TEXT
+    assert page["end"] == page["total"] == len(TEXT)
+
+
+def test_segment_paging_at_end(reader):
+    page = reader.read("segments", 3, 10)
+    assert (page["start"], page["end"], page["next_start"]) == (3, len(LINES), None)
+    assert page["text"] == LINES[3] + LINES[4]
+
+    page = reader.read("segments", 1, 2)
+    assert (page["end"], page["next_start"]) == (3, 3)
+    assert page["text"] == LINES[1] + LINES[2]
+
+    past_end = reader.read("segments", 99, 5)
+    assert (past_end["start"], past_end["end"], past_end["text"]) == (len(LINES), len(LINES), "")
+    assert past_end["next_start"] is None
@@ -0,0 +1,84 @@
+"""
+Upload to completed meeting through the API, with the job workers running
+and FakeGeminiService (benchmarks/fakes.py) in place of the model
+"""
+from benchmarks.fakes import FakeGeminiService, FakeModelError, install
+from conftest import upload, wait_for_job
+
+
+class FlakyFakeGeminiService(FakeGeminiService):
+    """Fails the first transcription, then behaves"""
+
+    async def transcribe_audio(self, audio_path: str) -> str:
+        if self.calls["transcribe_audio"] == 0:
+            self.calls["transcribe_audio"] += 1
+            raise FakeModelError("Injected failure in transcribe_audio")
+        return await super().transcribe_audio(audio_path)
+
+
+class ScriptedFakeGeminiService(FakeGeminiService):
+    """Summaries list exactly the given action item tasks"""
+
+    def __init__(self, tasks, **kwargs):
+        super().__init__(**kwargs)
+        self.tasks = tasks
+
+    async def generate_summary(self, transcription: str) -> dict:
+        summary = await super().generate_summary(transcription)
+        return {**summary, "action_items": [{"task": task, "assignee": "Alice", "priority": "medium"} for task in self.tasks]}
+
+
+def test_upload_is_processed_to_completion(fake_app):
+    fake = install(FakeGeminiService(latency=0.01, jitter=0, action_items=3, seed=1))
+    created = upload(fake_app, seconds=4, seed=101)
+    assert created["status"] == "queued"
+
+    job = wait_for_job(fake_app, created["job_id"])
+    assert job["status"] == "completed"
+    assert job["attempts"] == 1
+
+    meeting = fake_app.get(f"/api/meetings/{created['id']}").json()
+    assert meeting["status"] == "completed"
+    assert meeting["summary"]["title"]
+    assert meeting["transcription"]
+    actions = fake_app.get(f"/api/meetings/{created['id']}/actions").json()
+    assert len(actions) == 3
+    assert fake.calls["transcribe_audio"] == 1
+    assert fake.calls["generate_summary"] == 1
+
+
+def test_failed_attempt_is_retried(fake_app):
+    fake = install(FlakyFakeGeminiService(latency=0.01, jitter=0, seed=2))
+    created = upload(fake_app, seconds=4, seed=102)
+
+    job = wait_for_job(fake_app, created["job_id"])
+    assert job["status"] == "completed"
+    assert job["attempts"] == 2
+    assert fake.calls["transcribe_audio"] == 2
+    assert fake_app.get(f"/api/meetings/{created['id']}").json()["status"] == "completed"
+
+
+def test_resummarize_keeps_matched_and_user_edited_items(fake_app):
+    fake = install(ScriptedFakeGeminiService(
+        ["Send the budget", "Book the venue", "Draft the survey"], latency=0.01, jitter=0, seed=3,
+    ))
+    created = upload(fake_app, seconds=4, seed=103)
+    wait_for_job(fake_app, created["job_id"])
+    actions_url = f"/api/meetings/{created['id']}/actions"
+    before = {item["description"]: item["id"] for item in fake_app.get(actions_url).json()}
+    assert set(before) == {"Send the budget", "Book the venue", "Draft the survey"}
+
+    # A user edits one generated item and adds one by hand
+    assert fake_app.patch(f"/api/tasks/{before['Book the venue']}", json={"assignee": "Bob"}).status_code == 200
+    assert fake_app.post(f"{actions_url}:batch", json=[{"description": "Call the caterer"}]).status_code == 201
+
+    fake.tasks = ["send the  budget", "Review the contract"]
+    job = fake_app.post(f"/api/meetings/{created['id']}/resummarize").json()
+    assert wait_for_job(fake_app, job["id"])["status"] == "completed"
+
+    after = {item["description"]: item for item in fake_app.get(actions_url).json()}
+    assert set(after) == {"Send the budget", "Book the venue", "Call the caterer", "Review the contract"}
+    # Matched (case and spacing aside) and edited items keep their rows
+    assert after["Send the budget"]["id"] == before["Send the budget"]
+    assert after["Book the venue"]["id"] == before["Book the venue"]
+    assert after["Book the venue"]["assignee"] == "Bob"
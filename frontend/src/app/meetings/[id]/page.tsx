@@ -4,6 +4,7 @@ import { useEffect, useState } from "react";
 import { useParams, useRouter } from "next/navigation";
 import axios from "axios";
 import Link from "next/link";
+import { isInProgress } from "../../../lib/meetingStatus";
 
 interface ActionItem {
   id: number;
@@ -117,7 +118,7 @@ export default function MeetingDetailPage() {
               className={`px-3 py-1 rounded-full text-sm font-medium ${
                 meeting.status === "completed"
                   ? "bg-green-100 text-green-800"
-                  : meeting.status === "processing"
+                  : isInProgress(meeting.status)
                   ? "bg-yellow-100 text-yellow-800"
                   : "bg-red-100 text-red-800"
               }`}
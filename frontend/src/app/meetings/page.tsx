@@ -3,6 +3,7 @@
 import { useEffect, useState } from "react";
 import axios from "axios";
 import Link from "next/link";
+import { isInProgress } from "../../lib/meetingStatus";
 
 interface Meeting {
   id: number;
@@ -39,7 +40,9 @@ export default function MeetingsPage() {
 
     // Filter by status
     if (statusFilter !== "all") {
-      filtered = filtered.filter((m) => m.status === statusFilter);
+      filtered = filtered.filter((m) =>
+        statusFilter === "in_progress" ? isInProgress(m.status) : m.status === statusFilter
+      );
     }
 
     // Filter by search query
@@ -144,9 +147,9 @@ export default function MeetingsPage() {
             Completed
           </button>
           <button
-            onClick={() => setStatusFilter("processing")}
+            onClick={() => setStatusFilter("in_progress")}
             className={`px-4 py-2 rounded-lg font-medium ${
-              statusFilter === "processing"
+              statusFilter === "in_progress"
                 ? "bg-yellow-600 text-white"
                 : "bg-gray-200 text-gray-700 hover:bg-gray-300"
             }`}
@@ -194,7 +197,7 @@ export default function MeetingsPage() {
                       className={`px-3 py-1 rounded-full text-sm font-medium ${
                         meeting.status === "completed"
                           ? "bg-green-100 text-green-800"
-                          : meeting.status === "processing"
+                          : isInProgress(meeting.status)
                           ? "bg-yellow-100 text-yellow-800"
                           : "bg-red-100 text-red-800"
                       }`}
@@ -3,6 +3,7 @@
 import { useEffect, useState } from "react";
 import axios from "axios";
 import Link from "next/link";
+import { isInProgress } from "../../lib/meetingStatus";
 
 interface Meeting {
   id: number;
@@ -20,6 +21,15 @@ interface Task {
   created_at: string;
 }
 
+interface TaskStats {
+  total: number;
+  by_status: Record<string, number>;
+  by_priority: Record<string, number>;
+  by_assignee: Record<string, number>;
+  overdue: number;
+  due_today: number;
+}
+
 interface Stats {
   totalMeetings: number;
   completedMeetings: number;
@@ -50,27 +60,30 @@ export default function DashboardPage() {
 
   const fetchDashboardData = async () => {
     try {
-      const [meetingsRes, tasksRes] = await Promise.all([
-        axios.get("http://localhost:8000/api/meetings/"),
-        axios.get("http://localhost:8000/api/tasks/"),
+      // Task counts come pre-aggregated; only the recent tasks are fetched
+      const [meetingsRes, tasksRes, taskStatsRes] = await Promise.all([
+        axios.get("http://localhost:8000/api/meetings/?view=summary"),
+        axios.get("http://localhost:8000/api/tasks/?limit=8"),
+        axios.get("http://localhost:8000/api/tasks/stats"),
       ]);
 
       const meetings: Meeting[] = meetingsRes.data;
       const tasks: Task[] = tasksRes.data;
+      const taskStats: TaskStats = taskStatsRes.data;
 
       const completedMeetings = meetings.filter((m) => m.status === "completed").length;
-      const processingMeetings = meetings.filter((m) => m.status === "processing").length;
-      const pendingTasks = tasks.filter((t) => t.status === "pending").length;
-      const completedTasks = tasks.filter((t) => t.status === "completed").length;
+      const processingMeetings = meetings.filter((m) => isInProgress(m.status)).length;
+      const pendingTasks = taskStats.by_status.pending || 0;
+      const completedTasks = taskStats.by_status.completed || 0;
 
       setStats({
         totalMeetings: meetings.length,
         completedMeetings,
         processingMeetings,
-        totalTasks: tasks.length,
+        totalTasks: taskStats.total,
         pendingTasks,
         completedTasks,
-        completionRate: tasks.length > 0 ? Math.round((completedTasks / tasks.length) * 100) : 0,
+        completionRate: taskStats.total > 0 ? Math.round((completedTasks / taskStats.total) * 100) : 0,
       });
 
       setRecentMeetings(meetings.slice(0, 5));
@@ -187,7 +200,7 @@ export default function DashboardPage() {
                       className={`ml-3 px-3 py-1 rounded-full text-xs font-medium ${
                         meeting.status === "completed"
                           ? "bg-green-100 text-green-800"
-                          : meeting.status === "processing"
+                          : isInProgress(meeting.status)
                           ? "bg-yellow-100 text-yellow-800"
                           : "bg-red-100 text-red-800"
                       }`}
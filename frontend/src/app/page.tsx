@@ -3,6 +3,7 @@
 import { useState, useEffect } from 'react';
 import axios from 'axios';
 import Link from 'next/link';
+import { isInProgress } from '../lib/meetingStatus';
 
 interface RecentMeeting {
   id: number;
@@ -27,7 +28,7 @@ export default function Home() {
 
   const fetchRecentMeetings = async () => {
     try {
-      const response = await axios.get('http://localhost:8000/api/meetings/?limit=5');
+      const response = await axios.get('http://localhost:8000/api/meetings/?limit=5&view=summary');
       setRecentMeetings(response.data);
     } catch (err) {
       console.error('Failed to fetch recent meetings');
@@ -73,33 +74,55 @@ export default function Home() {
       });
 
       setUploadProgress(40);
-      setProcessingStage('🎙️ Transcribing audio with AI...');
-      
-      // Simulate progress during AI processing
-      const progressInterval = setInterval(() => {
-        setUploadProgress((prev) => {
-          if (prev >= 90) {
-            clearInterval(progressInterval);
-            return 90;
+      setProcessingStage('⏳ Queued for processing...');
+      const id = response.data.id;
+      setMeetingId(id);
+
+      // Follow processing progress pushed by the server
+      const stages: Record<string, [number, string]> = {
+        queued: [40, '⏳ Queued for processing...'],
+        transcribing: [55, '🎙️ Transcribing audio with AI...'],
+        summarizing: [80, '🧠 Generating summary and action items...'],
+      };
+      const finalStatus = await new Promise<string>((resolve) => {
+        const events = new EventSource(`http://localhost:8000/api/meetings/${id}/events`);
+        events.addEventListener('status', (e) => {
+          const { status } = JSON.parse((e as MessageEvent).data);
+          if (stages[status]) {
+            setUploadProgress(stages[status][0]);
+            setProcessingStage(stages[status][1]);
           }
-          return prev + 5;
+          if (status === 'completed' || status === 'failed') {
+            events.close();
+            resolve(status);
+          }
+        });
+        events.addEventListener('transcript_segment', () => {
+          setProcessingStage('📝 Receiving transcript...');
         });
-      }, 2000);
+        events.onerror = () => {
+          events.close();
+          resolve('unknown');
+        };
+      });
 
-      // Wait a bit to simulate the processing
-      await new Promise(resolve => setTimeout(resolve, 3000));
-      
-      clearInterval(progressInterval);
-      setUploadProgress(100);
-      setProcessingStage('✅ Processing complete!');
-      setMessage('✅ Meeting processed successfully!');
-      setMeetingId(response.data.id);
+      if (finalStatus === 'failed') {
+        throw new Error('Processing failed');
+      }
+
+      if (finalStatus === 'completed') {
+        setUploadProgress(100);
+        setProcessingStage('✅ Processing complete!');
+        setMessage('✅ Meeting processed successfully!');
+      } else {
+        setMessage('⏳ Still processing in the background - opening the meeting page');
+      }
       setFile(null);
       setTitle('');
       
       // Redirect to meeting page
       setTimeout(() => {
-        window.location.href = `/meetings/${response.data.id}`;
+        window.location.href = `/meetings/${id}`;
       }, 1500);
 
     } catch (error: any) {
@@ -270,7 +293,7 @@ export default function Home() {
                         className={`text-xs px-2 py-0.5 rounded ${
                           meeting.status === 'completed'
                             ? 'bg-green-100 text-green-800'
-                            : meeting.status === 'processing'
+                            : isInProgress(meeting.status)
                             ? 'bg-yellow-100 text-yellow-800'
                             : 'bg-red-100 text-red-800'
                         }`}
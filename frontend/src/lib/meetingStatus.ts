@@ -0,0 +1,7 @@
+// Meeting statuses set by the background job queue while a meeting is worked on.
+// "processing" is what meetings created before the queue still carry.
+export const IN_PROGRESS_STATUSES = ["queued", "transcribing", "summarizing", "processing"];
+
+export function isInProgress(status: string): boolean {
+  return IN_PROGRESS_STATUSES.includes(status);
+}